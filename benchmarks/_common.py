@@ -0,0 +1,57 @@
+"""
+Shared helpers for benchmark scripts. Run scripts from the package root, e.g.
+``python -m benchmarks.bench_state``; they use tests.settings and an in-memory DB.
+"""
+import os
+import statistics
+import time
+
+
+def setup_django(migrate: bool = False):
+    """Configure Django with tests.settings; optionally create tables in the in-memory DB."""
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.settings")
+    import django
+
+    django.setup()
+    if migrate:
+        from django.core.management import call_command
+
+        call_command("migrate", verbosity=0, run_syncdb=True)
+
+
+def measure(fn, number: int = 2000, repeat: int = 5, stat=statistics.median) -> float:
+    """Return the per-call time of fn in microseconds: stat (default median) over repeat runs."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number * 1e6)
+    return stat(samples)
+
+
+def report(title: str, results: dict[str, float]) -> None:
+    """Print name/microseconds rows, plus the ratio against the first row."""
+    print(title)
+    baseline = next(iter(results.values()))
+    for name, us in results.items():
+        print(f"  {name:<40} {us:10.2f} us/op   x{us / baseline:6.2f}")
+
+
+def compare(results: dict[str, float], baseline: dict[str, float], tolerance: float) -> dict:
+    """
+    Per-name comparison against baseline microseconds: {name: {"us", "baseline",
+    "ratio", "regressed"}}. A result regresses when it is slower than
+    baseline * (1 + tolerance); names without a baseline never regress.
+    """
+    out = {}
+    for name, us in results.items():
+        base = baseline.get(name)
+        ratio = us / base if base else None
+        out[name] = {
+            "us": round(us, 3),
+            "baseline": base,
+            "ratio": round(ratio, 3) if ratio is not None else None,
+            "regressed": ratio is not None and ratio > 1 + tolerance,
+        }
+    return out
@@ -0,0 +1,183 @@
+"""
+Micro-benchmarks for provider hot helpers over every supported slug, checked
+against stored baselines.
+
+    python -m benchmarks.bench_helpers                      # compare with the baseline
+    python -m benchmarks.bench_helpers --json results.json  # also write results ("-" for stdout)
+    python -m benchmarks.bench_helpers --update-baseline    # record this machine's numbers
+
+Exits with status 1 when a helper is slower than its baseline by more than
+--tolerance (default 0.3, i.e. 30%) even after --retries re-measurements. Baselines are machine-specific: record them
+on the machine (or CI runner class) that runs the check. Times are microseconds
+per call (fastest of --repeat runs), averaged over all slugs for the per-slug helpers.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+from benchmarks._common import compare, measure, report, setup_django
+
+BASELINE_PATH = Path(__file__).parent / "baselines" / "bench_helpers.json"
+DEFAULT_TOLERANCE = 0.3
+REDIRECT_URI = "https://app.example.com/oauth/callback"
+
+
+def _document(paths) -> dict:
+    """A userinfo-like document in which every dot/index path resolves."""
+    import re
+
+    doc = {}
+    for path in paths:
+        parts = [p for p in re.split(r"\.|\[|\]", path) if p]
+        node = doc
+        for part, following in zip(parts, parts[1:] + [None]):
+            child = "value" if following is None else ([{}] if following.isdigit() else {})
+            if part.isdigit():
+                node = node[int(part)]
+                continue
+            node = node.setdefault(part, child)
+    return doc
+
+
+def _cases() -> dict:
+    """name -> (callable, calls per invocation)."""
+    from django.test import RequestFactory
+
+    from company_sso_core.providers import get_all_provider_slugs, get_provider
+    from company_sso_core.providers.builtin_configs import BUILTIN_OAUTH2_CONFIGS
+    from company_sso_core.providers.generic import GenericOAuth2Provider, _get_nested
+    from company_sso_core.providers.templates import ENDPOINT_KEYS, compile_template, tenant_values
+    from company_sso_core.utils import get_authorization_url, get_client_ip
+
+    slugs = get_all_provider_slugs()
+    generic_slugs = sorted(BUILTIN_OAUTH2_CONFIGS)
+    # Fill every tenant placeholder ({domain}, {shop}, ...) so all slugs build.
+    placeholders = {
+        name
+        for config in BUILTIN_OAUTH2_CONFIGS.values()
+        for key in ENDPOINT_KEYS
+        for name in compile_template(config.get(key) or "").fields
+    }
+    extra = {name: f"{name}.example.com" for name in placeholders if name != "token"}
+    creds = {"client_id": "cid", "client_secret": "csec", "extra_config": extra}
+    values = tenant_values(extra)
+    templates = [
+        compile_template(config.get(key) or "") for config in BUILTIN_OAUTH2_CONFIGS.values() for key in ENDPOINT_KEYS
+    ]
+    lookups = []
+    for config in BUILTIN_OAUTH2_CONFIGS.values():
+        paths = [path for path in (config.get("user_info_map") or {}).values() if path]
+        doc = _document(paths)
+        lookups.extend((doc, path) for path in paths)
+
+    factory = RequestFactory()
+    forwarded = factory.get("/", HTTP_X_FORWARDED_FOR="203.0.113.7, 10.0.0.1")
+    direct = factory.get("/")
+
+    def get_nested():
+        for doc, path in lookups:
+            _get_nested(doc, path)
+
+    def render_templates():
+        for template in templates:
+            template.render(values)
+
+    def generic_init():
+        for slug in generic_slugs:
+            GenericOAuth2Provider(creds, slug=slug)
+
+    def provider_lookup():
+        for slug in slugs:
+            get_provider(slug, creds)
+
+    def authorization_url():
+        for slug in slugs:
+            get_authorization_url(slug, REDIRECT_URI, state="state")
+
+    def client_ip():
+        get_client_ip(forwarded)
+        get_client_ip(direct)
+
+    return {
+        "generic._get_nested": (get_nested, len(lookups)),
+        "URLTemplate.render": (render_templates, len(templates)),
+        "GenericOAuth2Provider.__init__": (generic_init, len(generic_slugs)),
+        "providers.get_provider": (provider_lookup, len(slugs)),
+        "utils.get_authorization_url": (authorization_url, len(slugs)),
+        "utils.get_client_ip": (client_ip, 2),
+        "providers.get_all_provider_slugs": (get_all_provider_slugs, 1),
+    }, creds
+
+
+def run(number: int, repeat: int, baseline: dict, tolerance: float, retries: int) -> dict[str, float]:
+    """
+    Time every case. A case slower than its baseline allows is re-measured up to
+    retries times, keeping its fastest result, so one noisy burst does not fail the run.
+    """
+    cases, creds = _cases()
+    results = {}
+    stub = patch(
+        "company_sso_core.services.credential_loader.get_provider_credentials",
+        side_effect=lambda slug, workspace=None, **kw: creds,
+    )
+    with stub:
+        for name, (fn, calls) in cases.items():
+            fn()  # warm caches and lazy imports outside the timing
+            # Fastest run: the least noisy estimate for a regression gate.
+            results[name] = measure(fn, number, repeat, stat=min) / calls
+            limit = baseline.get(name, float("inf")) * (1 + tolerance)
+            for _ in range(retries):
+                if results[name] <= limit:
+                    break
+                results[name] = min(results[name], measure(fn, number, repeat, stat=min) / calls)
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--json", dest="json_path", default=None, help='Write results as JSON ("-" for stdout).')
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--number", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=9)
+    parser.add_argument("--retries", type=int, default=2, help="Re-measurements of a case that looks regressed.")
+    args = parser.parse_args(argv)
+
+    setup_django()
+    baseline = {}
+    if args.baseline.exists() and not args.update_baseline:
+        baseline = json.loads(args.baseline.read_text())
+    results = run(args.number, args.repeat, baseline, args.tolerance, args.retries)
+    if args.update_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps({k: round(v, 3) for k, v in results.items()}, indent=2) + "\n")
+        print(f"Baseline written to {args.baseline}", file=sys.stderr)
+        baseline = json.loads(args.baseline.read_text())
+    comparison = compare(results, baseline, args.tolerance)
+    regressed = sorted(name for name, row in comparison.items() if row["regressed"])
+
+    if args.json_path != "-":
+        report("provider helpers (us per call)", results)
+        for name, row in comparison.items():
+            status = "REGRESSED" if row["regressed"] else ("new" if row["baseline"] is None else "ok")
+            ratio = f"x{row['ratio']:.2f} of baseline" if row["ratio"] is not None else "no baseline"
+            print(f"  {name:<40} {ratio:<22} {status}")
+    if args.json_path:
+        payload = json.dumps(
+            {"tolerance": args.tolerance, "regressed": regressed, "results": comparison}, indent=2
+        )
+        if args.json_path == "-":
+            print(payload)
+        else:
+            Path(args.json_path).write_text(payload + "\n")
+    if regressed:
+        print(f"Regressed beyond {args.tolerance:.0%}: {', '.join(regressed)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+"""
+JSON codec over recorded provider payloads: parse (provider responses) and
+render (SSO view responses), stdlib vs orjson.
+
+    python -m benchmarks.bench_json_codec
+
+Old path is resp.json(), i.e. decode bytes to text then json.loads.
+"""
+import json
+from pathlib import Path
+
+from benchmarks._common import measure, report, setup_django
+
+PAYLOAD_DIR = Path(__file__).parent / "payloads"
+
+
+def main():
+    setup_django()
+    from rest_framework.renderers import JSONRenderer
+
+    from company_sso_core import codec
+    from company_sso_core.codec import OrjsonCodec, StdlibCodec
+
+    codecs = [StdlibCodec] + ([OrjsonCodec] if codec.orjson is not None else [])
+    drf_renderer = JSONRenderer()
+    for path in sorted(PAYLOAD_DIR.glob("*.json")):
+        raw = path.read_bytes()
+        data = json.loads(raw)
+        number = max(50, 200_000 // len(raw))
+        parse = {"resp.json() (decode + json.loads)": measure(lambda: json.loads(raw.decode("utf-8")), number)}
+        for impl in codecs:
+            parse[f"{impl.name}.loads(bytes)"] = measure(lambda impl=impl: impl.loads(raw), number)
+        report(f"parse {path.name} ({len(raw)} bytes)", parse)
+        render = {"DRF JSONRenderer": measure(lambda: drf_renderer.render(data), number)}
+        for impl in codecs:
+            render[f"{impl.name}.dumps"] = measure(lambda impl=impl: impl.dumps(data), number)
+        report(f"render {path.name}", render)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Per-request overhead of the login views: SSOLoginView (DRF) vs SSOFastLoginView.
+
+    python -m benchmarks.bench_login_view
+
+OAuthService.login is stubbed to return tokens immediately, so only the view layer
+is timed: body parsing, validation, dispatch and response encoding. Each op builds
+the request with RequestFactory (same cost for both views).
+"""
+import json
+from unittest.mock import patch
+
+from benchmarks._common import measure, report, setup_django
+
+BODY = json.dumps(
+    {
+        "code": "4/0AX4XfWh-example-authorization-code",
+        "workspace_id": 42,
+        "state": "c2lnbmVkLXN0YXRl.example",
+        "redirect_uri": "https://app.example.com/oauth/callback",
+    }
+)
+INVALID_BODY = json.dumps({"code": "", "redirect_uri": "not a url"})
+TOKENS = {"access": "a" * 200, "refresh": "r" * 200}
+
+
+def main():
+    setup_django()
+    from django.test import RequestFactory
+
+    from company_sso_core.views import SSOFastLoginView, SSOLoginView
+
+    factory = RequestFactory()
+    views = {"SSOLoginView (DRF)": SSOLoginView.as_view(), "SSOFastLoginView": SSOFastLoginView.as_view()}
+
+    def call(view, body):
+        response = view(factory.post("/login/google/", data=body, content_type="application/json"), provider="google")
+        if hasattr(response, "render"):
+            response.render()
+        return response
+
+    with patch("company_sso_core.views.OAuthService") as MockService:
+        MockService.return_value.login.return_value = (None, TOKENS)
+        report(
+            "valid body -> 200",
+            {name: measure(lambda view=view: call(view, BODY)) for name, view in views.items()},
+        )
+        report(
+            "invalid body -> 400",
+            {name: measure(lambda view=view: call(view, INVALID_BODY)) for name, view in views.items()},
+        )
+        report(
+            "request construction only (included above)",
+            {"RequestFactory.post": measure(lambda: factory.post("/", data=BODY, content_type="application/json"))},
+        )
+
+
+if __name__ == "__main__":
+    main()
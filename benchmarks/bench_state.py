@@ -0,0 +1,47 @@
+"""
+Signed stateless OAuth state vs a session-backed implementation.
+
+    python -m benchmarks.bench_state
+
+Each op is one authorize redirect (issue) plus one login (verify).
+"""
+import secrets
+
+from benchmarks._common import measure, report, setup_django
+
+REDIRECT_URI = "https://app.example.com/oauth/callback"
+
+
+def main():
+    setup_django(migrate=True)
+    from django.contrib.sessions.backends.db import SessionStore
+    from django.test import override_settings
+
+    from company_sso_core.services import state as signed_state
+
+    def signed_round_trip():
+        token = signed_state.issue_state("google", REDIRECT_URI, workspace=42)
+        signed_state.verify_state(token, "google", REDIRECT_URI, workspace=42)
+
+    def session_round_trip():
+        # Typical host implementation: store a random state in the session, pop it at login.
+        session = SessionStore()
+        token = secrets.token_urlsafe(16)
+        session["sso_state"] = {"state": token, "provider": "google", "redirect_uri": REDIRECT_URI}
+        session.save()
+        loaded = SessionStore(session_key=session.session_key)
+        stored = loaded.pop("sso_state", None)
+        loaded.save()
+        assert stored and secrets.compare_digest(stored["state"], token)
+
+    results = {}
+    with override_settings(SSO_STATE_REPLAY_BACKEND="memory", SSO_STATE_REPLAY_CACHE_SIZE=100_000):
+        results["signed state (memory replay cache)"] = measure(signed_round_trip)
+    with override_settings(SSO_STATE_REPLAY_BACKEND="cache"):
+        results["signed state (shared cache replay)"] = measure(signed_round_trip)
+    results["session-backed state (db sessions)"] = measure(session_round_trip, number=500)
+    report("OAuth state issue + verify", results)
+
+
+if __name__ == "__main__":
+    main()
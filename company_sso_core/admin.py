@@ -1,10 +1,33 @@
-"""Admin: SocialProvider (mask client_secret) and SSOLoginLog (read-only)."""
-from django.contrib import admin
+"""Admin: SocialProvider (mask client_secret), SSOLoginLog / SSOLoginStat (read-only) and SocialAccount."""
+from django.contrib import admin, messages
 from django import forms
 from django.utils.safestring import mark_safe
 from django.core.exceptions import ValidationError
 
-from company_sso_core.models import SocialProvider, SSOLoginLog
+from company_sso_core.models import SocialAccount, SocialProvider, SSOLoginLog, SSOLoginStat
+from company_sso_core.pagination import EstimatedCountPaginator
+from company_sso_core.providers import get_all_provider_slugs
+from company_sso_core.routers import is_log_database_separate
+from company_sso_core.services.provider_cache import invalidate_all_providers
+
+
+class ProviderSlugFilter(admin.SimpleListFilter):
+    """Filter by provider slug; choices come from the provider registry, not a DISTINCT query."""
+
+    title = "provider"
+    parameter_name = "provider"
+
+    def __init__(self, request, params, model, model_admin):
+        self.field_name = "slug" if model is SocialProvider else "provider_slug"
+        super().__init__(request, params, model, model_admin)
+
+    def lookups(self, request, model_admin):
+        return [(slug, slug) for slug in get_all_provider_slugs()]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(**{self.field_name: self.value()})
+        return queryset
 
 
 class SocialProviderAdminForm(forms.ModelForm):
@@ -60,9 +83,36 @@ class SocialProviderAdmin(admin.ModelAdmin):
 
     form = SocialProviderAdminForm
     list_display = ("slug", "name", "is_active", "workspace_id", "created_at")
-    list_filter = ("is_active",)
-    search_fields = ("slug", "name")
+    list_filter = ("is_active", ProviderSlugFilter)
+    search_fields = ("=slug", "^name")
+    search_help_text = "Exact slug, name prefix, or a workspace id (digits only)."
     readonly_fields = ("created_at", "updated_at", "client_secret_masked")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = ["activate_selected", "deactivate_selected"]
+
+    def get_search_results(self, request, queryset, search_term):
+        # A numeric term is a workspace id: one indexed equality lookup instead of LIKE scans.
+        term = search_term.strip()
+        if term.isdigit():
+            return queryset.filter(workspace_id=int(term)), False
+        return super().get_search_results(request, queryset, search_term)
+
+    def _set_active(self, request, queryset, is_active: bool) -> None:
+        # One UPDATE; queryset.update skips post_save, so invalidate every provider with one bump.
+        updated = queryset.exclude(is_active=is_active).update(is_active=is_active)
+        if updated:
+            invalidate_all_providers()
+        state = "activated" if is_active else "deactivated"
+        self.message_user(request, f"{updated} provider(s) {state}.", messages.SUCCESS)
+
+    @admin.action(description="Activate selected providers", permissions=["change"])
+    def activate_selected(self, request, queryset):
+        self._set_active(request, queryset, True)
+
+    @admin.action(description="Deactivate selected providers", permissions=["change"])
+    def deactivate_selected(self, request, queryset):
+        self._set_active(request, queryset, False)
 
     def client_secret_masked(self, obj):
         if obj and obj.client_secret:
@@ -96,13 +146,57 @@ class SSOLoginLogAdmin(admin.ModelAdmin):
     """Read-only list of SSO login attempts."""
 
     list_display = ("provider_slug", "user", "status", "ip_address", "created_at")
-    list_filter = ("status", "provider_slug")
+    list_filter = ("status", ProviderSlugFilter)
     search_fields = ("user__email", "user__username", "provider_slug")
     readonly_fields = ("provider", "provider_slug", "user", "status", "ip_address", "created_at")
     date_hierarchy = "created_at"
+    list_select_related = ("user",)
+    paginator = EstimatedCountPaginator
+    # Large table: skip the second, unfiltered COUNT(*) on every changelist page.
+    show_full_result_count = False
+
+    def get_search_fields(self, request):
+        # User lookups need a join, which is impossible once logs live on their own database.
+        if is_log_database_separate():
+            return ("provider_slug",)
+        return super().get_search_fields(request)
+
+    def get_list_select_related(self, request):
+        if is_log_database_separate():
+            return ()
+        return super().get_list_select_related(request)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(SSOLoginStat)
+class SSOLoginStatAdmin(admin.ModelAdmin):
+    """Read-only exact daily success counts (flushed from cache counters)."""
+
+    list_display = ("day", "provider_slug", "success_count")
+    list_filter = (ProviderSlugFilter,)
+    date_hierarchy = "day"
+    show_full_result_count = False
 
     def has_add_permission(self, request):
         return False
 
     def has_change_permission(self, request, obj=None):
         return False
+
+
+@admin.register(SocialAccount)
+class SocialAccountAdmin(admin.ModelAdmin):
+    """External identities linked to users; search by exact external id."""
+
+    list_display = ("provider_slug", "workspace_id", "external_id", "user", "email", "created_at")
+    list_filter = (ProviderSlugFilter,)
+    search_fields = ("=external_id", "=email")
+    raw_id_fields = ("user",)
+    readonly_fields = ("created_at",)
+    list_select_related = ("user",)
+    show_full_result_count = False
@@ -11,8 +11,23 @@ class CompanySsoCoreConfig(AppConfig):
     verbose_name = "Company SSO Core"
 
     def ready(self):
-        """Import signals so they are registered."""
+        """Import signals so they are registered; map the credential snapshot; start warm-up if SSO_WARMUP_ON_STARTUP."""
         try:
             import company_sso_core.signals  # noqa: F401
         except ImportError:
             pass
+        from company_sso_core.utils import get_setting
+
+        if get_setting("SSO_SNAPSHOT_PATH"):
+            from company_sso_core.services.snapshot import load_snapshot
+
+            # A local file read, so workers can serve logins before their first DB round-trip.
+            load_snapshot()
+
+        if get_setting("SSO_WARMUP_ON_STARTUP", False):
+            import threading
+
+            from company_sso_core.services.warmup import warm_up_in_background
+
+            # Off the startup path: the app serves requests while warm-up runs.
+            threading.Thread(target=warm_up_in_background, name="sso-warmup", daemon=True).start()
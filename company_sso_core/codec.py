@@ -0,0 +1,78 @@
+"""
+JSON codec for provider responses and SSO API responses.
+Uses orjson when installed, else the stdlib. Both parse straight from response
+bytes, so there is no intermediate text decode. Override with SSO_JSON_CODEC:
+"orjson", "stdlib", or a dotted path to an object with loads(bytes) / dumps(obj) -> bytes.
+"""
+import json
+
+from django.utils.module_loading import import_string
+
+from company_sso_core.utils import get_setting
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+def _default(obj):
+    # Lazy strings, Decimals, datetimes etc. from host token/user callables.
+    from rest_framework.utils.encoders import JSONEncoder
+
+    return JSONEncoder().default(obj)
+
+
+class StdlibCodec:
+    name = "stdlib"
+
+    @staticmethod
+    def loads(data):
+        return json.loads(data)
+
+    @staticmethod
+    def dumps(obj) -> bytes:
+        return json.dumps(obj, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class OrjsonCodec:
+    name = "orjson"
+
+    @staticmethod
+    def loads(data):
+        return orjson.loads(data)
+
+    @staticmethod
+    def dumps(obj) -> bytes:
+        return orjson.dumps(obj, default=_default)
+
+
+_codec = None
+
+
+def get_codec():
+    """Return the configured codec (resolved once per process)."""
+    global _codec
+    if _codec is None:
+        choice = get_setting("SSO_JSON_CODEC", "auto")
+        if choice == "auto":
+            _codec = OrjsonCodec if orjson is not None else StdlibCodec
+        elif choice == "orjson":
+            if orjson is None:
+                raise ImportError("SSO_JSON_CODEC = 'orjson' requires the orjson package")
+            _codec = OrjsonCodec
+        elif choice == "stdlib":
+            _codec = StdlibCodec
+        else:
+            _codec = import_string(choice)
+    return _codec
+
+
+def loads(data):
+    """Parse JSON from bytes (or str). Raises ValueError on invalid JSON."""
+    return get_codec().loads(data)
+
+
+def dumps(obj) -> bytes:
+    """Serialize obj to compact UTF-8 JSON bytes."""
+    return get_codec().dumps(obj)
@@ -0,0 +1,183 @@
+"""
+Encryption of SocialProvider.client_secret at rest.
+
+Set SSO_SECRET_KEYS to a list of Fernet keys (Fernet.generate_key()). The first key
+encrypts; every key decrypts, so rotate by prepending a new key, running
+`manage.py sso_rotate_secrets`, then dropping the old one. Stored values are
+"enc1:<token>"; values without the prefix are legacy plaintext and pass through.
+Without SSO_SECRET_KEYS secrets are stored as before, in plaintext.
+
+Decrypted secrets are kept in a bounded, short-lived per-process cache keyed by the
+stored token. Each save writes a new token (Fernet uses a random IV), so the key
+changes whenever the row's secret does, and logins only decrypt on the first use
+of a new value. Plaintext secrets are never written to the shared SSO cache.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.exceptions import ImproperlyConfigured
+
+from company_sso_core.utils import get_setting
+
+try:
+    from cryptography.fernet import Fernet, InvalidToken, MultiFernet
+except ImportError:  # optional dependency
+    Fernet = InvalidToken = MultiFernet = None
+
+PREFIX = "enc1:"
+
+DEFAULT_CACHE_SIZE = 256
+DEFAULT_CACHE_TTL = 300
+
+
+class SecretDecryptionError(ImproperlyConfigured):
+    """A stored secret could not be decrypted with any key in SSO_SECRET_KEYS."""
+
+
+_fernet = None
+_fernet_keys = None
+_fernet_lock = threading.Lock()
+
+
+def _get_fernet():
+    """MultiFernet over SSO_SECRET_KEYS, or None when encryption is off. Rebuilt if the setting changes."""
+    global _fernet, _fernet_keys
+    keys = get_setting("SSO_SECRET_KEYS") or ()
+    if isinstance(keys, (str, bytes)):
+        keys = (keys,)
+    keys = tuple(keys)
+    if keys != _fernet_keys:
+        with _fernet_lock:
+            if keys != _fernet_keys:
+                if keys and MultiFernet is None:
+                    raise ImproperlyConfigured(
+                        "SSO_SECRET_KEYS requires the cryptography package: "
+                        "pip install company-sso-core[cryptography]"
+                    )
+                _fernet = MultiFernet([Fernet(key) for key in keys]) if keys else None
+                _fernet_keys = keys
+    return _fernet
+
+
+def encryption_enabled() -> bool:
+    """True when SSO_SECRET_KEYS is set, i.e. secrets are encrypted on save."""
+    return _get_fernet() is not None
+
+
+def is_encrypted(value) -> bool:
+    return isinstance(value, str) and value.startswith(PREFIX)
+
+
+def encrypt_secret(value):
+    """Stored form of value: encrypted with the first key, or unchanged when encryption is off or already done."""
+    if not value or is_encrypted(value):
+        return value
+    fernet = _get_fernet()
+    if fernet is None:
+        return value
+    return PREFIX + fernet.encrypt(value.encode("utf-8")).decode("ascii")
+
+
+def rotate_secret(value):
+    """Re-encrypt a stored value with the first key (plaintext is encrypted). Unchanged when encryption is off."""
+    fernet = _get_fernet()
+    if not value or fernet is None:
+        return value
+    if not is_encrypted(value):
+        return encrypt_secret(value)
+    try:
+        return PREFIX + fernet.rotate(value[len(PREFIX):].encode("ascii")).decode("ascii")
+    except InvalidToken:
+        raise SecretDecryptionError("Stored secret does not decrypt with any key in SSO_SECRET_KEYS.") from None
+
+
+def _decrypt(value: str) -> str:
+    fernet = _get_fernet()
+    if fernet is None:
+        raise SecretDecryptionError("Stored secret is encrypted but SSO_SECRET_KEYS is not set.")
+    try:
+        return fernet.decrypt(value[len(PREFIX):].encode("ascii")).decode("utf-8")
+    except InvalidToken:
+        raise SecretDecryptionError("Stored secret does not decrypt with any key in SSO_SECRET_KEYS.") from None
+
+
+class DecryptedSecretCache:
+    """
+    In-process LRU of stored token -> plaintext, each entry kept for ttl seconds.
+    When full, the least recently used entry is evicted.
+    """
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, token: str):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            plaintext, expires_at = entry
+            if expires_at <= now:
+                del self._entries[token]
+                return None
+            self._entries.move_to_end(token)
+            return plaintext
+
+    def set(self, token: str, plaintext: str) -> None:
+        with self._lock:
+            self._entries[token] = (plaintext, time.monotonic() + self.ttl)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_cache: DecryptedSecretCache | None = None
+_cache_lock = threading.Lock()
+
+
+def _get_cache() -> DecryptedSecretCache | None:
+    global _cache
+    ttl = get_setting("SSO_SECRET_CACHE_TTL", DEFAULT_CACHE_TTL)
+    size = get_setting("SSO_SECRET_CACHE_SIZE", DEFAULT_CACHE_SIZE)
+    if not ttl or not size:
+        return None
+    if _cache is None or _cache.ttl != ttl or _cache.max_entries != size:
+        with _cache_lock:
+            if _cache is None or _cache.ttl != ttl or _cache.max_entries != size:
+                _cache = DecryptedSecretCache(ttl, size)
+    return _cache
+
+
+def clear_secret_cache() -> None:
+    """Drop all decrypted secrets held by this process."""
+    if _cache is not None:
+        _cache.clear()
+
+
+def decrypt_secret(value):
+    """
+    Plaintext for a stored value. Legacy plaintext is returned as is; tokens are
+    decrypted once and then served from the in-process cache (SSO_SECRET_CACHE_TTL
+    seconds, SSO_SECRET_CACHE_SIZE entries). Raises SecretDecryptionError.
+    """
+    if not is_encrypted(value):
+        return value
+    cache = _get_cache()
+    if cache is None:
+        return _decrypt(value)
+    plaintext = cache.get(value)
+    if plaintext is None:
+        plaintext = _decrypt(value)
+        cache.set(value, plaintext)
+    return plaintext
@@ -41,3 +41,26 @@ class OAuthProviderError(SSOException):
     status_code = status.HTTP_502_BAD_GATEWAY
     default_detail = "OAuth provider error. Please try again later."
     default_code = "oauth_provider_error"
+
+
+class UpstreamResponseTooLargeError(OAuthProviderError):
+    """Provider response body exceeded SSO_HTTP_MAX_RESPONSE_BYTES; the read was aborted."""
+
+    default_detail = "OAuth provider response is too large."
+    default_code = "upstream_response_too_large"
+
+
+class AuthorizationCodeReusedError(SSOException):
+    """Authorization code was already exchanged by an earlier login."""
+
+    status_code = status.HTTP_400_BAD_REQUEST
+    default_detail = "Authorization code has already been used."
+    default_code = "authorization_code_reused"
+
+
+class ProviderBusyError(SSOException):
+    """Too many concurrent logins are already waiting on this provider (bulkhead full)."""
+
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "SSO provider is busy. Please try again shortly."
+    default_code = "provider_busy"
@@ -0,0 +1,16 @@
+"""Model fields for company_sso_core."""
+from django.db import models
+
+from company_sso_core.crypto import encrypt_secret
+
+
+class EncryptedSecretField(models.TextField):
+    """
+    Text column holding a secret encrypted with SSO_SECRET_KEYS (see
+    company_sso_core.crypto). Values are encrypted on save; loaded instances keep
+    the stored token, so listing rows never decrypts. Read the plaintext with
+    company_sso_core.crypto.decrypt_secret().
+    """
+
+    def get_prep_value(self, value):
+        return encrypt_secret(super().get_prep_value(value))
@@ -0,0 +1,67 @@
+"""Stream SSOLoginLog rows as NDJSON or CSV."""
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+
+from company_sso_core.services import log_export
+
+
+def _datetime(value):
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise CommandError(f"Invalid datetime: {value!r}")
+    return parsed
+
+
+class Command(BaseCommand):
+    help = "Export SSO login logs for SIEM ingestion with constant memory; resumable with --after."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--since", type=_datetime, help="Include rows at or after this ISO datetime.")
+        parser.add_argument("--until", type=_datetime, help="Include rows before this ISO datetime.")
+        parser.add_argument("--provider", help="Provider slug.")
+        parser.add_argument("--status", choices=["success", "failed"])
+        parser.add_argument("--after", help="Resume cursor <created_at>,<id> printed by a previous run.")
+        parser.add_argument("--limit", type=int, help="Stop after this many rows.")
+        parser.add_argument("--format", dest="fmt", choices=log_export.FORMATS, default="ndjson")
+        parser.add_argument("--chunk-size", type=int, default=log_export.DEFAULT_CHUNK_SIZE)
+        parser.add_argument("--output", default="-", help="File path, or - for stdout (default).")
+
+    def handle(self, *args, **options):
+        if options["after"]:
+            try:
+                log_export.parse_cursor(options["after"])
+            except ValueError:
+                raise CommandError("--after must be <created_at>,<id>")
+        qs = log_export.export_queryset(
+            since=options["since"],
+            until=options["until"],
+            provider=options["provider"],
+            status=options["status"],
+            after=options["after"],
+            limit=options["limit"],
+        )
+        rows = log_export.iter_rows(qs, chunk_size=options["chunk_size"])
+        last = _LastRow(rows)
+        chunks = log_export.iter_csv(last) if options["fmt"] == "csv" else log_export.iter_ndjson(last)
+        if options["output"] == "-":
+            for chunk in chunks:
+                self.stdout.write(chunk.decode(), ending="")
+        else:
+            with open(options["output"], "wb") as fh:
+                fh.writelines(chunks)
+        if last.row is not None:
+            pk, created_at = last.row[0], last.row[1]
+            self.stderr.write(f"Resume with --after {log_export.make_cursor(created_at, pk)}")
+
+
+class _LastRow:
+    """Iterator wrapper remembering the last row, for printing the resume cursor."""
+
+    def __init__(self, rows):
+        self._rows = rows
+        self.row = None
+
+    def __iter__(self):
+        for row in self._rows:
+            self.row = row
+            yield row
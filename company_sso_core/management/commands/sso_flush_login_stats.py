@@ -0,0 +1,18 @@
+"""Flush cached SSO login success counters into SSOLoginStat."""
+from django.core.management.base import BaseCommand, CommandError
+
+from company_sso_core.services.login_stats import flush_login_stats
+from company_sso_core.services.provider_cache import is_process_local
+
+
+class Command(BaseCommand):
+    help = "Add cached per-provider success counters to SSOLoginStat. Run periodically (e.g. every few minutes)."
+
+    def handle(self, *args, **options):
+        if is_process_local():
+            raise CommandError(
+                "SSO_CACHE_ALIAS is a process-local cache, so this process cannot see the "
+                "counters kept by the web workers. Configure a shared cache (e.g. Redis)."
+            )
+        flushed = flush_login_stats()
+        self.stdout.write(f"Flushed {flushed} successful logins")
@@ -0,0 +1,27 @@
+"""Re-encrypt SocialProvider client secrets with the first key in SSO_SECRET_KEYS."""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import router
+
+from company_sso_core.crypto import SecretDecryptionError, rotate_secret
+from company_sso_core.models import SocialProvider
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-encrypt every SocialProvider.client_secret with the first key in SSO_SECRET_KEYS "
+        "(plaintext secrets are encrypted). Run after adding a key, before removing the old one."
+    )
+
+    def handle(self, *args, **options):
+        alias = router.db_for_write(SocialProvider)
+        rows = SocialProvider.objects.using(alias).values_list("pk", "client_secret")
+        rotated = 0
+        for pk, secret in rows.iterator():
+            try:
+                new = rotate_secret(secret)
+            except SecretDecryptionError as e:
+                raise CommandError(f"SocialProvider {pk}: {e}") from None
+            if new != secret:
+                SocialProvider.objects.using(alias).filter(pk=pk).update(client_secret=new)
+                rotated += 1
+        self.stdout.write(f"Re-encrypted {rotated} client secrets")
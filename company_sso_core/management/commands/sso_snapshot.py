@@ -0,0 +1,24 @@
+"""Write active SocialProvider credentials to the local snapshot file."""
+from django.core.management.base import BaseCommand, CommandError
+
+from company_sso_core.crypto import encryption_enabled
+from company_sso_core.services.snapshot import SnapshotError, write_snapshot
+
+
+class Command(BaseCommand):
+    help = (
+        "Write active SSO provider credentials to SSO_SNAPSHOT_PATH (or --output), used when the "
+        "database is unreachable. Rerun after provider changes, e.g. from cron or a deploy hook."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", default=None, help="Snapshot path (default: SSO_SNAPSHOT_PATH).")
+
+    def handle(self, *args, **options):
+        try:
+            written = write_snapshot(options["output"])
+        except (SnapshotError, OSError) as e:
+            raise CommandError(str(e)) from None
+        self.stdout.write(f"Wrote {written} providers to the SSO snapshot")
+        if not encryption_enabled():
+            self.stderr.write("SSO_SECRET_KEYS is not set: client secrets are stored in plaintext.")
@@ -0,0 +1,33 @@
+"""
+Run the SSO warm-up steps in this process: a deploy-time check that providers build
+and their IdP hosts resolve and connect. Its connections end with the command.
+"""
+from django.core.management.base import BaseCommand
+
+from company_sso_core.services.warmup import warm_up
+
+
+class Command(BaseCommand):
+    help = (
+        "Check that active SSO providers build, and their IdP hosts resolve and accept "
+        "connections. Warms only this process; use SSO_WARMUP_ON_STARTUP for web workers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--budget",
+            type=float,
+            default=None,
+            help="Time budget in seconds (default: SSO_WARMUP_BUDGET or 5).",
+        )
+
+    def handle(self, *args, **options):
+        report = warm_up(budget=options["budget"])
+        self.stdout.write(
+            f"Warmed {len(report['providers'])} providers, {report['hosts']} hosts, "
+            f"{report['connections']} connections in {report['elapsed_ms']:.0f} ms"
+        )
+        for error in report["errors"]:
+            self.stderr.write(f"  skipped {error}")
+        if report["timed_out"]:
+            self.stderr.write("Warm-up budget exhausted before all steps finished.")
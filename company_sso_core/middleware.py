@@ -2,27 +2,74 @@
 Optional middleware for SSO. Kept minimal so host can extend.
 Example: inject request.workspace from header for workspace-scoped credentials.
 """
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.urls import NoReverseMatch, reverse
+
 from company_sso_core.utils import get_setting
 
+_UNRESOLVED = object()
+
+
+def _meta_key(header_name: str | None) -> str | None:
+    """request.META key for an HTTP header name, e.g. "X-Workspace-Id" -> "HTTP_X_WORKSPACE_ID"."""
+    if not header_name:
+        return None
+    return f"HTTP_{header_name.upper().replace('-', '_')}"
+
+
+def _sso_path_prefix() -> str | None:
+    """Path under which company_sso_core.urls is mounted, or None if it is not (namespace sso_api)."""
+    try:
+        return reverse("sso_api:log-export").removesuffix("logs/export/")
+    except NoReverseMatch:
+        return None
+
 
 class SSOWorkspaceMiddleware:
     """
     If SSO_WORKSPACE_HEADER is set (e.g. "X-Workspace-Id"), set request.workspace_id
-    from that header for use in credential resolution.
+    from that header on SSO routes, for use in credential resolution; login uses it
+    when the body has no workspace_id. Other routes pass through untouched.
+    Works under WSGI and ASGI without a thread hop; the setting is read once.
     """
 
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        self.meta_key = _meta_key(get_setting("SSO_WORKSPACE_HEADER"))
+        # Resolved on first request: the URLconf may not be importable yet at startup.
+        self._prefix = _UNRESOLVED
+
+    def _is_sso_path(self, path: str) -> bool:
+        if self._prefix is _UNRESOLVED:
+            self._prefix = _sso_path_prefix()
+        return self._prefix is None or path.startswith(self._prefix)
+
+    def _set_workspace(self, request) -> None:
+        if not self._is_sso_path(request.path):
+            return
+        if self.meta_key is None:
+            if not hasattr(request, "workspace_id"):
+                request.workspace_id = None
+            return
+        value = request.META.get(self.meta_key)
+        if value is not None:
+            try:
+                request.workspace_id = int(value)
+            except (ValueError, TypeError):
+                request.workspace_id = None
 
     def __call__(self, request):
-        header_name = get_setting("SSO_WORKSPACE_HEADER")
-        if header_name:
-            value = request.META.get(f"HTTP_{header_name.upper().replace('-', '_')}")
-            if value is not None:
-                try:
-                    request.workspace_id = int(value)
-                except (ValueError, TypeError):
-                    request.workspace_id = None
-        else:
-            request.workspace_id = getattr(request, "workspace_id", None)
+        if self.async_mode:
+            return self.__acall__(request)
+        self._set_workspace(request)
         return self.get_response(request)
+
+    async def __acall__(self, request):
+        self._set_workspace(request)
+        return await self.get_response(request)
@@ -0,0 +1,30 @@
+# Allow one SocialProvider per (slug, workspace) instead of one per slug
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("company_sso_core", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="socialprovider",
+            name="slug",
+            field=models.CharField(db_index=True, max_length=50),
+        ),
+        migrations.AddConstraint(
+            model_name="socialprovider",
+            constraint=models.UniqueConstraint(fields=("slug", "workspace_id"), name="sso_provider_slug_workspace_uniq"),
+        ),
+        migrations.AddConstraint(
+            model_name="socialprovider",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("workspace_id__isnull", True)),
+                fields=("slug",),
+                name="sso_provider_slug_global_uniq",
+            ),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Drop DB constraints on SSOLoginLog FKs and leave log rows alone on delete, so logs can
+# live on a separate database
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("company_sso_core", "0002_socialprovider_slug_per_workspace"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="ssologinlog",
+            name="provider",
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name="login_logs", to="company_sso_core.socialprovider"),
+        ),
+        migrations.AlterField(
+            model_name="ssologinlog",
+            name="user",
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name="sso_login_logs", to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# SocialAccount: indexed (provider_slug, workspace_id, external_id) -> user link
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("company_sso_core", "0003_ssologinlog_unconstrained_fks"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SocialAccount",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("provider_slug", models.CharField(max_length=50)),
+                ("workspace_id", models.PositiveIntegerField(blank=True, null=True)),
+                ("external_id", models.CharField(max_length=255)),
+                ("email", models.CharField(blank=True, max_length=254)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("user", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="sso_accounts", to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                "verbose_name": "Social account",
+                "verbose_name_plural": "Social accounts",
+                "constraints": [
+                    models.UniqueConstraint(fields=("provider_slug", "workspace_id", "external_id"), name="sso_account_identity_uniq"),
+                    models.UniqueConstraint(condition=models.Q(("workspace_id__isnull", True)), fields=("provider_slug", "external_id"), name="sso_account_identity_global_uniq"),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# SSOLoginStat: exact daily success counters flushed from the cache
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("company_sso_core", "0004_socialaccount"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SSOLoginStat",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("provider_slug", models.CharField(max_length=50)),
+                ("day", models.DateField()),
+                ("success_count", models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "SSO login stat",
+                "verbose_name_plural": "SSO login stats",
+                "ordering": ["-day", "provider_slug"],
+                "constraints": [
+                    models.UniqueConstraint(fields=("provider_slug", "day"), name="sso_login_stat_slug_day_uniq"),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,47 @@
+# SocialProvider.client_secret: encrypted text column; encrypt existing plaintext rows
+
+from django.db import migrations
+
+import company_sso_core.fields
+
+
+def encrypt_existing(apps, schema_editor):
+    from company_sso_core.crypto import encrypt_secret, is_encrypted
+
+    SocialProvider = apps.get_model("company_sso_core", "SocialProvider")
+    db = schema_editor.connection.alias
+    for pk, secret in SocialProvider.objects.using(db).values_list("pk", "client_secret").iterator():
+        if secret and not is_encrypted(secret):
+            SocialProvider.objects.using(db).filter(pk=pk).update(client_secret=encrypt_secret(secret))
+
+
+def decrypt_existing(apps, schema_editor):
+    from company_sso_core.crypto import decrypt_secret, is_encrypted
+
+    SocialProvider = apps.get_model("company_sso_core", "SocialProvider")
+    db = schema_editor.connection.alias
+    connection = schema_editor.connection
+    table = connection.ops.quote_name(SocialProvider._meta.db_table)
+    for pk, secret in SocialProvider.objects.using(db).values_list("pk", "client_secret").iterator():
+        if is_encrypted(secret):
+            # Raw UPDATE: the field would encrypt the plaintext again.
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"UPDATE {table} SET client_secret = %s WHERE id = %s", [decrypt_secret(secret), pk]
+                )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("company_sso_core", "0005_ssologinstat"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="socialprovider",
+            name="client_secret",
+            field=company_sso_core.fields.EncryptedSecretField(),
+        ),
+        migrations.RunPython(encrypt_existing, decrypt_existing),
+    ]
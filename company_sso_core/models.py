@@ -1,18 +1,22 @@
-"""SSO models: SocialProvider and SSOLoginLog."""
+"""SSO models: SocialProvider, SSOLoginLog, SSOLoginStat and SocialAccount."""
 from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.db import models
 
+from company_sso_core.fields import EncryptedSecretField
+
 
 class SocialProvider(models.Model):
     """
     OAuth provider configuration. Credentials stored here or fallback to settings.
-    workspace_id null means global provider.
+    workspace_id null means global provider. client_secret is encrypted at rest
+    when SSO_SECRET_KEYS is set.
     """
 
-    slug = models.CharField(max_length=50, unique=True, db_index=True)
+    slug = models.CharField(max_length=50, db_index=True)
     name = models.CharField(max_length=255)
     client_id = models.CharField(max_length=255)
-    client_secret = models.CharField(max_length=255)
+    client_secret = EncryptedSecretField()
     is_active = models.BooleanField(default=True, db_index=True)
     workspace_id = models.PositiveIntegerField(null=True, blank=True, db_index=True)
     extra_config = models.JSONField(default=dict, blank=True)
@@ -25,15 +29,40 @@ class SocialProvider(models.Model):
             models.Index(fields=["slug", "workspace_id"]),
             models.Index(fields=["is_active"]),
         ]
+        constraints = [
+            # One row per (slug, workspace); NULLs never collide, so globals need their own constraint.
+            models.UniqueConstraint(fields=["slug", "workspace_id"], name="sso_provider_slug_workspace_uniq"),
+            models.UniqueConstraint(
+                fields=["slug"],
+                condition=models.Q(workspace_id__isnull=True),
+                name="sso_provider_slug_global_uniq",
+            ),
+        ]
         verbose_name = "Social provider"
         verbose_name_plural = "Social providers"
 
     def __str__(self):
         return f"{self.name} ({self.slug})"
 
+    def clean(self):
+        """Reject extra_config that leaves endpoint placeholders (e.g. {domain}) unfilled."""
+        from company_sso_core.providers.templates import validate_endpoints
+
+        if not isinstance(self.extra_config, dict):
+            raise ValidationError({"extra_config": "Must be a JSON object."})
+        errors = validate_endpoints(self.slug, self.extra_config)
+        if errors:
+            raise ValidationError({"extra_config": errors})
+
 
 class SSOLoginLog(models.Model):
-    """Log of SSO login attempts (success or failed)."""
+    """
+    Log of SSO login attempts (success or failed).
+    provider/user have no DB constraints so the table can live on a separate
+    database (see company_sso_core.routers); there they act as denormalized ids.
+    Deleting a provider or user leaves log rows untouched (DO_NOTHING), so the
+    delete never reaches into the log table, wherever it lives.
+    """
 
     class Status(models.TextChoices):
         SUCCESS = "success", "Success"
@@ -41,20 +70,22 @@ class SSOLoginLog(models.Model):
 
     provider = models.ForeignKey(
         SocialProvider,
-        on_delete=models.SET_NULL,
+        on_delete=models.DO_NOTHING,
         null=True,
         blank=True,
         related_name="login_logs",
         db_index=True,
+        db_constraint=False,
     )
     provider_slug = models.CharField(max_length=50, db_index=True)
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
-        on_delete=models.SET_NULL,
+        on_delete=models.DO_NOTHING,
         null=True,
         blank=True,
         related_name="sso_login_logs",
         db_index=True,
+        db_constraint=False,
     )
     status = models.CharField(
         max_length=20,
@@ -75,3 +106,68 @@ class SSOLoginLog(models.Model):
 
     def __str__(self):
         return f"{self.provider_slug} {self.status} at {self.created_at}"
+
+
+class SSOLoginStat(models.Model):
+    """
+    Exact daily success counts per provider, flushed from cache counters
+    (company_sso_core.services.login_stats). Successful logins may be sampled in
+    SSOLoginLog; these counts are not. Routed with SSOLoginLog.
+    """
+
+    provider_slug = models.CharField(max_length=50)
+    day = models.DateField()
+    success_count = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        ordering = ["-day", "provider_slug"]
+        constraints = [
+            models.UniqueConstraint(fields=["provider_slug", "day"], name="sso_login_stat_slug_day_uniq"),
+        ]
+        verbose_name = "SSO login stat"
+        verbose_name_plural = "SSO login stats"
+
+    def __str__(self):
+        return f"{self.provider_slug} {self.day}: {self.success_count}"
+
+
+class SocialAccount(models.Model):
+    """
+    Link from an external identity (provider_slug, workspace_id, external_id) to a
+    local user. workspace_id is that of the SocialProvider row that authenticated
+    the identity (null for global providers): a workspace's provider may point at
+    its own IdP, whose ids say nothing about another workspace's users. The unique
+    constraints double as the lookup index for user resolution.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="sso_accounts",
+    )
+    provider_slug = models.CharField(max_length=50)
+    workspace_id = models.PositiveIntegerField(null=True, blank=True)
+    external_id = models.CharField(max_length=255)
+    email = models.CharField(max_length=254, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["provider_slug", "workspace_id", "external_id"],
+                name="sso_account_identity_uniq",
+            ),
+            # NULLs never collide, so identities from global providers need their own constraint.
+            models.UniqueConstraint(
+                fields=["provider_slug", "external_id"],
+                condition=models.Q(workspace_id__isnull=True),
+                name="sso_account_identity_global_uniq",
+            ),
+        ]
+        verbose_name = "Social account"
+        verbose_name_plural = "Social accounts"
+
+    def __str__(self):
+        if self.workspace_id is None:
+            return f"{self.provider_slug}:{self.external_id}"
+        return f"{self.provider_slug}@{self.workspace_id}:{self.external_id}"
@@ -0,0 +1,38 @@
+"""
+Admin paginator that avoids COUNT(*) over large tables. An unfiltered changelist on
+PostgreSQL uses the planner's row estimate (pg_class.reltuples) once it exceeds
+SSO_ADMIN_ESTIMATE_COUNT_ABOVE rows; filtered querysets and other backends count exactly.
+"""
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+from company_sso_core.utils import get_setting
+
+DEFAULT_ESTIMATE_THRESHOLD = 10000
+
+
+def estimated_row_count(model, using: str) -> int | None:
+    """Planner estimate of the table's rows, or None where the backend has none."""
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [model._meta.db_table])
+        row = cursor.fetchone()
+    # reltuples is -1 for a table that was never analyzed.
+    return int(row[0]) if row and row[0] >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator whose count is the table estimate for large, unfiltered querysets."""
+
+    @cached_property
+    def count(self):
+        qs = self.object_list
+        if hasattr(qs, "query") and not qs.query.where:
+            threshold = get_setting("SSO_ADMIN_ESTIMATE_COUNT_ABOVE", DEFAULT_ESTIMATE_THRESHOLD)
+            estimate = estimated_row_count(qs.model, qs.db)
+            if estimate is not None and estimate > threshold:
+                return estimate
+        return super().count
@@ -1,17 +1,31 @@
 """
 Provider registry: auto-registration via BaseOAuthProvider metaclass.
-Import all provider modules so they register; expose get_provider(slug, credentials).
-50+ SSO options: dedicated classes (google, github, facebook) + generic built-in configs.
+Provider modules are imported lazily from the manifest on first get_provider(slug, credentials).
+50+ SSO options: dedicated classes (google, github, facebook, apple) + generic built-in configs.
 """
+from importlib import import_module
+
 from company_sso_core.exceptions import ProviderNotConfiguredError
-from company_sso_core.providers.base import BaseOAuthProvider, get_provider_registry
-from company_sso_core.providers.builtin_configs import BUILTIN_OAUTH2_CONFIGS
+from company_sso_core.providers.base import BaseOAuthProvider
+from company_sso_core.providers.base import get_provider_registry as _get_registry
+from company_sso_core.providers.manifest import BUILTIN_PROVIDER_SLUGS, DEDICATED_PROVIDER_MODULES
+
+# Built-in slugs never change at runtime; host-defined provider classes are checked
+# against the live registry so they are still accepted.
+_MANIFEST_SLUGS = frozenset(DEDICATED_PROVIDER_MODULES) | BUILTIN_PROVIDER_SLUGS
+
+
+def _load_dedicated(slug: str):
+    """Import the module for a dedicated provider (registers its class); return the class or None."""
+    registry = _get_registry()
+    if slug not in registry and slug in DEDICATED_PROVIDER_MODULES:
+        import_module(DEDICATED_PROVIDER_MODULES[slug])
+    return registry.get(slug)
+
 
-# Import providers so they register with the metaclass.
-from . import google  # noqa: F401
-from . import github  # noqa: F401
-from . import facebook  # noqa: F401
-from . import generic  # noqa: F401
+def is_supported_provider(slug: str) -> bool:
+    """True if slug has a dedicated provider class or a built-in generic config. No DB access."""
+    return slug in _MANIFEST_SLUGS or slug in _get_registry()
 
 
 def get_provider(slug: str, credentials: dict) -> BaseOAuthProvider:
@@ -21,22 +35,39 @@ def get_provider(slug: str, credentials: dict) -> BaseOAuthProvider:
     otherwise GenericOAuth2Provider for any slug in BUILTIN_OAUTH2_CONFIGS (50+).
     Raises ProviderNotConfiguredError if slug is not supported.
     """
-    registry = get_provider_registry()
-    provider_class = registry.get(slug)
+    provider_class = _load_dedicated(slug)
     if provider_class is not None:
         return provider_class(credentials)
-    if slug in BUILTIN_OAUTH2_CONFIGS:
+    if slug in BUILTIN_PROVIDER_SLUGS:
         from company_sso_core.providers.generic import GenericOAuth2Provider
         return GenericOAuth2Provider(credentials, slug=slug)
     raise ProviderNotConfiguredError()
 
 
+def get_provider_registry():
+    """Return the registry of dedicated provider classes, importing all manifest modules first."""
+    for slug in DEDICATED_PROVIDER_MODULES:
+        _load_dedicated(slug)
+    return _get_registry()
+
+
 def get_all_provider_slugs() -> list[str]:
     """Return all supported SSO provider slugs (dedicated + generic), sorted."""
-    registry = get_provider_registry()
-    dedicated = sorted(registry.keys())
-    generic_slugs = sorted(BUILTIN_OAUTH2_CONFIGS.keys())
-    return sorted(set(dedicated) | set(generic_slugs))
+    return sorted(_MANIFEST_SLUGS | set(_get_registry()))
+
+
+def __getattr__(name):
+    # Backwards compatibility: BUILTIN_OAUTH2_CONFIGS used to be imported here eagerly.
+    if name == "BUILTIN_OAUTH2_CONFIGS":
+        from company_sso_core.providers.builtin_configs import BUILTIN_OAUTH2_CONFIGS
+        return BUILTIN_OAUTH2_CONFIGS
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
-__all__ = ["BaseOAuthProvider", "get_provider", "get_provider_registry", "get_all_provider_slugs"]
+__all__ = [
+    "BaseOAuthProvider",
+    "get_provider",
+    "get_provider_registry",
+    "get_all_provider_slugs",
+    "is_supported_provider",
+]
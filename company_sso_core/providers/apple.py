@@ -0,0 +1,195 @@
+"""
+Sign in with Apple. Apple's client_secret is a short-lived ES256-signed JWT, built
+here from extra_config team_id and key_id and the Sign in with Apple private key
+(PEM). Put the key in client_secret, which is encrypted at rest with
+SSO_SECRET_KEYS, or in extra_config private_key. A client_secret that is not a PEM
+key is sent as is (a JWT signed by the host).
+
+Signed secrets are cached per process until REFRESH_MARGIN seconds before expiry;
+concurrent logins that find it expired wait for a single re-sign. Apple has no
+userinfo endpoint: the user comes from the id_token claims in the token response.
+"""
+
+import base64
+import hashlib
+import threading
+import time
+
+from company_sso_core import codec
+from company_sso_core.exceptions import OAuthProviderError, ProviderNotConfiguredError
+from company_sso_core.providers import http
+from company_sso_core.providers.base import BaseOAuthProvider
+from company_sso_core.services.singleflight import SingleFlight
+
+try:
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.hazmat.primitives.asymmetric.utils import decode_dss_signature
+except ImportError:  # optional dependency
+    ec = None
+
+ISSUER = "https://appleid.apple.com"
+DEFAULT_SECRET_TTL = 86400
+MAX_SECRET_TTL = 15_777_000  # Apple rejects client secrets valid for more than six months.
+REFRESH_MARGIN = 300
+ID_TOKEN_LEEWAY = 60
+SIGN_WAIT_TIMEOUT = 10
+_MAX_CACHED_SECRETS = 128
+
+_secrets: dict[str, tuple] = {}
+_secrets_lock = threading.Lock()
+_signing = SingleFlight()
+
+
+def _b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64url_decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def make_client_secret(
+    client_id: str, team_id: str, key_id: str, private_key: str, ttl: int, now: int
+) -> str:
+    """ES256 client-secret JWT for client_id (the Services ID), valid for ttl seconds from now."""
+    try:
+        key = serialization.load_pem_private_key(private_key.encode("utf-8"), password=None)
+    except (ValueError, TypeError):
+        raise ProviderNotConfiguredError(
+            detail="apple: private key is not a valid unencrypted PEM key"
+        ) from None
+    if not isinstance(key, ec.EllipticCurvePrivateKey) or key.curve.name != "secp256r1":
+        raise ProviderNotConfiguredError(detail="apple: private key must be a P-256 EC key")
+    header = {"alg": "ES256", "kid": key_id}
+    payload = {"iss": team_id, "iat": now, "exp": now + ttl, "aud": ISSUER, "sub": client_id}
+    signing_input = f"{_b64url(codec.dumps(header))}.{_b64url(codec.dumps(payload))}"
+    r, s = decode_dss_signature(key.sign(signing_input.encode("ascii"), ec.ECDSA(hashes.SHA256())))
+    return f"{signing_input}.{_b64url(r.to_bytes(32, 'big') + s.to_bytes(32, 'big'))}"
+
+
+def get_client_secret(client_id: str, team_id: str, key_id: str, private_key: str, ttl: int) -> str:
+    """Cached client-secret JWT; re-signed once (single-flight) within REFRESH_MARGIN of expiry."""
+    cache_key = hashlib.sha256(
+        "\0".join((client_id, team_id, key_id, private_key, str(ttl))).encode()
+    ).hexdigest()
+    entry = _secrets.get(cache_key)
+    if entry is not None and entry[1] > time.time():
+        return entry[0]
+
+    def sign():
+        entry = _secrets.get(cache_key)
+        if entry is not None and entry[1] > time.time():  # re-signed by the previous leader
+            return entry[0]
+        issued = int(time.time())
+        token = make_client_secret(client_id, team_id, key_id, private_key, ttl, issued)
+        with _secrets_lock:
+            if len(_secrets) >= _MAX_CACHED_SECRETS:
+                _secrets.pop(next(iter(_secrets)))
+            _secrets[cache_key] = (token, issued + ttl - min(REFRESH_MARGIN, ttl // 2))
+        return token
+
+    return _signing.do(cache_key, sign, timeout=SIGN_WAIT_TIMEOUT)
+
+
+def parse_id_token(id_token: str, client_id: str, now: float | None = None) -> dict:
+    """
+    Claims of an id_token received from Apple's token endpoint, after checking iss,
+    aud and exp. The signature is not verified: the token came straight from Apple
+    over TLS, which OpenID Connect Core 3.1.3.7 accepts in place of it.
+    """
+    parts = id_token.split(".") if isinstance(id_token, str) else []
+    if len(parts) != 3:
+        raise OAuthProviderError(detail="Invalid Apple id_token")
+    try:
+        claims = codec.loads(_b64url_decode(parts[1]))
+    except ValueError:
+        raise OAuthProviderError(detail="Invalid Apple id_token") from None
+    if not isinstance(claims, dict):
+        raise OAuthProviderError(detail="Invalid Apple id_token")
+    audience = claims.get("aud")
+    audiences = audience if isinstance(audience, list) else [audience]
+    if claims.get("iss") != ISSUER or client_id not in audiences:
+        raise OAuthProviderError(detail="Apple id_token was not issued for this client")
+    exp = claims.get("exp")
+    now = time.time() if now is None else now
+    if not isinstance(exp, (int, float)) or exp + ID_TOKEN_LEEWAY < now:
+        raise OAuthProviderError(detail="Apple id_token has expired")
+    if not claims.get("sub"):
+        raise OAuthProviderError(detail="Apple id_token has no subject")
+    return claims
+
+
+class AppleOAuthProvider(BaseOAuthProvider):
+    """Sign in with Apple; client_id is the Services ID."""
+
+    slug = "apple"
+    token_url = "https://appleid.apple.com/auth/token"
+    user_info_url = ""
+    authorization_url = "https://appleid.apple.com/auth/authorize"
+
+    def __init__(self, credentials: dict):
+        super().__init__(credentials)
+        self._token_response = None
+
+    def client_secret(self) -> str:
+        """The client_secret to send: the cached signed JWT, or the configured value if no key."""
+        extra = self.credentials.get("extra_config") or {}
+        secret = self.credentials.get("client_secret") or ""
+        private_key = extra.get("private_key") or (
+            secret if secret.lstrip().startswith("-----BEGIN") else ""
+        )
+        if not private_key:
+            return secret
+        team_id, key_id = extra.get("team_id"), extra.get("key_id")
+        if not team_id or not key_id:
+            raise ProviderNotConfiguredError(detail="apple: extra_config needs team_id and key_id")
+        if ec is None:
+            raise ProviderNotConfiguredError(
+                detail="apple: signing the client secret requires the cryptography package"
+            )
+        ttl = min(int(extra.get("secret_ttl") or DEFAULT_SECRET_TTL), MAX_SECRET_TTL)
+        return get_client_secret(
+            self.credentials.get("client_id") or "", team_id, key_id, private_key, ttl
+        )
+
+    def exchange_code(self, code: str, redirect_uri: str, **kwargs) -> dict:
+        """Exchange authorization code for tokens (access_token and id_token)."""
+        client_id = self.credentials.get("client_id")
+        client_secret = self.client_secret()
+        if not client_id or not client_secret:
+            raise OAuthProviderError(detail="Missing Apple client_id or client_secret")
+        resp = http.post(
+            self.token_url,
+            data={
+                "code": code,
+                "client_id": client_id,
+                "client_secret": client_secret,
+                "redirect_uri": redirect_uri,
+                "grant_type": "authorization_code",
+            },
+            headers={"Accept": "application/json"},
+            timeout=30,
+        )
+        resp.raise_for_status()
+        self._token_response = codec.loads(resp.content)
+        return self._token_response
+
+    def get_user_info(
+        self, access_token: str, token_response: dict | None = None, **kwargs
+    ) -> dict:
+        """
+        User from the id_token of token_response (default: this provider's last
+        exchange_code result). Apple sends the name only to the first authorization
+        redirect, never to the token endpoint, so name is empty.
+        """
+        id_token = (token_response or self._token_response or {}).get("id_token")
+        if not id_token:
+            raise OAuthProviderError(detail="Apple token response has no id_token")
+        claims = parse_id_token(id_token, self.credentials.get("client_id"))
+        return {
+            "id": claims["sub"],
+            "email": claims.get("email") or "",
+            "name": "",
+            "picture": None,
+        }
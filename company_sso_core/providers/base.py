@@ -3,6 +3,8 @@ Base OAuth provider (Strategy pattern). Credentials injected via __init__; no se
 """
 from abc import ABC, ABCMeta, abstractmethod
 
+from company_sso_core.providers import http
+
 
 _PROVIDER_REGISTRY: dict[str, type] = {}
 
@@ -12,8 +14,10 @@ class ProviderRegistryMeta(ABCMeta):
 
     def __new__(mcs, name, bases, attrs):
         cls = super().__new__(mcs, name, bases, attrs)
-        if name != "BaseOAuthProvider" and hasattr(cls, "slug") and cls.slug:
-            _PROVIDER_REGISTRY[cls.slug] = cls
+        slug = getattr(cls, "slug", None)
+        # Only string slugs register; GenericOAuth2Provider exposes slug as a property.
+        if name != "BaseOAuthProvider" and isinstance(slug, str) and slug:
+            _PROVIDER_REGISTRY[slug] = cls
         return cls
 
 
@@ -46,6 +50,17 @@ class BaseOAuthProvider(ABC, metaclass=ProviderRegistryMeta):
         """
         pass
 
+    def secondary_fetches(self, access_token: str, **kwargs) -> dict:
+        """
+        Optional enrichment requests run concurrently with the userinfo call:
+        name -> zero-argument callable. Default: none.
+        """
+        return {}
+
+    def fetch_with_secondaries(self, primary, access_token: str, **kwargs) -> tuple:
+        """Run primary() alongside secondary_fetches(); returns (primary_result, {name: result})."""
+        return http.run_concurrently(primary, self.secondary_fetches(access_token, **kwargs))
+
 
 def get_provider_registry():
     """Return the internal registry (for tests)."""
@@ -14,7 +14,7 @@ BUILTIN_OAUTH2_CONFIGS = {
     },
     "apple": {
         "token_url": "https://appleid.apple.com/auth/token",
-        "user_info_url": "",  # Apple returns user in id_token / first callback only
+        "user_info_url": "",  # Apple returns user in id_token; the dedicated AppleOAuthProvider reads it
         "authorization_url": "https://appleid.apple.com/auth/authorize",
         "user_info_map": {"id": "sub", "email": "email", "name": "name", "picture": None},
     },
@@ -1,9 +1,10 @@
 """
 Facebook OAuth2 provider. Credentials injected via __init__. Placeholder implementation.
 """
-import requests
 
+from company_sso_core import codec
 from company_sso_core.exceptions import OAuthProviderError
+from company_sso_core.providers import http
 from company_sso_core.providers.base import BaseOAuthProvider
 
 
@@ -14,6 +15,7 @@ class FacebookOAuthProvider(BaseOAuthProvider):
     token_url = "https://graph.facebook.com/v18.0/oauth/access_token"
     user_info_url = "https://graph.facebook.com/me"
     authorization_url = "https://www.facebook.com/v18.0/dialog/oauth"
+    picture_url = "https://graph.facebook.com/me/picture"
 
     def exchange_code(self, code: str, redirect_uri: str, **kwargs) -> dict:
         """Exchange authorization code for tokens."""
@@ -27,26 +29,44 @@ class FacebookOAuthProvider(BaseOAuthProvider):
             "redirect_uri": redirect_uri,
             "code": code,
         }
-        resp = requests.get(self.token_url, params=params, timeout=30)
+        resp = http.get(self.token_url, params=params, timeout=30)
         resp.raise_for_status()
-        return resp.json()
+        return codec.loads(resp.content)
 
     def get_user_info(self, access_token: str, **kwargs) -> dict:
-        """Fetch user info from Facebook."""
-        resp = requests.get(
-            self.user_info_url,
-            params={"fields": "id,name,email,picture"},
-            headers={"Authorization": f"Bearer {access_token}"},
-            timeout=30,
+        """
+        Fetch user info from Facebook. With extra_config "large_picture", the large
+        profile picture is fetched concurrently with /me.
+        """
+        data, extras = self.fetch_with_secondaries(
+            lambda: self._get_json(self.user_info_url, access_token, {"fields": "id,name,email,picture"}),
+            access_token,
+            **kwargs,
         )
-        resp.raise_for_status()
-        data = resp.json()
         picture = None
         if data.get("picture", {}).get("data", {}).get("url"):
             picture = data["picture"]["data"]["url"]
+        large = (extras.get("picture") or {}).get("data", {}).get("url")
         return {
             "id": str(data.get("id", "")),
             "email": data.get("email", ""),
             "name": data.get("name", ""),
-            "picture": picture,
+            "picture": large or picture,
         }
+
+    def secondary_fetches(self, access_token: str, **kwargs) -> dict:
+        extra = self.credentials.get("extra_config") or {}
+        if not extra.get("large_picture"):
+            return {}
+        params = {"redirect": "false", "type": "large"}
+        return {"picture": lambda: self._get_json(self.picture_url, access_token, params)}
+
+    def _get_json(self, url: str, access_token: str, params: dict):
+        resp = http.get(
+            url,
+            params=params,
+            headers={"Authorization": f"Bearer {access_token}"},
+            timeout=30,
+        )
+        resp.raise_for_status()
+        return codec.loads(resp.content)
@@ -3,11 +3,19 @@ Generic OAuth2 provider: works with any OAuth2/OIDC provider via built-in config
 Used when no dedicated provider class exists; supports 50+ built-in slugs.
 """
 import re
-import requests
+from urllib.parse import quote
 
-from company_sso_core.exceptions import OAuthProviderError
+from company_sso_core import codec
+from company_sso_core.exceptions import OAuthProviderError, ProviderNotConfiguredError
+from company_sso_core.providers import http
 from company_sso_core.providers.base import BaseOAuthProvider
 from company_sso_core.providers.builtin_configs import BUILTIN_OAUTH2_CONFIGS
+from company_sso_core.providers.templates import (
+    ENDPOINT_KEYS,
+    compile_template,
+    endpoint_errors,
+    tenant_values,
+)
 
 
 def _get_nested(data: dict, path: str):
@@ -44,12 +52,19 @@ class GenericOAuth2Provider(BaseOAuthProvider):
         self._config = BUILTIN_OAUTH2_CONFIGS[self._slug].copy()
         extra = (credentials.get("extra_config") or {}).copy()
         # Allow extra_config to override endpoints (e.g. Okta domain, Keycloak realm)
-        for key in ("token_url", "user_info_url", "authorization_url"):
+        for key in ENDPOINT_KEYS:
             if key in extra and extra[key]:
                 self._config[key] = extra[key]
-        self.token_url = self._config.get("token_url") or ""
-        self.user_info_url = self._config.get("user_info_url") or ""
-        self.authorization_url = self._config.get("authorization_url") or ""
+        urls = {key: (self._config.get(key) or "").strip() for key in ENDPOINT_KEYS}
+        errors = endpoint_errors(urls, extra)
+        if errors:
+            # A tenant-scoped provider without its tenant values is a configuration error, not an IdP error.
+            raise ProviderNotConfiguredError(detail=f"{self._slug}: {'; '.join(errors)}")
+        # Tenant placeholders are filled once here; only runtime ones (e.g. {token}) remain.
+        values = tenant_values(extra)
+        self.token_url = compile_template(urls["token_url"]).render(values)
+        self.user_info_url = compile_template(urls["user_info_url"]).render(values)
+        self.authorization_url = compile_template(urls["authorization_url"]).render(values)
 
     @property
     def slug(self) -> str:
@@ -61,7 +76,7 @@ class GenericOAuth2Provider(BaseOAuthProvider):
         client_secret = self.credentials.get("client_secret")
         if not client_id or not client_secret:
             raise OAuthProviderError(detail=f"Missing client_id or client_secret for {self._slug}")
-        token_url = self._resolve_url(self.token_url)
+        token_url = self.token_url
         if not token_url:
             raise OAuthProviderError(detail=f"Missing token_url for {self._slug}")
         data = {
@@ -71,27 +86,27 @@ class GenericOAuth2Provider(BaseOAuthProvider):
             "redirect_uri": redirect_uri,
             "grant_type": "authorization_code",
         }
-        resp = requests.post(
+        resp = http.post(
             token_url,
             data=data,
             headers={"Accept": "application/json"},
             timeout=30,
         )
         resp.raise_for_status()
-        return resp.json()
+        return codec.loads(resp.content)
 
     def get_user_info(self, access_token: str, **kwargs) -> dict:
         """Fetch user info and normalize to id, email, name, picture."""
-        user_info_url = self._resolve_url(self.user_info_url)
+        user_info_url = compile_template(self.user_info_url).render({"token": quote(access_token, safe="")})
         if not user_info_url:
             return {"id": None, "email": "", "name": "", "picture": None}
-        resp = requests.get(
+        resp = http.get(
             user_info_url,
             headers={"Authorization": f"Bearer {access_token}"},
             timeout=30,
         )
         resp.raise_for_status()
-        data = resp.json()
+        data = codec.loads(resp.content)
         # Some APIs wrap in "data", "response", or "user"
         if isinstance(data, dict) and "data" in data:
             inner = data["data"]
@@ -101,8 +116,8 @@ class GenericOAuth2Provider(BaseOAuthProvider):
                 data = inner
         if isinstance(data, dict) and "response" in data and isinstance(data["response"], dict):
             data = data["response"]
-        if isinstance(data, dict) and "user" in data:
-            data = data.get("user") or data
+        if isinstance(data, dict) and isinstance(data.get("user"), dict):
+            data = data["user"]
         if isinstance(data, list) and data and isinstance(data[0], dict):
             data = data[0]
         user_map = self._config.get("user_info_map") or {}
@@ -112,13 +127,3 @@ class GenericOAuth2Provider(BaseOAuthProvider):
             "name": (_get_nested(data, user_map.get("name") or "name") or "") if user_map.get("name") else "",
             "picture": _get_nested(data, user_map.get("picture") or "picture") if user_map.get("picture") else None,
         }
-
-    def _resolve_url(self, url: str) -> str:
-        """Replace placeholders like {domain}, {subdomain}, {realm_url} from extra_config."""
-        if not url:
-            return ""
-        extra = self.credentials.get("extra_config") or {}
-        for key, value in extra.items():
-            if value and "{" + key + "}" in url:
-                url = url.replace("{" + key + "}", str(value).strip("/"))
-        return url.strip() or ""
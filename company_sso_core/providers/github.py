@@ -1,9 +1,10 @@
 """
 GitHub OAuth2 provider. Credentials injected via __init__. Placeholder implementation.
 """
-import requests
 
+from company_sso_core import codec
 from company_sso_core.exceptions import OAuthProviderError
+from company_sso_core.providers import http
 from company_sso_core.providers.base import BaseOAuthProvider
 
 
@@ -14,6 +15,7 @@ class GitHubOAuthProvider(BaseOAuthProvider):
     token_url = "https://github.com/login/oauth/access_token"
     user_info_url = "https://api.github.com/user"
     authorization_url = "https://github.com/login/oauth/authorize"
+    emails_url = "https://api.github.com/user/emails"
 
     def exchange_code(self, code: str, redirect_uri: str, **kwargs) -> dict:
         """Exchange authorization code for tokens."""
@@ -27,36 +29,45 @@ class GitHubOAuthProvider(BaseOAuthProvider):
             "client_secret": client_secret,
             "redirect_uri": redirect_uri,
         }
-        resp = requests.post(
+        resp = http.post(
             self.token_url,
             data=data,
             headers={"Accept": "application/json"},
             timeout=30,
         )
         resp.raise_for_status()
-        return resp.json()
+        return codec.loads(resp.content)
 
     def get_user_info(self, access_token: str, **kwargs) -> dict:
-        """Fetch user info from GitHub."""
-        resp = requests.get(
-            self.user_info_url,
-            headers={"Authorization": f"Bearer {access_token}"},
-            timeout=30,
+        """
+        Fetch user info from GitHub. /user/emails is fetched concurrently with /user
+        (extra_config "fetch_emails", default True) for accounts with a private email.
+        """
+        data, extras = self.fetch_with_secondaries(
+            lambda: self._get_json(self.user_info_url, access_token), access_token, **kwargs
         )
-        resp.raise_for_status()
-        data = resp.json()
         email = data.get("email")
-        if not email and kwargs.get("fetch_emails"):
-            em_resp = requests.get(
-                "https://api.github.com/user/emails",
-                headers={"Authorization": f"Bearer {access_token}"},
-                timeout=30,
-            )
-            if em_resp.ok and em_resp.json():
-                email = next((e["email"] for e in em_resp.json() if e.get("primary")), em_resp.json()[0].get("email"))
+        emails = extras.get("emails")
+        if not email and emails:
+            email = next((e["email"] for e in emails if e.get("primary")), emails[0].get("email"))
         return {
             "id": str(data.get("id")),
             "email": email or "",
             "name": data.get("name", "") or data.get("login", ""),
             "picture": data.get("avatar_url"),
         }
+
+    def secondary_fetches(self, access_token: str, **kwargs) -> dict:
+        extra = self.credentials.get("extra_config") or {}
+        if not kwargs.get("fetch_emails", extra.get("fetch_emails", True)):
+            return {}
+        return {"emails": lambda: self._get_json(self.emails_url, access_token)}
+
+    def _get_json(self, url: str, access_token: str):
+        resp = http.get(
+            url,
+            headers={"Authorization": f"Bearer {access_token}"},
+            timeout=30,
+        )
+        resp.raise_for_status()
+        return codec.loads(resp.content)
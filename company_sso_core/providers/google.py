@@ -1,9 +1,10 @@
 """
 Google OAuth2 provider. Credentials (client_id, client_secret) injected via __init__.
 """
-import requests
 
+from company_sso_core import codec
 from company_sso_core.exceptions import OAuthProviderError
+from company_sso_core.providers import http
 from company_sso_core.providers.base import BaseOAuthProvider
 
 
@@ -28,24 +29,24 @@ class GoogleOAuthProvider(BaseOAuthProvider):
             "redirect_uri": redirect_uri,
             "grant_type": "authorization_code",
         }
-        resp = requests.post(
+        resp = http.post(
             self.token_url,
             data=data,
             headers={"Accept": "application/json"},
             timeout=30,
         )
         resp.raise_for_status()
-        return resp.json()
+        return codec.loads(resp.content)
 
     def get_user_info(self, access_token: str, **kwargs) -> dict:
         """Fetch user info from Google."""
-        resp = requests.get(
+        resp = http.get(
             self.user_info_url,
             headers={"Authorization": f"Bearer {access_token}"},
             timeout=30,
         )
         resp.raise_for_status()
-        data = resp.json()
+        data = codec.loads(resp.content)
         return {
             "id": data.get("id"),
             "email": data.get("email"),
@@ -0,0 +1,241 @@
+"""
+Outbound HTTP for providers. `requests` is imported on the first call, not when
+provider modules are imported. Calls share one pooled Session, so keep-alive
+connections (and their TLS handshakes) are reused across logins. The Session
+accepts no cookies: a Set-Cookie from one user's token or userinfo call must not
+be replayed on another user's requests. A forked child (e.g. a gunicorn worker of
+a --preload master) starts with its own Session and fetch pool, so workers never
+share the parent's pooled TLS connections.
+
+Response bodies are streamed and capped at SSO_HTTP_MAX_RESPONSE_BYTES (per
+provider inside response_limit(slug)); a larger body is abandoned as soon as its
+Content-Length or the bytes read so far exceed the cap, with
+UpstreamResponseTooLargeError.
+"""
+import contextvars
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+from company_sso_core import tracing
+from company_sso_core.exceptions import UpstreamResponseTooLargeError
+from company_sso_core.utils import get_setting
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FETCH_WORKERS = 8
+DEFAULT_FETCH_TIMEOUT = 5.0
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_MAX_RESPONSE_BYTES = 1024 * 1024
+_READ_CHUNK_SIZE = 16 * 1024
+
+# Provider whose limit applies to requests made in this context (set by response_limit).
+_provider: contextvars.ContextVar = contextvars.ContextVar("sso_http_provider", default=None)
+
+_pool: ThreadPoolExecutor | None = None
+_pool_slots: threading.BoundedSemaphore | None = None
+_pool_lock = threading.Lock()
+_session = None
+_session_lock = threading.Lock()
+
+
+def _requests():
+    import requests
+
+    return requests
+
+
+def get_session():
+    """Shared cookieless requests.Session; keeps up to SSO_HTTP_POOL_MAXSIZE connections per host."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                # Imported here: http.cookiejar pulls in urllib.request.
+                from http.cookiejar import DefaultCookiePolicy
+
+                requests = _requests()
+                maxsize = get_setting("SSO_HTTP_POOL_MAXSIZE", DEFAULT_POOL_MAXSIZE)
+                adapter = requests.adapters.HTTPAdapter(pool_maxsize=maxsize)
+                session = requests.Session()
+                session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+def _reset_after_fork() -> None:
+    """
+    In a forked child, drop the parent's Session and fetch pool without closing them:
+    their sockets are shared with the parent, and the pool's threads did not survive.
+    """
+    global _session, _session_lock, _pool, _pool_slots, _pool_lock
+    _session, _session_lock = None, threading.Lock()
+    _pool, _pool_slots, _pool_lock = None, None, threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def max_response_bytes(provider_slug: str | None = None) -> int | None:
+    """
+    Body size cap for provider_slug: SSO_HTTP_MAX_RESPONSE_BYTES, an int or a dict
+    keyed by slug with an optional "*" default. None or 0 means unlimited.
+    """
+    setting = get_setting("SSO_HTTP_MAX_RESPONSE_BYTES", DEFAULT_MAX_RESPONSE_BYTES)
+    if isinstance(setting, dict):
+        return setting.get(provider_slug, setting.get("*", DEFAULT_MAX_RESPONSE_BYTES))
+    return setting
+
+
+@contextmanager
+def response_limit(provider_slug: str):
+    """Apply provider_slug's response size cap to requests in this block (and fetches it starts)."""
+    token = _provider.set(provider_slug)
+    try:
+        yield
+    finally:
+        _provider.reset(token)
+
+
+def _too_large(resp, url: str, limit: int):
+    resp.close()
+    logger.warning("Aborted response from %s: body exceeds %d bytes", urlsplit(url).hostname, limit)
+    return UpstreamResponseTooLargeError()
+
+
+def _read_bounded(resp, url: str):
+    """Read a streamed response's body into resp.content, aborting once it exceeds the cap."""
+    limit = max_response_bytes(_provider.get())
+    if not limit:
+        return resp
+    length = resp.headers.get("Content-Length")
+    if length and length.isdigit() and int(length) > limit:
+        raise _too_large(resp, url, limit)
+    body = bytearray()
+    for chunk in resp.iter_content(_READ_CHUNK_SIZE):
+        body += chunk
+        if len(body) > limit:
+            raise _too_large(resp, url, limit)
+    # What Response.content would have done, so callers read the body as usual.
+    resp._content = bytes(body)
+    resp._content_consumed = True
+    return resp
+
+
+def _request(method: str, url: str, **kwargs):
+    """One traced request: span with host, status and size; traceparent sent upstream."""
+    attributes = {"http.method": method, "server.address": urlsplit(url).hostname}
+    with tracing.span("sso.http", **attributes) as span:
+        traceparent = tracing.current_traceparent()
+        if traceparent is not None:
+            kwargs["headers"] = {**(kwargs.get("headers") or {}), tracing.TRACEPARENT_HEADER: traceparent}
+        resp = _read_bounded(get_session().request(method, url, stream=True, **kwargs), url)
+        span.set_attribute("http.status_code", resp.status_code)
+        span.set_attribute("http.response.body.size", len(resp.content))
+        return resp
+
+
+def get(url: str, **kwargs):
+    """session.get(url, **kwargs) on the shared session, with the body size cap."""
+    if tracing.get_exporter() is not None:
+        return _request("GET", url, **kwargs)
+    return _read_bounded(get_session().get(url, stream=True, **kwargs), url)
+
+
+def post(url: str, **kwargs):
+    """session.post(url, **kwargs) on the shared session, with the body size cap."""
+    if tracing.get_exporter() is not None:
+        return _request("POST", url, **kwargs)
+    return _read_bounded(get_session().post(url, stream=True, **kwargs), url)
+
+
+def open_connection(url: str, timeout: float) -> None:
+    """
+    Establish (DNS, TCP, TLS) a pooled keep-alive connection to url's host with a
+    HEAD request. The response status is irrelevant; only the connection is kept.
+    """
+    get_session().head(url, timeout=timeout, allow_redirects=False)
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool, _pool_slots
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                workers = get_setting("SSO_PROVIDER_FETCH_WORKERS", DEFAULT_FETCH_WORKERS)
+                _pool_slots = threading.BoundedSemaphore(workers)
+                _pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sso-fetch")
+    return _pool
+
+
+def _submit(fn):
+    """Start fn on the pool if a worker is free; None when every worker is busy (never queued)."""
+    pool = _get_pool()
+    if not _pool_slots.acquire(blocking=False):
+        return None
+    try:
+        # A copy of the caller's context, so the fetch's spans join the login trace.
+        future = pool.submit(contextvars.copy_context().run, fn)
+    except RuntimeError:
+        _pool_slots.release()
+        raise
+    # Runs on completion and on cancel, so a cancelled fetch frees its slot too.
+    future.add_done_callback(lambda _: _pool_slots.release())
+    return future
+
+
+def _run_secondary(name: str, fn, extras: dict) -> None:
+    try:
+        extras[name] = fn()
+    except Exception as e:
+        logger.warning("Secondary provider fetch %r failed: %s", name, type(e).__name__)
+
+
+def run_concurrently(primary, secondary: dict) -> tuple:
+    """
+    Run primary() in the calling thread while the secondary callables run on a
+    bounded shared pool (SSO_PROVIDER_FETCH_WORKERS). Returns (primary_result,
+    {name: result}). Errors from primary propagate; failed secondaries are
+    logged and left out of the dict, since they only enrich the profile.
+
+    Fetches never queue behind other providers': when every worker is busy, a
+    fetch runs in the calling thread after primary(). Pooled fetches are waited
+    for until SSO_PROVIDER_FETCH_TIMEOUT seconds after primary() started; a
+    fetch still running then is left out.
+    """
+    if not secondary:
+        return primary(), {}
+    started = time.monotonic()
+    futures, inline = {}, {}
+    for name, fn in secondary.items():
+        future = _submit(fn)
+        if future is None:
+            inline[name] = fn
+        else:
+            futures[name] = future
+    try:
+        result = primary()
+    except BaseException:
+        for future in futures.values():
+            future.cancel()
+        raise
+    extras = {}
+    for name, fn in inline.items():
+        _run_secondary(name, fn, extras)
+    deadline = started + get_setting("SSO_PROVIDER_FETCH_TIMEOUT", DEFAULT_FETCH_TIMEOUT)
+    for name, future in futures.items():
+        try:
+            extras[name] = future.result(timeout=max(deadline - time.monotonic(), 0))
+        except FuturesTimeoutError:
+            future.cancel()
+            logger.warning("Secondary provider fetch %r timed out", name)
+        except Exception as e:
+            logger.warning("Secondary provider fetch %r failed: %s", name, type(e).__name__)
+    return result, extras
@@ -0,0 +1,24 @@
+"""
+Provider manifest: which slugs exist and where they live, without importing them.
+Keeps `import company_sso_core.providers` cheap; provider modules, `requests` and the
+built-in config table load on first use.
+"""
+# Dedicated provider classes: slug -> module that defines (and registers) the class.
+DEDICATED_PROVIDER_MODULES = {
+    "google": "company_sso_core.providers.google",
+    "github": "company_sso_core.providers.github",
+    "facebook": "company_sso_core.providers.facebook",
+    "apple": "company_sso_core.providers.apple",
+}
+
+# Slugs in builtin_configs.BUILTIN_OAUTH2_CONFIGS (kept in sync by tests).
+BUILTIN_PROVIDER_SLUGS = frozenset({
+    "microsoft", "apple", "twitter", "linkedin", "amazon", "discord", "slack", "spotify", "yahoo",
+    "gitlab", "bitbucket", "dropbox", "box", "paypal", "twitch", "reddit", "tumblr", "meetup",
+    "patreon", "pinterest", "salesforce", "zendesk", "atlassian", "notion", "figma", "linear",
+    "vercel", "digitalocean", "heroku", "zoom", "adobe", "dribbble", "strava", "soundcloud",
+    "trello", "asana", "yandex", "mailru", "vk", "weibo", "okta", "auth0", "keycloak", "instagram",
+    "snapchat", "tiktok", "evernote", "fitbit", "lastfm", "medium", "wordpress", "deviantart",
+    "stackoverflow", "imgur", "foursquare", "goodreads", "buffer", "podio", "basecamp", "xero",
+    "hubspot", "mailchimp", "shopify", "quickbooks", "stripe", "twilio", "openid",
+})
@@ -0,0 +1,89 @@
+"""
+Endpoint URL templates. Placeholders such as {domain}, {shop}, {issuer} are filled
+from extra_config (tenant values); {token} is filled at call time with the access
+token. Templates are parsed once per distinct URL and rendered with one format call.
+"""
+from functools import lru_cache
+from string import Formatter
+
+ENDPOINT_KEYS = ("token_url", "user_info_url", "authorization_url")
+
+# Filled by the provider at request time, never from extra_config.
+RUNTIME_PLACEHOLDERS = frozenset({"token"})
+
+
+class URLTemplate:
+    """A parsed URL with its placeholder names."""
+
+    __slots__ = ("template", "fields")
+
+    def __init__(self, template: str):
+        fields = []
+        for _, name, spec, conversion in Formatter().parse(template):
+            if name is None:
+                continue
+            if not name.isidentifier() or spec or conversion:
+                raise ValueError(f"Unsupported placeholder {{{name}}} in {template!r}")
+            if name not in fields:
+                fields.append(name)
+        self.template = template
+        self.fields = tuple(fields)
+
+    def missing(self, values: dict, runtime: frozenset = RUNTIME_PLACEHOLDERS) -> list:
+        """Placeholders not provided by values, ignoring runtime ones."""
+        return [name for name in self.fields if name not in values and name not in runtime]
+
+    def render(self, values: dict) -> str:
+        """Fill placeholders from values; runtime placeholders absent from values are kept."""
+        if not self.fields:
+            return self.template
+        kept = {name: "{" + name + "}" for name in RUNTIME_PLACEHOLDERS.intersection(self.fields)}
+        return self.template.format_map({**kept, **values})
+
+
+@lru_cache(maxsize=512)
+def compile_template(url: str) -> URLTemplate:
+    """Parsed template for url (cached). Raises ValueError for malformed templates."""
+    return URLTemplate(url)
+
+
+def tenant_values(extra_config: dict | None) -> dict:
+    """Placeholder values from extra_config: non-empty scalars, with surrounding slashes stripped."""
+    return {
+        key: str(value).strip("/")
+        for key, value in (extra_config or {}).items()
+        if value and not isinstance(value, (dict, list))
+    }
+
+
+def endpoint_errors(urls: dict, extra_config: dict | None) -> list:
+    """
+    Configuration errors for endpoint URLs (key -> template) given extra_config:
+    malformed templates and placeholders that extra_config does not fill.
+    """
+    values = tenant_values(extra_config)
+    errors = []
+    for key, url in urls.items():
+        if not url:
+            continue
+        try:
+            missing = compile_template(url).missing(values)
+        except ValueError as e:
+            errors.append(f"{key}: {e}")
+            continue
+        if missing:
+            errors.append(f"{key} needs extra_config {', '.join(missing)}")
+    return errors
+
+
+def validate_endpoints(slug: str, extra_config: dict | None) -> list:
+    """
+    Errors for a provider's effective endpoints: its built-in config (if any) with
+    extra_config URL overrides applied. Used when a SocialProvider is saved.
+    """
+    from company_sso_core.providers.builtin_configs import BUILTIN_OAUTH2_CONFIGS
+
+    extra = extra_config or {}
+    config = BUILTIN_OAUTH2_CONFIGS.get(slug) or {}
+    urls = {key: extra.get(key) or config.get(key) or "" for key in ENDPOINT_KEYS}
+    return endpoint_errors(urls, extra)
@@ -0,0 +1,13 @@
+"""DRF renderers for SSO views."""
+from rest_framework.renderers import JSONRenderer
+
+from company_sso_core import codec
+
+
+class SSOJSONRenderer(JSONRenderer):
+    """Compact JSON via company_sso_core.codec (orjson when installed)."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return codec.dumps(data)
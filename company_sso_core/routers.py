@@ -0,0 +1,73 @@
+"""
+Optional database router for SSO models. Add to the host settings:
+
+    DATABASE_ROUTERS = ["company_sso_core.routers.SSODatabaseRouter"]
+    SSO_LOG_DATABASE = "sso_logs"      # SSOLoginLog / SSOLoginStat reads and writes
+    SSO_READ_DATABASE = "replica"      # SocialProvider reads (writes stay on default)
+
+SSOLoginLog.provider and SSOLoginLog.user have no DB constraints, so on a separate
+log database they are plain denormalized ids; related rows are fetched from their
+own database and deletes there do not null them out.
+List this router after any host routers that place the user model elsewhere.
+"""
+from django.db import DEFAULT_DB_ALIAS
+
+from company_sso_core.utils import get_setting
+
+_APP_LABEL = "company_sso_core"
+_LOG_MODELS = frozenset({"ssologinlog", "ssologinstat"})
+
+
+def log_database() -> str:
+    """Alias that holds SSOLoginLog and SSOLoginStat (SSO_LOG_DATABASE, default "default")."""
+    return get_setting("SSO_LOG_DATABASE") or DEFAULT_DB_ALIAS
+
+
+def read_database() -> str:
+    """Alias for SocialProvider reads (SSO_READ_DATABASE, default "default")."""
+    return get_setting("SSO_READ_DATABASE") or DEFAULT_DB_ALIAS
+
+
+def is_log_database_separate() -> bool:
+    return log_database() != DEFAULT_DB_ALIAS
+
+
+def _model_name(model) -> str | None:
+    meta = model._meta
+    return meta.model_name if meta.app_label == _APP_LABEL else None
+
+
+class SSODatabaseRouter:
+    """Route login logs/stats to SSO_LOG_DATABASE and SocialProvider reads to SSO_READ_DATABASE."""
+
+    def db_for_read(self, model, **hints):
+        name = _model_name(model)
+        if name in _LOG_MODELS:
+            return log_database()
+        if name == "socialprovider":
+            return read_database()
+        instance = hints.get("instance")
+        if instance is not None and _model_name(instance.__class__) == "ssologinlog":
+            # log.user: without this Django would look for the user on the log database.
+            return DEFAULT_DB_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        if _model_name(model) in _LOG_MODELS:
+            return log_database()
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Log rows only hold ids of providers/users, so any pairing is allowed.
+        if "ssologinlog" in (_model_name(obj1.__class__), _model_name(obj2.__class__)):
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if app_label != _APP_LABEL or not is_log_database_separate():
+            return None
+        if model_name in _LOG_MODELS:
+            return db == log_database()
+        if db == log_database():
+            return False
+        return None
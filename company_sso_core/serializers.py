@@ -1,8 +1,15 @@
 """
 Request/response serializers for SSO API. Validation only.
 """
+import re
+from functools import lru_cache
+
+from django.core.exceptions import ValidationError
+from django.core.validators import URLValidator
 from rest_framework import serializers
 
+from company_sso_core.services.log_export import parse_cursor
+
 
 class SSOLoginSerializer(serializers.Serializer):
     """Request body for POST login/<provider>/."""
@@ -11,3 +18,76 @@ class SSOLoginSerializer(serializers.Serializer):
     workspace_id = serializers.IntegerField(required=False, allow_null=True)
     state = serializers.CharField(required=False, allow_blank=True)
     redirect_uri = serializers.URLField(required=False, allow_blank=True)
+
+
+# Characters DRF CharField rejects (null, lone surrogates).
+_PROHIBITED_CHARS = re.compile("[\x00\ud800-\udfff]")
+_url_validator = URLValidator()
+
+
+@lru_cache(maxsize=1024)
+def _is_valid_url(value: str) -> bool:
+    # Logins reuse a handful of redirect URIs, so the URLValidator regex runs once per URI.
+    try:
+        _url_validator(value)
+    except ValidationError:
+        return False
+    return True
+
+
+def _clean_text(value):
+    """value stripped if it is a plain string CharField would accept as is, else None."""
+    if type(value) is not str or _PROHIBITED_CHARS.search(value):
+        return None
+    return value.strip()
+
+
+def fast_validate_login(data) -> dict | None:
+    """
+    validated_data of SSOLoginSerializer for the common body shape (string code,
+    state and redirect_uri, int or null workspace_id), without building the
+    serializer. Returns None when the body needs the serializer: on any error, and
+    for inputs it coerces (e.g. numeric strings). Callers then run SSOLoginSerializer,
+    so results and error messages match it exactly.
+    """
+    if type(data) is not dict:
+        return None
+    code = _clean_text(data.get("code"))
+    if not code:
+        return None
+    validated = {"code": code}
+    if "workspace_id" in data:
+        workspace_id = data["workspace_id"]
+        if workspace_id is not None and type(workspace_id) is not int:
+            return None
+        validated["workspace_id"] = workspace_id
+    if "state" in data:
+        state = _clean_text(data["state"])
+        if state is None:
+            return None
+        validated["state"] = state
+    if "redirect_uri" in data:
+        redirect_uri = _clean_text(data["redirect_uri"])
+        if redirect_uri is None or (redirect_uri and not _is_valid_url(redirect_uri)):
+            return None
+        validated["redirect_uri"] = redirect_uri
+    return validated
+
+
+class SSOLogExportSerializer(serializers.Serializer):
+    """Query parameters for GET logs/export/."""
+
+    since = serializers.DateTimeField(required=False)
+    until = serializers.DateTimeField(required=False)
+    provider = serializers.CharField(required=False, max_length=50)
+    status = serializers.ChoiceField(required=False, choices=["success", "failed"])
+    after = serializers.CharField(required=False, help_text="Resume cursor: <created_at>,<id> of the last row received.")
+    output = serializers.ChoiceField(required=False, choices=["ndjson", "csv"], default="ndjson")
+    limit = serializers.IntegerField(required=False, min_value=1)
+
+    def validate_after(self, value):
+        try:
+            parse_cursor(value)
+        except ValueError:
+            raise serializers.ValidationError("Expected <created_at>,<id>.")
+        return value
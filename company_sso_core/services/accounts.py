@@ -0,0 +1,137 @@
+"""
+Built-in user resolution over SocialAccount. Use as
+SSO_GET_OR_CREATE_USER = "company_sso_core.services.accounts.get_or_create_sso_user".
+Identities are scoped to the workspace of the provider row that authenticated them
+(None for global providers), since a workspace's provider may use its own IdP.
+"""
+import hashlib
+import logging
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.utils.module_loading import import_string
+
+from company_sso_core.models import SocialAccount
+from company_sso_core.services.provider_cache import get_cache
+from company_sso_core.utils import accepts_keyword, get_setting
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ACCOUNT_CACHE_TTL = 300
+
+
+def _cache_key(provider_slug: str, external_id: str, workspace=None) -> str:
+    scope = "" if workspace is None else workspace
+    digest = hashlib.sha256(f"{provider_slug}\0{scope}\0{external_id}".encode()).hexdigest()[:32]
+    return f"sso:acct:{digest}"
+
+
+def forget_account(provider_slug: str, external_id: str, workspace=None) -> None:
+    """Drop the cached identity -> user mapping (e.g. after unlinking)."""
+    get_cache().delete(_cache_key(provider_slug, external_id, workspace))
+
+
+def _default_create_user(provider_slug: str, user_info: dict, request, workspace=None):
+    """
+    Create a user with a deterministic username (<slug>_<id>, or <slug>.<workspace>_<id>
+    for a workspace's provider), so concurrent first logins collide on it.
+    """
+    User = get_user_model()
+    prefix = provider_slug if workspace is None else f"{provider_slug}.{workspace}"
+    username = f"{prefix}_{user_info['id']}"[: User._meta.get_field(User.USERNAME_FIELD).max_length]
+    fields = {User.USERNAME_FIELD: username}
+    email_field = User.get_email_field_name()
+    if user_info.get("email") and email_field != User.USERNAME_FIELD:
+        fields[email_field] = user_info["email"]
+    user = User(**fields)
+    user.set_unusable_password()
+    user.save()
+    return user
+
+
+def _create_user_callable():
+    """
+    SSO_ACCOUNT_CREATE_USER (callable or dotted path) or the built-in default. It gets
+    workspace= only if it accepts that keyword.
+    """
+    fn = get_setting("SSO_ACCOUNT_CREATE_USER")
+    if fn is None:
+        return _default_create_user
+    if isinstance(fn, str):
+        return import_string(fn)
+    return fn
+
+
+def _cached_user(provider_slug: str, external_id: str, workspace):
+    user_id = get_cache().get(_cache_key(provider_slug, external_id, workspace))
+    if user_id is None:
+        return None
+    User = get_user_model()
+    try:
+        return User._default_manager.get(pk=user_id)
+    except User.DoesNotExist:
+        forget_account(provider_slug, external_id, workspace)
+        return None
+
+
+def _lookup_account(provider_slug: str, external_id: str, workspace=None):
+    """One query on the (provider_slug, workspace_id, external_id) unique index, with the user."""
+    return (
+        SocialAccount.objects.select_related("user")
+        .filter(provider_slug=provider_slug, workspace_id=workspace, external_id=external_id)
+        .first()
+    )
+
+
+def _remember(provider_slug: str, external_id: str, workspace, user) -> None:
+    ttl = get_setting("SSO_ACCOUNT_CACHE_TTL", DEFAULT_ACCOUNT_CACHE_TTL)
+    if ttl:
+        get_cache().set(_cache_key(provider_slug, external_id, workspace), user.pk, timeout=ttl)
+
+
+def get_or_create_sso_user(provider_slug: str, user_info: dict, request, workspace=None):
+    """
+    SSO_GET_OR_CREATE_USER implementation: resolve (provider_slug, workspace,
+    user_info["id"]) through SocialAccount in one indexed query (or a primary-key
+    lookup when the mapping is cached), creating the user and link on first login.
+    workspace is the workspace_id of the provider row that authenticated the user
+    (None for global providers). A concurrent first login that loses the race hits
+    IntegrityError and re-reads the winner's link.
+    Returns (user, created); (None, False) if user_info has no id.
+    """
+    if not user_info.get("id"):
+        return None, False
+    external_id = str(user_info["id"])
+
+    user = _cached_user(provider_slug, external_id, workspace)
+    if user is not None:
+        return user, False
+
+    account = _lookup_account(provider_slug, external_id, workspace)
+    if account is not None:
+        _remember(provider_slug, external_id, workspace, account.user)
+        return account.user, False
+
+    create_user = _create_user_callable()
+    create_kwargs = {"workspace": workspace} if accepts_keyword(create_user, "workspace") else {}
+    user_info = {**user_info, "id": external_id}
+    try:
+        with transaction.atomic():
+            user = create_user(provider_slug, user_info, request, **create_kwargs)
+            SocialAccount.objects.create(
+                user=user,
+                provider_slug=provider_slug,
+                workspace_id=workspace,
+                external_id=external_id,
+                email=user_info.get("email") or "",
+            )
+    except IntegrityError:
+        account = _lookup_account(provider_slug, external_id, workspace)
+        if account is None:
+            # The conflict was not on the link (e.g. the username already belongs to someone else).
+            raise
+        logger.info("Concurrent first login for %s resolved to existing account", provider_slug)
+        _remember(provider_slug, external_id, workspace, account.user)
+        return account.user, False
+    _remember(provider_slug, external_id, workspace, user)
+    return user, True
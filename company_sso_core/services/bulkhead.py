@@ -0,0 +1,188 @@
+"""
+Per-provider bulkheads: cap concurrent upstream calls (token exchange + userinfo)
+so one slow IdP cannot occupy every worker. Callers beyond the limit wait in a
+short bounded queue; once the queue is full, or the wait times out, they are
+rejected at once with ProviderBusyError.
+
+    SSO_PROVIDER_CONCURRENCY = 20                      # every provider
+    SSO_PROVIDER_CONCURRENCY = {"okta": 5, "okta:12": 2, "*": 20}   # slug, slug:workspace, default
+"""
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+
+from company_sso_core.exceptions import ProviderBusyError
+from company_sso_core.utils import get_setting
+
+DEFAULT_QUEUE_SIZE = 10
+DEFAULT_QUEUE_WAIT = 0.5
+
+
+def _wake(future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class Bulkhead:
+    """Counting semaphore with a bounded, time-limited wait queue; usable from threads and coroutines."""
+
+    def __init__(self, limit: int, queue_size: int, queue_wait: float):
+        self.limit = limit
+        self.queue_size = queue_size
+        self.queue_wait = queue_wait
+        self.in_flight = 0
+        self.queued = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._async_waiters = deque()
+
+    def _try_enter(self) -> bool:
+        """Take a slot if one is free; caller holds the lock."""
+        if self.in_flight < self.limit:
+            self.in_flight += 1
+            return True
+        return False
+
+    def _enqueue(self) -> None:
+        """Join the wait queue or reject; caller holds the lock."""
+        if self.queued >= self.queue_size:
+            self.rejected += 1
+            raise ProviderBusyError()
+        self.queued += 1
+
+    def _timed_out(self) -> ProviderBusyError:
+        self.rejected += 1
+        return ProviderBusyError()
+
+    def acquire(self) -> None:
+        with self._lock:
+            if self._try_enter():
+                return
+            self._enqueue()
+            try:
+                deadline = time.monotonic() + self.queue_wait
+                while not self._try_enter():
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise self._timed_out()
+                    self._cond.wait(remaining)
+            finally:
+                self.queued -= 1
+
+    async def acquire_async(self) -> None:
+        """Like acquire(), but waits on the event loop instead of blocking a thread."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._try_enter():
+                return
+            self._enqueue()
+        try:
+            deadline = time.monotonic() + self.queue_wait
+            while True:
+                future = loop.create_future()
+                with self._lock:
+                    if self._try_enter():
+                        return
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise self._timed_out()
+                    self._async_waiters.append((loop, future))
+                try:
+                    await asyncio.wait_for(future, remaining)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            with self._lock:
+                self.queued -= 1
+
+    def release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            # Wake one waiter of each kind; whoever loses the race re-queues.
+            self._cond.notify()
+            while self._async_waiters:
+                loop, future = self._async_waiters.popleft()
+                if not future.done():
+                    loop.call_soon_threadsafe(_wake, future)
+                    break
+
+    @contextmanager
+    def slot(self):
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    @asynccontextmanager
+    async def async_slot(self):
+        await self.acquire_async()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def gauges(self) -> dict:
+        return {"in_flight": self.in_flight, "queued": self.queued, "limit": self.limit, "rejected": self.rejected}
+
+
+_bulkheads: dict = {}
+_bulkheads_lock = threading.Lock()
+
+
+def _limit_for(provider_slug: str, workspace) -> tuple:
+    """(bulkhead key, limit) for (slug, workspace); limit None means unlimited."""
+    setting = get_setting("SSO_PROVIDER_CONCURRENCY")
+    if not isinstance(setting, dict):
+        return provider_slug, setting
+    if workspace is not None and f"{provider_slug}:{workspace}" in setting:
+        return f"{provider_slug}:{workspace}", setting[f"{provider_slug}:{workspace}"]
+    return provider_slug, setting.get(provider_slug, setting.get("*"))
+
+
+def get_bulkhead(provider_slug: str, workspace=None) -> Bulkhead | None:
+    """The bulkhead guarding (slug, workspace), or None if it has no concurrency limit."""
+    key, limit = _limit_for(provider_slug, workspace)
+    if not limit:
+        return None
+    bulkhead = _bulkheads.get(key)
+    if bulkhead is None or bulkhead.limit != limit:
+        with _bulkheads_lock:
+            bulkhead = _bulkheads.get(key)
+            if bulkhead is None or bulkhead.limit != limit:
+                bulkhead = _bulkheads[key] = Bulkhead(
+                    limit,
+                    get_setting("SSO_PROVIDER_QUEUE_SIZE", DEFAULT_QUEUE_SIZE),
+                    get_setting("SSO_PROVIDER_QUEUE_WAIT", DEFAULT_QUEUE_WAIT),
+                )
+    return bulkhead
+
+
+@contextmanager
+def provider_slot(provider_slug: str, workspace=None):
+    """Hold one upstream-call slot for (slug, workspace); raises ProviderBusyError when full."""
+    bulkhead = get_bulkhead(provider_slug, workspace)
+    if bulkhead is None:
+        yield
+        return
+    with bulkhead.slot():
+        yield
+
+
+@asynccontextmanager
+async def async_provider_slot(provider_slug: str, workspace=None):
+    """Async equivalent of provider_slot() for async callers of provider code."""
+    bulkhead = get_bulkhead(provider_slug, workspace)
+    if bulkhead is None:
+        yield
+        return
+    async with bulkhead.async_slot():
+        yield
+
+
+def bulkhead_gauges() -> dict:
+    """{key: {"in_flight", "queued", "limit", "rejected"}} for every bulkhead created so far."""
+    return {key: bulkhead.gauges() for key, bulkhead in list(_bulkheads.items())}
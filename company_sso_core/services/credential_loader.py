@@ -2,31 +2,107 @@
 Load OAuth provider credentials: DB (primary) then settings fallback.
 Never log or expose client_secret.
 """
+import logging
+
 from django.conf import settings
+from django.db import DatabaseError, router
 
+from company_sso_core.crypto import SecretDecryptionError, decrypt_secret
 from company_sso_core.models import SocialProvider
 from company_sso_core.exceptions import ProviderNotConfiguredError
+from company_sso_core.providers import is_supported_provider
+from company_sso_core.routers import read_database
+from company_sso_core.services import snapshot
+from company_sso_core.services.provider_cache import (
+    is_marked_not_configured,
+    is_pinned_to_primary,
+    mark_not_configured,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def ensure_resolvable(provider_slug: str, workspace=None) -> None:
+    """
+    Cheap pre-check before any DB access: reject slugs outside the registry and
+    built-in configs, and (slug, workspace) pairs recently found unconfigured.
+    """
+    if not is_supported_provider(provider_slug):
+        raise ProviderNotConfiguredError()
+    if is_marked_not_configured(provider_slug, workspace):
+        raise ProviderNotConfiguredError()
+
+
+def provider_queryset(provider_slug: str, workspace=None):
+    """
+    SocialProvider rows for (slug, workspace). Reads use SSO_READ_DATABASE unless the
+    pair was written recently, in which case they go to the primary (read-your-writes).
+    """
+    if is_pinned_to_primary(provider_slug, workspace):
+        alias = router.db_for_write(SocialProvider)
+    else:
+        alias = read_database()
+    qs = SocialProvider.objects.using(alias).filter(slug=provider_slug)
+    if workspace is not None:
+        return qs.filter(workspace_id=workspace)
+    return qs.filter(workspace_id__isnull=True)
+
+
+def load_provider(provider_slug: str, workspace=None, *, active_only: bool = False):
+    """
+    The SocialProvider row for (slug, workspace), or None. With a credential snapshot
+    (SSO_SNAPSHOT_PATH), a current snapshot entry is used first when
+    SSO_SNAPSHOT_PREFERRED is set, and any entry is used if the query fails with a
+    DatabaseError. Snapshot entries are unsaved instances of active rows.
+    """
+    if snapshot.is_preferred():
+        provider = snapshot.lookup(provider_slug, workspace)
+        if provider is not None:
+            return provider
+    qs = provider_queryset(provider_slug, workspace)
+    if active_only:
+        qs = qs.filter(is_active=True)
+    try:
+        return qs.first()
+    except DatabaseError:
+        provider = snapshot.lookup(provider_slug, workspace, check_current=False)
+        if provider is None:
+            raise
+        logger.warning("SocialProvider query failed; using snapshot credentials for %s", provider_slug)
+        return provider
+
+
+_LOOKUP = object()
 
 
-def get_provider_credentials(provider_slug: str, workspace=None) -> dict:
+def get_provider_credentials(provider_slug: str, workspace=None, *, provider=_LOOKUP) -> dict:
     """
     Get credentials for the given provider.
     1. If workspace provided: load workspace-specific SocialProvider (slug, workspace_id, is_active).
     2. Else: load global SocialProvider (slug, workspace_id__isnull=True, is_active).
     3. If not found: fallback to settings.SSO_PROVIDERS[provider_slug].
-    4. If still not found: raise ProviderNotConfiguredError.
+    4. If still not found: raise ProviderNotConfiguredError and cache the miss for
+       SSO_NEGATIVE_CACHE_TTL seconds (cleared when a matching SocialProvider is saved).
+    Unsupported slugs are rejected before any DB access. A caller that already
+    fetched the (slug, workspace) row passes it as provider (None if there is none;
+    an inactive row counts as none) to skip the query.
     Returns dict with client_id, client_secret, and optional extra_config. Never log client_secret.
+    An encrypted DB secret is decrypted through the in-process cache in
+    company_sso_core.crypto; one that no configured key decrypts is treated as
+    not configured.
     """
-    qs = SocialProvider.objects.filter(slug=provider_slug, is_active=True)
-    if workspace is not None:
-        qs = qs.filter(workspace_id=workspace)
-    else:
-        qs = qs.filter(workspace_id__isnull=True)
-    provider = qs.first()
-    if provider:
+    ensure_resolvable(provider_slug, workspace)
+    if provider is _LOOKUP:
+        provider = load_provider(provider_slug, workspace, active_only=True)
+    if provider and provider.is_active:
+        try:
+            client_secret = decrypt_secret(provider.client_secret)
+        except SecretDecryptionError as e:
+            logger.error("SocialProvider %s client_secret: %s", provider.pk, e)
+            raise ProviderNotConfiguredError() from None
         return {
             "client_id": provider.client_id,
-            "client_secret": provider.client_secret,
+            "client_secret": client_secret,
             "extra_config": provider.extra_config or {},
         }
     fallback = getattr(settings, "SSO_PROVIDERS", None) or {}
@@ -37,4 +113,5 @@ def get_provider_credentials(provider_slug: str, workspace=None) -> dict:
             "client_secret": creds.get("client_secret", ""),
             "extra_config": creds.get("extra_config") or {},
         }
+    mark_not_configured(provider_slug, workspace)
     raise ProviderNotConfiguredError()
@@ -0,0 +1,120 @@
+"""
+Login log sampling and exact success counters. Failures are always written to
+SSOLoginLog; successes are written at SSO_LOGIN_LOG_SUCCESS_SAMPLE_RATE, while
+every success increments a per-provider, per-day cache counter that
+flush_login_stats() (manage.py sso_flush_login_stats) adds to SSOLoginStat.
+The counters need a cache shared by every worker and the flushing process
+(SSO_CACHE_ALIAS, e.g. Redis or Memcached); with a process-local cache such as
+LocMemCache each worker counts on its own and a separate flush process sees nothing.
+"""
+import logging
+import random
+from datetime import timedelta
+
+from django.db import IntegrityError, router, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from company_sso_core.models import SSOLoginStat
+from company_sso_core.providers import get_all_provider_slugs
+from company_sso_core.services.provider_cache import get_cache, is_process_local
+from company_sso_core.utils import get_setting
+
+logger = logging.getLogger(__name__)
+
+# Counters outlive a missed flush or two; flush at least daily.
+_COUNTER_TTL = 3 * 24 * 3600
+_FLUSH_DAYS = 2
+_FLUSH_LOCK_KEY = "sso:stat:flush"
+_FLUSH_LOCK_TTL = 300
+
+
+def _sample_rate(provider_slug: str) -> float:
+    rate = get_setting("SSO_LOGIN_LOG_SUCCESS_SAMPLE_RATE", 1.0)
+    if isinstance(rate, dict):
+        rate = rate.get(provider_slug, rate.get("*", 1.0))
+    return float(rate)
+
+
+def should_log_success(provider_slug: str) -> bool:
+    """True if this successful login should get an SSOLoginLog row."""
+    rate = _sample_rate(provider_slug)
+    if rate >= 1:
+        return True
+    if rate <= 0:
+        return False
+    return random.random() < rate
+
+
+def _counter_key(provider_slug: str, day) -> str:
+    return f"sso:stat:ok:{provider_slug}:{day.isoformat()}"
+
+
+def record_success(provider_slug: str) -> None:
+    """Count one successful login (SSO_LOGIN_SUCCESS_COUNTERS, default True)."""
+    if not get_setting("SSO_LOGIN_SUCCESS_COUNTERS", True):
+        return
+    _add_to_counter(get_cache(), _counter_key(provider_slug, timezone.now().date()), 1)
+
+
+def _add_to_counter(cache, key: str, count: int) -> None:
+    cache.add(key, 0, timeout=_COUNTER_TTL)
+    try:
+        cache.incr(key, count)
+    except ValueError:  # evicted between add and incr
+        cache.set(key, count, timeout=_COUNTER_TTL)
+
+
+def _add_to_stat(provider_slug: str, day, count: int) -> None:
+    qs = SSOLoginStat.objects.filter(provider_slug=provider_slug, day=day)
+    if qs.update(success_count=F("success_count") + count):
+        return
+    try:
+        with transaction.atomic(using=router.db_for_write(SSOLoginStat)):
+            SSOLoginStat.objects.create(provider_slug=provider_slug, day=day, success_count=count)
+    except IntegrityError:  # another flush created the row
+        qs.update(success_count=F("success_count") + count)
+
+
+def flush_login_stats() -> int:
+    """
+    Move cached success counters for today and yesterday into SSOLoginStat.
+    Each count is claimed (decremented by the amount read) before the DB write and
+    given back if the write fails, so logins counted meanwhile are kept for the next
+    flush. A cache lock keeps concurrent flushes from claiming the same counts; a
+    flush that finds it held does nothing. Returns the number flushed.
+    """
+    cache = get_cache()
+    if is_process_local(cache):
+        logger.warning(
+            "SSO login counters are in a process-local cache (SSO_CACHE_ALIAS); "
+            "only this process's counts are flushed."
+        )
+    if not cache.add(_FLUSH_LOCK_KEY, 1, timeout=_FLUSH_LOCK_TTL):
+        logger.info("SSO login stats flush already running; skipped")
+        return 0
+    try:
+        today = timezone.now().date()
+        keys = {}
+        for offset in range(_FLUSH_DAYS):
+            day = today - timedelta(days=offset)
+            for slug in get_all_provider_slugs():
+                keys[_counter_key(slug, day)] = (slug, day)
+        flushed = 0
+        for key, count in cache.get_many(list(keys)).items():
+            if not count:
+                continue
+            try:
+                cache.decr(key, count)
+            except ValueError:  # expired since the read; nothing to claim
+                continue
+            slug, day = keys[key]
+            try:
+                _add_to_stat(slug, day, count)
+            except Exception:
+                _add_to_counter(cache, key, count)
+                raise
+            flushed += count
+        return flushed
+    finally:
+        cache.delete(_FLUSH_LOCK_KEY)
@@ -3,26 +3,43 @@ OAuth login orchestration: credentials, exchange code, user resolution, tokens,
 Never log client_secret or tokens.
 """
 import logging
+import time
+from contextlib import ExitStack
 
 from django.conf import settings
 from django.utils.module_loading import import_string
 
-from company_sso_core.models import SocialProvider, SSOLoginLog
+from company_sso_core.models import SSOLoginLog
 from company_sso_core.exceptions import (
     ProviderNotConfiguredError,
     ProviderDisabledError,
     InvalidStateError,
     OAuthProviderError,
+    AuthorizationCodeReusedError,
+    ProviderBusyError,
 )
-from company_sso_core.services.credential_loader import get_provider_credentials
-from company_sso_core.providers import get_provider
-from company_sso_core.utils import get_setting, get_client_ip
+from company_sso_core.services.credential_loader import (
+    ensure_resolvable,
+    get_provider_credentials,
+    load_provider,
+)
+from company_sso_core.services import state as signed_state
+from company_sso_core.services import login_stats
+from company_sso_core.services.bulkhead import provider_slot
+from company_sso_core.services import singleflight
+from company_sso_core.providers import get_provider, http
+from company_sso_core import tracing
+from company_sso_core.signals import send_sso_signal, sso_login_failed, sso_login_success
+from company_sso_core.utils import accepts_keyword, get_setting, get_client_ip
 
 logger = logging.getLogger(__name__)
 
 
 def _get_or_create_user_callable():
-    """Resolve SSO_GET_OR_CREATE_USER from settings (callable or dotted path)."""
+    """
+    Resolve SSO_GET_OR_CREATE_USER from settings (callable or dotted path). It gets
+    workspace= (the authenticating provider row's workspace_id) if it accepts that keyword.
+    """
     fn = get_setting("SSO_GET_OR_CREATE_USER")
     if fn is None:
         raise ProviderNotConfiguredError(detail="SSO_GET_OR_CREATE_USER is not configured")
@@ -51,16 +68,16 @@ def _validate_state_callable():
     return fn
 
 
-def _check_provider_disabled(provider_slug: str, workspace=None) -> None:
-    """If a SocialProvider exists for this slug/workspace and is inactive, raise ProviderDisabledError."""
-    qs = SocialProvider.objects.filter(slug=provider_slug)
-    if workspace is not None:
-        qs = qs.filter(workspace_id=workspace)
-    else:
-        qs = qs.filter(workspace_id__isnull=True)
-    provider = qs.first()
-    if provider and not provider.is_active:
-        raise ProviderDisabledError()
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 3)
+
+
+def _load_provider_row(provider_slug: str, workspace=None):
+    """
+    The SocialProvider row for this slug/workspace (or None), fetched once per login for the
+    disabled check, credentials and the log.
+    """
+    return load_provider(provider_slug, workspace)
 
 
 class OAuthService:
@@ -80,77 +97,212 @@ class OAuthService:
     ) -> tuple:
         """
         Perform OAuth login. Returns (user, tokens_dict).
-        Raises ProviderDisabledError, ProviderNotConfiguredError, InvalidStateError, OAuthProviderError.
+        Concurrent logins with the same code, state and redirect_uri share one upstream
+        exchange (SSO_LOGIN_SINGLE_FLIGHT). SSO_VALIDATE_STATE runs for every caller,
+        since it may depend on the request.
+        Raises ProviderDisabledError, ProviderNotConfiguredError, InvalidStateError,
+        AuthorizationCodeReusedError, ProviderBusyError, OAuthProviderError.
         """
-        _check_provider_disabled(provider_slug, workspace)
-        credentials = get_provider_credentials(provider_slug, workspace)
-        provider_instance = get_provider(provider_slug, credentials)
-
-        validate_state = _validate_state_callable()
-        if validate_state is not None and state is not None:
-            if not validate_state(state, request):
-                raise InvalidStateError()
+        incoming = request.META.get("HTTP_TRACEPARENT") if request is not None else None
+        attributes = {"sso.provider": provider_slug, "sso.workspace": workspace}
+        ctx = {
+            "provider_slug": provider_slug,
+            "workspace": workspace,
+            "request": request,
+            "started": time.perf_counter(),
+            "provider_id": None,
+        }
+        with tracing.span("sso.login", traceparent=incoming, **attributes):
+            try:
+                ensure_resolvable(provider_slug, workspace)
+            except ProviderNotConfiguredError as e:
+                # Rejected before any DB access (unknown slug or cached miss): no log row.
+                self._record_failure("provider", None, str(e.detail), log=False, **ctx)
+                raise
+            validate_state = _validate_state_callable()
+            if validate_state is not None and state is not None:
+                if not validate_state(state, request):
+                    self._record_failure("state", None, InvalidStateError.default_detail, **ctx)
+                    raise InvalidStateError()
+            if not singleflight.is_enabled():
+                return self._login(provider_slug, code, redirect_uri, workspace, state, request)
+            key = singleflight.code_key(provider_slug, workspace, code)
+            try:
+                return singleflight.run_once(
+                    key,
+                    lambda: self._login(
+                        provider_slug, code, redirect_uri, workspace, state, request, code_key=key
+                    ),
+                    binding=(state, redirect_uri),
+                )
+            except AuthorizationCodeReusedError as e:
+                self._record_failure("code", None, str(e.detail), **ctx)
+                raise
 
+    def _login(
+        self,
+        provider_slug: str,
+        code: str,
+        redirect_uri: str,
+        workspace=None,
+        state: str = None,
+        request=None,
+        code_key: str = None,
+    ) -> tuple:
+        """Login flow proper; code_key (if set) is marked consumed once the exchange succeeds."""
+        started = time.perf_counter()
+        ctx = {
+            "provider_slug": provider_slug,
+            "workspace": workspace,
+            "request": request,
+            "started": started,
+            "provider_id": None,
+        }
         try:
-            token_response = provider_instance.exchange_code(code, redirect_uri=redirect_uri)
-        except Exception as e:
-            self._log_attempt(provider_slug, None, "failed", request, workspace=workspace)
-            raise OAuthProviderError(detail=str(e) if getattr(e, "args", None) else "Token exchange failed")
+            provider_row = _load_provider_row(provider_slug, workspace)
+            ctx["provider_id"] = provider_row.pk if provider_row else None
+            if provider_row and not provider_row.is_active:
+                raise ProviderDisabledError()
+            credentials = get_provider_credentials(provider_slug, workspace, provider=provider_row)
+            # Settings-only providers skip save-time validation; unfilled endpoints fail here.
+            provider_instance = get_provider(provider_slug, credentials)
+        except (ProviderDisabledError, ProviderNotConfiguredError) as e:
+            self._record_failure("provider", None, str(e.detail), **ctx)
+            raise
 
-        access_token = token_response.get("access_token")
-        if not access_token:
-            self._log_attempt(provider_slug, None, "failed", request, workspace=workspace)
-            raise OAuthProviderError(detail="No access_token in response")
+        if signed_state.is_enabled():
+            try:
+                signed_state.verify_state(state, provider_slug, redirect_uri, workspace)
+            except InvalidStateError as e:
+                self._record_failure("state", None, str(e.detail), **ctx)
+                raise
 
-        try:
-            user_info = provider_instance.get_user_info(access_token)
-        except Exception as e:
-            self._log_attempt(provider_slug, None, "failed", request, workspace=workspace)
-            raise OAuthProviderError(detail=str(e) if getattr(e, "args", None) else "User info fetch failed")
+        # Upstream calls hold a bulkhead slot; a saturated provider is rejected with ProviderBusyError.
+        with ExitStack() as upstream:
+            try:
+                upstream.enter_context(provider_slot(provider_slug, workspace))
+            except ProviderBusyError as e:
+                self._record_failure("bulkhead", None, str(e.detail), **ctx)
+                raise
+            upstream.enter_context(http.response_limit(provider_slug))
+            try:
+                with tracing.span("sso.exchange_code", **{"sso.provider": provider_slug}):
+                    token_response = provider_instance.exchange_code(code, redirect_uri=redirect_uri)
+            except ProviderNotConfiguredError as e:
+                # Configuration found while building the request (e.g. Apple's signing key): a 400.
+                self._record_failure("provider", None, str(e.detail), **ctx)
+                raise
+            except Exception as e:
+                detail = str(e) if getattr(e, "args", None) else "Token exchange failed"
+                self._record_failure("exchange_code", None, detail, **ctx)
+                if isinstance(e, OAuthProviderError):
+                    raise  # keeps subclass codes, e.g. upstream_response_too_large
+                raise OAuthProviderError(detail=detail)
+
+            access_token = token_response.get("access_token")
+            if not access_token:
+                self._record_failure("exchange_code", None, "No access_token in response", **ctx)
+                raise OAuthProviderError(detail="No access_token in response")
+            if code_key is not None:
+                singleflight.mark_consumed(code_key)
+
+            try:
+                with tracing.span("sso.user_info", **{"sso.provider": provider_slug}):
+                    user_info = provider_instance.get_user_info(access_token)
+            except Exception as e:
+                detail = str(e) if getattr(e, "args", None) else "User info fetch failed"
+                self._record_failure("user_info", None, detail, **ctx)
+                if isinstance(e, OAuthProviderError):
+                    raise
+                raise OAuthProviderError(detail=detail)
 
         get_or_create_user = _get_or_create_user_callable()
+        kwargs = {}
+        if accepts_keyword(get_or_create_user, "workspace"):
+            # Scope identities to the provider row that issued them: a workspace's provider may
+            # point at its own IdP, so its ids must not resolve to another workspace's users.
+            kwargs["workspace"] = provider_row.workspace_id if provider_row else None
         try:
-            user, created = get_or_create_user(provider_slug, user_info, request)
+            with tracing.span("sso.user_resolution", **{"sso.provider": provider_slug}):
+                user, created = get_or_create_user(provider_slug, user_info, request, **kwargs)
         except Exception as e:
-            self._log_attempt(provider_slug, None, "failed", request, workspace=workspace)
+            self._record_failure("user_resolution", None, "User resolution failed", **ctx)
             logger.exception("SSO get_or_create_user failed: %s", e)
             raise OAuthProviderError(detail="User resolution failed")
 
         if user is None:
-            self._log_attempt(provider_slug, None, "failed", request, workspace=None)
+            self._record_failure("user_resolution", None, "User could not be resolved", **ctx)
             raise OAuthProviderError(detail="User could not be resolved")
 
         issue_tokens = _issue_tokens_callable()
         try:
-            tokens = issue_tokens(user, request)
+            with tracing.span("sso.issue_tokens", **{"sso.provider": provider_slug}):
+                tokens = issue_tokens(user, request)
         except Exception as e:
-            self._log_attempt(provider_slug, user, "failed", request, workspace=workspace)
+            self._record_failure("issue_tokens", user, "Token issuance failed", **ctx)
             logger.exception("SSO issue_tokens failed: %s", e)
             raise OAuthProviderError(detail="Token issuance failed")
 
-        self._log_attempt(provider_slug, user, "success", request, workspace=workspace)
+        login_stats.record_success(provider_slug)
+        if login_stats.should_log_success(provider_slug):
+            self._log_attempt(provider_slug, user, "success", request, provider_id=ctx["provider_id"])
+        send_sso_signal(
+            sso_login_success,
+            sender=OAuthService,
+            provider_slug=provider_slug,
+            workspace=workspace,
+            user=user,
+            created=created,
+            request=request,
+            latency_ms=_elapsed_ms(started),
+        )
         return user, tokens
 
+    def _record_failure(
+        self,
+        stage: str,
+        user,
+        detail: str,
+        provider_slug,
+        workspace,
+        request,
+        started,
+        provider_id,
+        log: bool = True,
+    ):
+        """Log a failed attempt (unless log is False) and send sso_login_failed for stage."""
+        if log:
+            self._log_attempt(provider_slug, user, "failed", request, provider_id=provider_id)
+        send_sso_signal(
+            sso_login_failed,
+            sender=OAuthService,
+            provider_slug=provider_slug,
+            workspace=workspace,
+            user=user,
+            stage=stage,
+            error=detail,
+            request=request,
+            latency_ms=_elapsed_ms(started),
+        )
+
     def _log_attempt(
         self,
         provider_slug: str,
         user,
         status: str,
         request,
-        workspace=None,
+        provider_id=None,
     ):
-        """Create SSOLoginLog; never log secrets."""
+        """
+        Create SSOLoginLog; never log secrets. Provider and user are stored by id so the
+        log may live on a separate database (SSO_LOG_DATABASE). provider_id is the
+        active SocialProvider row the login used, if any.
+        """
         ip = get_client_ip(request) if request else None
-        qs = SocialProvider.objects.filter(slug=provider_slug, is_active=True)
-        if workspace is not None:
-            qs = qs.filter(workspace_id=workspace)
-        else:
-            qs = qs.filter(workspace_id__isnull=True)
-        provider_model = qs.first()
         SSOLoginLog.objects.create(
-            provider=provider_model,
+            provider_id=provider_id,
             provider_slug=provider_slug,
-            user=user,
+            user_id=user.pk if user is not None else None,
             status=status,
             ip_address=ip,
         )
@@ -0,0 +1,101 @@
+"""
+Cache helpers for provider resolution. Only non-secret markers are stored here;
+client_secret never goes into the shared cache.
+"""
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+from company_sso_core.utils import get_setting
+
+DEFAULT_NEGATIVE_CACHE_TTL = 30
+DEFAULT_READ_PIN_SECONDS = 10
+
+# Bulk writes (queryset.update) bump this one key instead of every (slug, workspace) pair.
+_ALL = "*"
+
+
+def get_cache():
+    """Return the cache used for SSO markers (SSO_CACHE_ALIAS, default "default")."""
+    return caches[get_setting("SSO_CACHE_ALIAS", "default")]
+
+
+def is_process_local(cache=None) -> bool:
+    """True if cache (default: the SSO cache) is not shared between worker processes."""
+    return isinstance(cache if cache is not None else get_cache(), (LocMemCache, DummyCache))
+
+
+def _key(kind: str, provider_slug: str, workspace=None) -> str:
+    return f"sso:{kind}:{provider_slug}:{'' if workspace is None else workspace}"
+
+
+def is_marked_not_configured(provider_slug: str, workspace=None) -> bool:
+    """True if (slug, workspace) recently resolved to "not configured" and no bulk write happened since."""
+    nc_key, all_key = _key("nc", provider_slug, workspace), _key("gen", _ALL)
+    values = get_cache().get_many([nc_key, all_key])
+    return nc_key in values and values[nc_key] == values.get(all_key, 0)
+
+
+def mark_not_configured(provider_slug: str, workspace=None) -> None:
+    """Remember that (slug, workspace) has no credentials for SSO_NEGATIVE_CACHE_TTL seconds."""
+    ttl = get_setting("SSO_NEGATIVE_CACHE_TTL", DEFAULT_NEGATIVE_CACHE_TTL)
+    if ttl:
+        # Stamped with the bulk generation, so a later bulk write voids every mark at once.
+        get_cache().set(_key("nc", provider_slug, workspace), global_generation(), timeout=ttl)
+
+
+def provider_generation(provider_slug: str, workspace=None) -> int:
+    """Write generation of (slug, workspace); bumped on every SocialProvider write."""
+    return get_cache().get(_key("gen", provider_slug, workspace), 0)
+
+
+def global_generation() -> int:
+    """Generation bumped by bulk SocialProvider writes (see invalidate_all_providers)."""
+    return get_cache().get(_key("gen", _ALL), 0)
+
+
+def generations(pairs) -> dict:
+    """{(slug, workspace): generation} for pairs, plus the bulk generation under None; one cache read."""
+    keys = {_key("gen", slug, workspace): (slug, workspace) for slug, workspace in pairs}
+    all_key = _key("gen", _ALL)
+    values = get_cache().get_many([*keys, all_key])
+    result = {pair: values.get(key, 0) for key, pair in keys.items()}
+    result[None] = values.get(all_key, 0)
+    return result
+
+
+def is_pinned_to_primary(provider_slug: str, workspace=None) -> bool:
+    """True while a recent write to (slug, workspace), or a bulk write, may not have reached the replica yet."""
+    return bool(get_cache().get_many([_key("pin", provider_slug, workspace), _key("pin", _ALL)]))
+
+
+def invalidate_provider(provider_slug: str, workspace=None) -> None:
+    """
+    Call after SocialProvider writes: drop the "not configured" marker, bump the
+    generation, and pin reads of (slug, workspace) to the primary for
+    SSO_READ_PIN_SECONDS so they observe the write (read-your-writes).
+    """
+    cache = get_cache()
+    cache.delete(_key("nc", provider_slug, workspace))
+    _bump_and_pin(cache, provider_slug, workspace)
+
+
+def invalidate_all_providers() -> None:
+    """
+    Call after bulk SocialProvider writes that bypass signals (queryset.update): one
+    generation bump voids every "not configured" marker and pins all reads to the primary.
+    """
+    _bump_and_pin(get_cache(), _ALL, None)
+
+
+def _bump_and_pin(cache, provider_slug: str, workspace) -> None:
+    gen_key = _key("gen", provider_slug, workspace)
+    cache.add(gen_key, 0, timeout=None)
+    try:
+        generation = cache.incr(gen_key)
+    except ValueError:  # evicted between add and incr
+        generation = 1
+        cache.set(gen_key, generation, timeout=None)
+    pin_seconds = get_setting("SSO_READ_PIN_SECONDS", DEFAULT_READ_PIN_SECONDS)
+    if pin_seconds:
+        cache.set(_key("pin", provider_slug, workspace), generation, timeout=pin_seconds)
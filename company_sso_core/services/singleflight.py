@@ -0,0 +1,132 @@
+"""
+Single-flight de-duplication of logins that share an authorization code.
+Concurrent duplicates in a process wait for and share the first result; with
+SSO_LOGIN_SINGLE_FLIGHT_SHARED a cache lock coordinates across processes.
+Codes that already exchanged successfully are rejected without calling the IdP.
+"""
+import hashlib
+import threading
+import time
+
+from company_sso_core.exceptions import AuthorizationCodeReusedError, OAuthProviderError
+from company_sso_core.services.provider_cache import get_cache
+from company_sso_core.utils import get_setting
+
+DEFAULT_WAIT_TIMEOUT = 35
+DEFAULT_CONSUMED_CODE_TTL = 600
+
+_INFLIGHT = "inflight"
+_CONSUMED = "consumed"
+_POLL_INTERVAL = 0.05
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Run fn once per key at a time; callers arriving meanwhile get the same result or exception."""
+
+    def __init__(self):
+        self._calls: dict[str, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn, timeout: float | None = None):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            if not call.done.wait(timeout):
+                raise OAuthProviderError(detail="Timed out waiting for a concurrent login with the same code")
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+_login_flights = SingleFlight()
+
+
+def is_enabled() -> bool:
+    return bool(get_setting("SSO_LOGIN_SINGLE_FLIGHT", True))
+
+
+def code_key(provider_slug: str, workspace, code: str) -> str:
+    """Digest of (provider, workspace, code); the raw code is never used as a cache key."""
+    raw = f"{provider_slug}\0{'' if workspace is None else workspace}\0{code}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _cache_key(key: str) -> str:
+    return f"sso:code:{key}"
+
+
+def mark_consumed(key: str) -> None:
+    """Record that the code was exchanged; later presentations are rejected."""
+    ttl = get_setting("SSO_CONSUMED_CODE_TTL", DEFAULT_CONSUMED_CODE_TTL)
+    get_cache().set(_cache_key(key), _CONSUMED, timeout=ttl)
+
+
+def _acquire_shared(key: str, timeout: float) -> None:
+    """Take the cross-process lock, waiting while another process holds it."""
+    cache = get_cache()
+    deadline = time.monotonic() + timeout
+    while not cache.add(_cache_key(key), _INFLIGHT, timeout=timeout):
+        if cache.get(_cache_key(key)) == _CONSUMED:
+            raise AuthorizationCodeReusedError()
+        if time.monotonic() >= deadline:
+            raise OAuthProviderError(detail="Timed out waiting for a concurrent login with the same code")
+        time.sleep(_POLL_INTERVAL)
+
+
+def _release_shared(key: str) -> None:
+    cache = get_cache()
+    if cache.get(_cache_key(key)) == _INFLIGHT:
+        cache.delete(_cache_key(key))
+
+
+def _flight_key(key: str, binding) -> str:
+    if not binding:
+        return key
+    raw = "\0".join([key, *("" if part is None else str(part) for part in binding)])
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def run_once(key: str, fn, binding=()):
+    """
+    Run fn() as the only login for this code. Raises AuthorizationCodeReusedError
+    if the code is known to be consumed. binding holds the caller's own inputs that
+    fn checks (state, redirect_uri): only callers presenting the same values share
+    a result; the others run fn themselves and fail its checks or find the code consumed.
+    """
+    if get_cache().get(_cache_key(key)) == _CONSUMED:
+        raise AuthorizationCodeReusedError()
+    timeout = get_setting("SSO_LOGIN_SINGLE_FLIGHT_TIMEOUT", DEFAULT_WAIT_TIMEOUT)
+    flight = _flight_key(key, binding)
+    if not get_setting("SSO_LOGIN_SINGLE_FLIGHT_SHARED", False):
+        return _login_flights.do(flight, fn, timeout=timeout)
+
+    def _shared():
+        _acquire_shared(key, timeout)
+        try:
+            return fn()
+        finally:
+            _release_shared(key)
+
+    return _login_flights.do(flight, _shared, timeout=timeout)
@@ -0,0 +1,203 @@
+"""
+Local credential snapshot: active SocialProvider rows written to a file by
+`manage.py sso_snapshot` and memory-mapped by each worker.
+
+Set SSO_SNAPSHOT_PATH to use it. When a SocialProvider query fails with a
+DatabaseError, credentials are served from the snapshot instead. With
+SSO_SNAPSHOT_PREFERRED = True the snapshot is consulted before the database, so a
+worker serves logins without a provider query; an entry is skipped (and the
+database read) once its (slug, workspace) pair, or all providers, have been
+written since the snapshot was taken.
+
+File layout: a b"SSOSNAP1\\n" magic line, the SHA-256 hex digest of the body and a
+newline, then the JSON body. Secrets are stored encrypted when SSO_SECRET_KEYS is
+set (see company_sso_core.crypto); otherwise in plaintext, in a file readable only
+by its owner.
+"""
+import hashlib
+import logging
+import mmap
+import os
+import tempfile
+import threading
+import time
+
+from django.db import router
+from django.utils import timezone
+
+from company_sso_core import codec
+from company_sso_core.crypto import encrypt_secret, is_encrypted
+from company_sso_core.models import SocialProvider
+from company_sso_core.services.provider_cache import generations
+from company_sso_core.utils import get_setting
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"SSOSNAP1\n"
+VERSION = 1
+DEFAULT_RELOAD_INTERVAL = 30
+
+_FIELDS = ("id", "slug", "name", "client_id", "client_secret", "workspace_id", "extra_config")
+
+
+class SnapshotError(ValueError):
+    """The snapshot file is missing, truncated, corrupt or of an unknown version."""
+
+
+def _encode(body: dict) -> bytes:
+    payload = codec.dumps(body)
+    return MAGIC + hashlib.sha256(payload).hexdigest().encode("ascii") + b"\n" + payload
+
+
+def write_snapshot(path: str | None = None) -> int:
+    """
+    Write every active SocialProvider (read from the primary) to path (default
+    SSO_SNAPSHOT_PATH), atomically. Returns the number of providers written.
+    """
+    path = path or get_setting("SSO_SNAPSHOT_PATH")
+    if not path:
+        raise SnapshotError("No snapshot path: set SSO_SNAPSHOT_PATH.")
+    alias = router.db_for_write(SocialProvider)
+    active = SocialProvider.objects.using(alias).filter(is_active=True)
+    # Generations are read before the rows: a write racing with the snapshot then
+    # leaves its entry stale (skipped in preferred mode), never current with old data.
+    gens = generations(active.values_list("slug", "workspace_id"))
+    rows = []
+    for row in active.order_by("pk").values(*_FIELDS):
+        pair = (row["slug"], row["workspace_id"])
+        if pair not in gens:  # created after the generations were read
+            continue
+        row["client_secret"] = encrypt_secret(row["client_secret"])
+        row["generation"] = gens[pair]
+        rows.append(row)
+    body = {
+        "version": VERSION,
+        "created_at": timezone.now().isoformat(),
+        "global_generation": gens[None],
+        "providers": rows,
+    }
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".sso-snapshot-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_encode(body))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return len(rows)
+
+
+class Snapshot:
+    """Parsed snapshot: entries keyed by (slug, workspace_id)."""
+
+    def __init__(self, body: dict, stamp=None):
+        self.created_at = body.get("created_at")
+        self.global_generation = body.get("global_generation", 0)
+        self.entries = {(row["slug"], row["workspace_id"]): row for row in body["providers"]}
+        self.stamp = stamp
+
+    @property
+    def has_plaintext_secrets(self) -> bool:
+        return any(row["client_secret"] and not is_encrypted(row["client_secret"]) for row in self.entries.values())
+
+    def get(self, provider_slug: str, workspace=None) -> dict | None:
+        return self.entries.get((provider_slug, workspace))
+
+
+def read_snapshot(path: str) -> Snapshot:
+    """Map path, check magic, version and digest, and parse it. Raises SnapshotError."""
+    try:
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            if stat.st_size == 0:
+                raise SnapshotError(f"{path} is empty")
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                header_end = len(MAGIC) + 65
+                if mapped[: len(MAGIC)] != MAGIC or mapped[header_end - 1 : header_end] != b"\n":
+                    raise SnapshotError(f"{path} is not an SSO snapshot")
+                digest = mapped[len(MAGIC) : header_end - 1].decode("ascii")
+                payload = mapped[header_end:]
+    except OSError as e:
+        raise SnapshotError(f"Cannot read {path}: {e}") from None
+    if hashlib.sha256(payload).hexdigest() != digest:
+        raise SnapshotError(f"{path} failed its integrity check")
+    try:
+        body = codec.loads(payload)
+    except ValueError:
+        raise SnapshotError(f"{path} is not valid JSON") from None
+    if body.get("version") != VERSION:
+        raise SnapshotError(f"{path} has unsupported version {body.get('version')!r}")
+    return Snapshot(body, stamp=(stat.st_mtime_ns, stat.st_size))
+
+
+_snapshot: Snapshot | None = None
+_snapshot_path = None
+_checked_at = float("-inf")
+_lock = threading.Lock()
+
+
+def get_snapshot() -> Snapshot | None:
+    """
+    The snapshot at SSO_SNAPSHOT_PATH, or None if unset or unreadable. The file is
+    re-checked at most every SSO_SNAPSHOT_RELOAD_INTERVAL seconds and reloaded when it changes.
+    """
+    global _snapshot, _snapshot_path, _checked_at
+    path = get_setting("SSO_SNAPSHOT_PATH")
+    if not path:
+        return None
+    now = time.monotonic()
+    interval = get_setting("SSO_SNAPSHOT_RELOAD_INTERVAL", DEFAULT_RELOAD_INTERVAL)
+    if path == _snapshot_path and now - _checked_at < interval:
+        return _snapshot
+    with _lock:
+        if path == _snapshot_path and now - _checked_at < interval:
+            return _snapshot
+        try:
+            stat = os.stat(path)
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            if path != _snapshot_path or _snapshot is None or _snapshot.stamp != stamp:
+                _snapshot = read_snapshot(path)
+        except (OSError, SnapshotError) as e:
+            logger.warning("SSO snapshot unavailable: %s", e)
+            _snapshot = None
+        _snapshot_path, _checked_at = path, now
+    return _snapshot
+
+
+def load_snapshot() -> Snapshot | None:
+    """Load SSO_SNAPSHOT_PATH now (called at worker boot) instead of on first use."""
+    global _checked_at
+    _checked_at = float("-inf")
+    snapshot = get_snapshot()
+    if snapshot is not None and snapshot.has_plaintext_secrets:
+        logger.warning("SSO snapshot holds plaintext client secrets; set SSO_SECRET_KEYS and rewrite it.")
+    return snapshot
+
+
+def is_preferred() -> bool:
+    return bool(get_setting("SSO_SNAPSHOT_PREFERRED", False)) and bool(get_setting("SSO_SNAPSHOT_PATH"))
+
+
+def _to_provider(row: dict) -> SocialProvider:
+    fields = {name: row[name] for name in _FIELDS}
+    return SocialProvider(is_active=True, **fields)
+
+
+def lookup(provider_slug: str, workspace=None, *, check_current: bool = True) -> SocialProvider | None:
+    """
+    An unsaved SocialProvider built from the snapshot entry for (slug, workspace),
+    or None. With check_current, entries whose pair (or all providers) has been
+    written since the snapshot was taken are ignored (one cache read).
+    """
+    snapshot = get_snapshot()
+    row = snapshot.get(provider_slug, workspace) if snapshot is not None else None
+    if row is None:
+        return None
+    if check_current:
+        current = generations([(provider_slug, workspace)])
+        if current[(provider_slug, workspace)] != row["generation"] or current[None] != snapshot.global_generation:
+            return None
+    return _to_provider(row)
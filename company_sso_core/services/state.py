@@ -0,0 +1,152 @@
+"""
+Built-in stateless OAuth state: HMAC-signed, time-limited tokens bound to provider,
+workspace and redirect_uri. No server-side storage per authorize redirect; replays
+are caught by remembering nonces seen within the TTL window, in the SSO cache by
+default (which must be shared between workers) or, with
+SSO_STATE_REPLAY_BACKEND = "memory", in a bounded per-process cache that only
+catches replays on the same process. Enable with SSO_STATE_SIGNED = True.
+"""
+import hashlib
+import logging
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+from django.core import signing
+
+from company_sso_core.exceptions import InvalidStateError
+from company_sso_core.services.provider_cache import get_cache, is_process_local
+from company_sso_core.utils import get_setting
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATE_TTL = 600
+# The in-memory replay cache holds this many nonces per second of SSO_STATE_TTL by default.
+DEFAULT_PEAK_LOGINS_PER_SECOND = 50
+
+_SALT = "company_sso_core.state"
+
+
+class NonceReplayCache:
+    """
+    In-process set of used nonces, each kept for one TTL window.
+    Tokens older than the TTL fail signature age checks anyway, so only nonces
+    used within the window need remembering; max_entries should cover peak
+    logins per TTL window. When full, new nonces are rejected until entries
+    expire: evicting a nonce still inside its window would let its state be replayed.
+    """
+
+    def __init__(self, ttl: int, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, nonce: str) -> bool:
+        """Record nonce; False if it was already used within the window, or the cache is full."""
+        now = time.monotonic()
+        with self._lock:
+            entries = self._entries
+            # Insertion order is expiry order, so expired nonces are always at the front.
+            while entries:
+                oldest, expires_at = next(iter(entries.items()))
+                if expires_at > now:
+                    break
+                del entries[oldest]
+            if nonce in entries:
+                return False
+            if len(entries) >= self.max_entries:
+                logger.warning(
+                    "SSO state replay cache is full (%d nonces); rejecting state until "
+                    "entries expire. Raise SSO_STATE_REPLAY_CACHE_SIZE or use "
+                    'SSO_STATE_REPLAY_BACKEND = "cache".',
+                    self.max_entries,
+                )
+                return False
+            entries[nonce] = now + self.ttl
+            return True
+
+
+_replay_cache: NonceReplayCache | None = None
+_replay_cache_lock = threading.Lock()
+
+
+def _replay_cache_size(ttl: int) -> int:
+    """SSO_STATE_REPLAY_CACHE_SIZE, or enough nonces for DEFAULT_PEAK_LOGINS_PER_SECOND over ttl."""
+    return get_setting("SSO_STATE_REPLAY_CACHE_SIZE") or ttl * DEFAULT_PEAK_LOGINS_PER_SECOND
+
+
+def _get_replay_cache(ttl: int) -> NonceReplayCache:
+    global _replay_cache
+    size = _replay_cache_size(ttl)
+    cache = _replay_cache
+    if cache is None or cache.ttl != ttl or cache.max_entries != size:
+        with _replay_cache_lock:
+            cache = _replay_cache
+            if cache is None or cache.ttl != ttl or cache.max_entries != size:
+                cache = _replay_cache = NonceReplayCache(ttl, size)
+    return cache
+
+
+_warned_local_cache = False
+
+
+def _mark_nonce_used(nonce: str, ttl: int) -> bool:
+    """
+    True if nonce is fresh. The default SSO_STATE_REPLAY_BACKEND = "cache" shares the
+    check across processes; "memory" only sees nonces used on this process.
+    """
+    global _warned_local_cache
+    if get_setting("SSO_STATE_REPLAY_BACKEND", "cache") == "memory":
+        return _get_replay_cache(ttl).add(nonce)
+    cache = get_cache()
+    if not _warned_local_cache and is_process_local(cache):
+        _warned_local_cache = True
+        logger.warning(
+            "SSO state nonces are kept in a process-local cache (SSO_CACHE_ALIAS); "
+            "replays on other workers are not detected. Configure a shared cache."
+        )
+    return cache.add(f"sso:nonce:{nonce}", 1, timeout=ttl)
+
+
+def _redirect_digest(redirect_uri: str) -> str:
+    return hashlib.sha256((redirect_uri or "").encode()).hexdigest()[:16]
+
+
+def is_enabled() -> bool:
+    """True if the built-in signed state is enabled (SSO_STATE_SIGNED)."""
+    return bool(get_setting("SSO_STATE_SIGNED", False))
+
+
+def issue_state(provider_slug: str, redirect_uri: str, workspace=None) -> str:
+    """
+    Return a signed state token for an authorize redirect.
+    The same provider, workspace and redirect_uri must be presented at login.
+    """
+    payload = [provider_slug, workspace, _redirect_digest(redirect_uri), secrets.token_urlsafe(12)]
+    return signing.dumps(payload, salt=_SALT, compress=False)
+
+
+def verify_state(state: str | None, provider_slug: str, redirect_uri: str, workspace=None) -> None:
+    """
+    Validate a state token from issue_state(). Raises InvalidStateError if it is
+    missing, tampered, expired, bound to other parameters, or already used.
+    """
+    if not state:
+        raise InvalidStateError()
+    ttl = get_setting("SSO_STATE_TTL", DEFAULT_STATE_TTL)
+    try:
+        payload = signing.loads(state, salt=_SALT, max_age=ttl)
+    except signing.BadSignature:
+        raise InvalidStateError()
+    if not isinstance(payload, list) or len(payload) != 4:
+        raise InvalidStateError()
+    slug, ws, redirect_digest, nonce = payload
+    if slug != provider_slug or ws != workspace or redirect_digest != _redirect_digest(redirect_uri):
+        raise InvalidStateError()
+    if not _mark_nonce_used(nonce, ttl):
+        raise InvalidStateError()
@@ -0,0 +1,156 @@
+"""
+Warm-up for the first logins after a deploy: build the active providers (importing
+their modules), resolve IdP hosts and open pooled connections to the most-used
+token/userinfo endpoints, all within a time budget. Everything warmed lives in this
+process, so only a warm-up run by the serving process (SSO_WARMUP_ON_STARTUP, or a
+per-worker hook under a pre-fork server) speeds up its logins; sso_warm checks the
+same steps in a process of its own.
+"""
+import logging
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import timedelta
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import Count
+from django.utils import timezone
+
+from company_sso_core.models import SocialProvider, SSOLoginLog
+from company_sso_core.providers import get_provider, is_supported_provider
+from company_sso_core.providers import http
+from company_sso_core.routers import read_database
+from company_sso_core.services.credential_loader import get_provider_credentials
+from company_sso_core.utils import get_setting
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUDGET = 5.0
+DEFAULT_CONNECTIONS = 10
+DEFAULT_USAGE_DAYS = 7
+_WORKERS = 8
+
+
+def _usage_counts() -> dict:
+    """Logins per provider slug over the last SSO_WARMUP_USAGE_DAYS; empty if the log is unavailable."""
+    since = timezone.now() - timedelta(days=get_setting("SSO_WARMUP_USAGE_DAYS", DEFAULT_USAGE_DAYS))
+    try:
+        rows = (
+            SSOLoginLog.objects.filter(created_at__gte=since)
+            .order_by()
+            .values("provider_slug")
+            .annotate(n=Count("pk"))
+        )
+        return {row["provider_slug"]: row["n"] for row in rows}
+    except Exception as e:
+        logger.warning("SSO warm-up could not read login usage: %s", type(e).__name__)
+        return {}
+
+
+def _targets() -> list:
+    """(slug, workspace) pairs to warm: active SocialProvider rows and SSO_PROVIDERS, most-used first."""
+    pairs = list(
+        SocialProvider.objects.using(read_database())
+        .filter(is_active=True)
+        .values_list("slug", "workspace_id")
+    )
+    for slug in getattr(settings, "SSO_PROVIDERS", None) or {}:
+        if (slug, None) not in pairs:
+            pairs.append((slug, None))
+    usage = _usage_counts()
+    pairs = [pair for pair in pairs if is_supported_provider(pair[0])]
+    return sorted(pairs, key=lambda pair: -usage.get(pair[0], 0))
+
+
+def _resolve(host: str) -> None:
+    socket.getaddrinfo(host, 443, proto=socket.IPPROTO_TCP)
+
+
+def _run_until(fn, items: list, deadline: float, errors: list) -> tuple:
+    """Run fn over items concurrently until the deadline; return (succeeded, timed_out)."""
+    if not items:
+        return 0, False
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        return 0, True
+    pool = ThreadPoolExecutor(max_workers=min(_WORKERS, len(items)), thread_name_prefix="sso-warmup")
+    futures = {pool.submit(fn, item): item for item in items}
+    done, pending = wait(futures, timeout=remaining)
+    pool.shutdown(wait=False, cancel_futures=True)
+    succeeded = 0
+    for future in done:
+        try:
+            future.result()
+            succeeded += 1
+        except Exception as e:
+            errors.append(f"{futures[future]}: {type(e).__name__}")
+    return succeeded, bool(pending)
+
+
+def warm_up(budget: float = None) -> dict:
+    """
+    Warm SSO caches and connections within budget seconds (SSO_WARMUP_BUDGET, default 5).
+    Failures are recorded and skipped; nothing here raises. Returns a report dict:
+    providers, hosts, connections, errors, timed_out, elapsed_ms.
+    """
+    if budget is None:
+        budget = get_setting("SSO_WARMUP_BUDGET", DEFAULT_BUDGET)
+    started = time.monotonic()
+    deadline = started + budget
+    report = {"providers": [], "hosts": 0, "connections": 0, "errors": [], "timed_out": False}
+
+    try:
+        targets = _targets()
+    except Exception as e:
+        report["errors"].append(f"providers: {type(e).__name__}")
+        targets = []
+
+    urls = []
+    for slug, workspace in targets:
+        if time.monotonic() >= deadline:
+            report["timed_out"] = True
+            break
+        try:
+            provider = get_provider(slug, get_provider_credentials(slug, workspace))
+        except Exception as e:
+            report["errors"].append(f"{slug}: {type(e).__name__}")
+            continue
+        report["providers"].append(slug if workspace is None else f"{slug}@{workspace}")
+        for url in (provider.token_url, provider.user_info_url):
+            # Endpoints still holding a template placeholder have no host yet.
+            if urlsplit(url).scheme in ("http", "https") and "{" not in url and url not in urls:
+                urls.append(url)
+
+    hosts = list(dict.fromkeys(urlsplit(url).hostname for url in urls))
+    report["hosts"], timed_out = _run_until(_resolve, hosts, deadline, report["errors"])
+    report["timed_out"] |= timed_out
+
+    connect_timeout = max(budget / 2, 0.1)
+    limit = get_setting("SSO_WARMUP_CONNECTIONS", DEFAULT_CONNECTIONS)
+    report["connections"], timed_out = _run_until(
+        lambda url: http.open_connection(url, timeout=connect_timeout), urls[:limit], deadline, report["errors"]
+    )
+    report["timed_out"] |= timed_out
+
+    report["elapsed_ms"] = round((time.monotonic() - started) * 1000, 3)
+    logger.info(
+        "SSO warm-up: %d providers, %d hosts, %d connections in %.0f ms%s",
+        len(report["providers"]),
+        report["hosts"],
+        report["connections"],
+        report["elapsed_ms"],
+        " (budget exhausted)" if report["timed_out"] else "",
+    )
+    return report
+
+
+def warm_up_in_background() -> None:
+    """Entry point for the startup thread (SSO_WARMUP_ON_STARTUP)."""
+    try:
+        warm_up()
+    except Exception:
+        logger.exception("SSO warm-up failed")
+    finally:
+        close_old_connections()
@@ -1,8 +1,118 @@
 """Django signals for SSO events."""
-from django.dispatch import Signal
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import close_old_connections
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import Signal, receiver
+
+from company_sso_core.models import SocialAccount, SocialProvider
+from company_sso_core.services.accounts import forget_account
+from company_sso_core.services.provider_cache import invalidate_provider
+from company_sso_core.utils import get_setting
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ASYNC_WORKERS = 4
+DEFAULT_ASYNC_QUEUE = 1000
 
 # Sent after a successful SSO login (user and log created).
+# kwargs: provider_slug, workspace, user, created, request, latency_ms.
 sso_login_success = Signal()
 
-# Sent after a failed SSO login attempt (log created).
+# Sent after a failed SSO login attempt (log created, except for "provider" failures
+# rejected before any DB access: unknown slugs and cached misses).
+# kwargs: provider_slug, workspace, user (or None), stage, error, request, latency_ms.
+# stage is one of "provider" (not configured or disabled), "state", "code" (reused
+# authorization code), "bulkhead" (provider busy), "exchange_code", "user_info",
+# "user_resolution", "issue_tokens".
 sso_login_failed = Signal()
+
+
+def _deliver(signal: Signal, sender, kwargs: dict) -> None:
+    """Call receivers; a failing receiver is logged and never breaks the login."""
+    for receiver_fn, result in signal.send_robust(sender, **kwargs):
+        if isinstance(result, Exception):
+            logger.error("SSO signal receiver %r failed", receiver_fn, exc_info=result)
+
+
+class _AsyncDispatcher:
+    """Bounded worker pool for receivers; events beyond the queue bound are dropped, not waited on."""
+
+    def __init__(self, workers: int, queue_size: int):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sso-signals")
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+
+    def submit(self, signal: Signal, sender, kwargs: dict) -> bool:
+        if not self._slots.acquire(blocking=False):
+            logger.warning("SSO signal queue full; dropping %s event", kwargs.get("provider_slug"))
+            return False
+        try:
+            self._executor.submit(self._run, signal, sender, kwargs)
+        except RuntimeError:
+            self._slots.release()
+            raise
+        return True
+
+    def _run(self, signal: Signal, sender, kwargs: dict) -> None:
+        try:
+            _deliver(signal, sender, kwargs)
+        finally:
+            close_old_connections()
+            self._slots.release()
+
+
+_dispatcher: _AsyncDispatcher | None = None
+_dispatcher_lock = threading.Lock()
+
+
+def _get_dispatcher() -> _AsyncDispatcher:
+    global _dispatcher
+    if _dispatcher is None:
+        with _dispatcher_lock:
+            if _dispatcher is None:
+                _dispatcher = _AsyncDispatcher(
+                    get_setting("SSO_SIGNALS_ASYNC_WORKERS", DEFAULT_ASYNC_WORKERS),
+                    get_setting("SSO_SIGNALS_ASYNC_QUEUE", DEFAULT_ASYNC_QUEUE),
+                )
+    return _dispatcher
+
+
+def send_sso_signal(signal: Signal, sender, **kwargs) -> None:
+    """
+    Send an SSO signal. With SSO_SIGNALS_ASYNC, receivers run on a bounded background
+    pool so slow receivers (webhooks, SIEM forwarders) add no latency to the login.
+    """
+    if not signal.has_listeners(sender):
+        return
+    if get_setting("SSO_SIGNALS_ASYNC", False):
+        _get_dispatcher().submit(signal, sender, kwargs)
+    else:
+        _deliver(signal, sender, kwargs)
+
+
+@receiver(pre_save, sender=SocialProvider, dispatch_uid="sso_validate_provider")
+def _validate_provider(sender, instance, **kwargs):
+    """
+    full_clean() only runs from forms such as the admin; rows saved by
+    objects.create(), scripts or loaddata are checked here, so unfilled endpoint
+    placeholders fail at save time rather than at login.
+    """
+    instance.clean()
+
+
+@receiver(post_save, sender=SocialProvider, dispatch_uid="sso_invalidate_provider_cache")
+@receiver(post_delete, sender=SocialProvider, dispatch_uid="sso_invalidate_provider_cache_delete")
+def _invalidate_provider_cache(sender, instance, **kwargs):
+    """
+    A written SocialProvider may configure a (slug, workspace) cached as missing, and
+    replicas may lag behind the change; invalidate and pin reads to the primary.
+    """
+    invalidate_provider(instance.slug, instance.workspace_id)
+
+
+@receiver(post_delete, sender=SocialAccount, dispatch_uid="sso_forget_account")
+def _forget_account(sender, instance, **kwargs):
+    """An unlinked identity must not keep resolving to its old user from the cache."""
+    forget_account(instance.provider_slug, instance.external_id, instance.workspace_id)
@@ -0,0 +1,67 @@
+"""
+Test helpers for hosts and this package: assert the exact number of DB queries a
+block issues, and flag queries that run more than once with the same SQL and params.
+
+    from company_sso_core.testing import query_budget
+
+    with query_budget(2):
+        get_provider_credentials("google")
+"""
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A block issued a different number of queries than budgeted, or repeated a query."""
+
+
+def _format(queries: list) -> str:
+    return "\n".join(f"  {i}. [{alias}] {sql}" for i, (alias, sql) in enumerate(queries, 1))
+
+
+class _Captured:
+    """Queries captured across database aliases, in execution order per alias."""
+
+    def __init__(self, contexts: dict):
+        self._contexts = contexts
+
+    @property
+    def queries(self) -> list:
+        return [
+            (alias, query["sql"]) for alias, ctx in self._contexts.items() for query in ctx.captured_queries
+        ]
+
+    def __len__(self):
+        return len(self.queries)
+
+
+@contextmanager
+def query_budget(expected: int, using=DEFAULT_DB_ALIAS, allow_duplicates: bool = False):
+    """
+    Fail unless the block runs exactly `expected` queries on `using` (an alias or
+    list of aliases the test may access; default "default"). Unless allow_duplicates,
+    also fail when identical SQL (with identical params) runs twice. The failure
+    message lists the captured SQL, numbered, with the duplicates called out.
+    """
+    aliases = [using] if isinstance(using, str) else list(using)
+    with ExitStack() as stack:
+        contexts = {alias: stack.enter_context(CaptureQueriesContext(connections[alias])) for alias in aliases}
+        captured = _Captured(contexts)
+        yield captured
+    queries = captured.queries
+    duplicates = [] if allow_duplicates else [q for q, n in Counter(queries).items() if n > 1]
+    if len(queries) == expected and not duplicates:
+        return
+    lines = []
+    if len(queries) != expected:
+        lines.append(f"Expected {expected} queries, got {len(queries)}:")
+    else:
+        lines.append(f"{len(queries)} queries as expected, but some repeat:")
+    lines.append(_format(queries) or "  (none)")
+    if duplicates:
+        lines.append("Repeated:")
+        lines.append(_format(duplicates))
+    raise QueryBudgetExceeded("\n".join(lines))
@@ -0,0 +1,170 @@
+"""
+Optional tracing for the login pipeline and provider HTTP calls.
+
+Set SSO_TRACE_EXPORTER to an exporter (instance or dotted path) with export(span):
+"company_sso_core.tracing.InMemoryExporter" for tests, or an adapter to your
+tracing backend. Unset (the default), span() returns a shared no-op and nothing
+is recorded. Spans propagate W3C trace context: an incoming `traceparent` header
+is continued, and outgoing provider requests carry one.
+"""
+import contextvars
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from django.utils.module_loading import import_string
+
+from company_sso_core.utils import get_setting
+
+TRACEPARENT_HEADER = "traceparent"
+
+_current: contextvars.ContextVar = contextvars.ContextVar("sso_current_span", default=None)
+
+
+class Span:
+    """A timed operation with attributes; ids follow W3C trace context."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "attributes", "status", "start", "end")
+
+    def __init__(self, name: str, trace_id: str, parent_id: str | None, attributes: dict):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.status = "ok"
+        self.start = time.perf_counter()
+        self.end = None
+
+    def set_attribute(self, key: str, value) -> None:
+        self.attributes[key] = value
+
+    def record_error(self, error: BaseException) -> None:
+        self.status = "error"
+        self.attributes["error.type"] = type(error).__name__
+
+    @property
+    def duration_ms(self) -> float | None:
+        return None if self.end is None else (self.end - self.start) * 1000
+
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+
+class NoopExporter:
+    """Discards spans."""
+
+    def export(self, span: Span) -> None:
+        pass
+
+
+class InMemoryExporter:
+    """Keeps finished spans in memory; for tests."""
+
+    def __init__(self):
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.spans.clear()
+
+    def by_name(self, name: str) -> list[Span]:
+        return [span for span in self.spans if span.name == name]
+
+
+_exporter = None
+_exporter_source = None
+
+
+def get_exporter():
+    """The configured exporter, or None when tracing is off. Re-resolved if the setting changes."""
+    global _exporter, _exporter_source
+    source = get_setting("SSO_TRACE_EXPORTER")
+    if source is not _exporter_source:
+        exporter = import_string(source)() if isinstance(source, str) else source
+        if isinstance(exporter, NoopExporter):
+            exporter = None
+        _exporter, _exporter_source = exporter, source
+    return _exporter
+
+
+class _NoopSpan:
+    """Shared stand-in when tracing is off; every method does nothing."""
+
+    __slots__ = ()
+
+    def set_attribute(self, key, value):
+        pass
+
+    def record_error(self, error):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def parse_traceparent(value: str | None) -> tuple | None:
+    """(trace_id, parent_span_id) from a W3C traceparent header, or None if absent/invalid."""
+    if not value:
+        return None
+    parts = value.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        int(parts[1], 16), int(parts[2], 16)
+    except ValueError:
+        return None
+    if parts[1] == "0" * 32 or parts[2] == "0" * 16:
+        return None
+    return parts[1], parts[2]
+
+
+@contextmanager
+def _span(exporter, name: str, attributes: dict, remote_parent: tuple | None):
+    parent = _current.get()
+    if parent is not None:
+        trace_id, parent_id = parent.trace_id, parent.span_id
+    elif remote_parent is not None:
+        trace_id, parent_id = remote_parent
+    else:
+        trace_id, parent_id = os.urandom(16).hex(), None
+    span = Span(name, trace_id, parent_id, attributes)
+    token = _current.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.record_error(e)
+        raise
+    finally:
+        span.end = time.perf_counter()
+        _current.reset(token)
+        exporter.export(span)
+
+
+def span(name: str, traceparent: str | None = None, **attributes):
+    """
+    Context manager for a span named name, child of the current span (or of the
+    remote parent in traceparent for a root span). A no-op when tracing is off.
+    """
+    exporter = get_exporter()
+    if exporter is None:
+        return _NOOP_SPAN
+    return _span(exporter, name, attributes, parse_traceparent(traceparent))
+
+
+def current_traceparent() -> str | None:
+    """traceparent header value for the current span, or None outside a span."""
+    current = _current.get()
+    return current.traceparent() if current is not None else None
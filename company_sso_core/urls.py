@@ -1,10 +1,14 @@
 """URL configuration for SSO API. Host project includes under e.g. api/v1/sso/."""
 from django.urls import path
 
-from company_sso_core.views import SSOLoginView
+from company_sso_core.utils import get_setting
+from company_sso_core.views import SSOFastLoginView, SSOLoginLogExportView, SSOLoginView
 
 app_name = "sso_api"
 
+login_view = SSOFastLoginView if get_setting("SSO_FAST_LOGIN_VIEW", False) else SSOLoginView
+
 urlpatterns = [
-    path("login/<str:provider>/", SSOLoginView.as_view(), name="login"),
+    path("login/<str:provider>/", login_view.as_view(), name="login"),
+    path("logs/export/", SSOLoginLogExportView.as_view(), name="log-export"),
 ]
@@ -1,5 +1,7 @@
 """Shared utilities; no business logic. Settings and request helpers."""
+import inspect
 import logging
+from functools import lru_cache
 from urllib.parse import urlencode
 
 from django.conf import settings
@@ -19,11 +21,13 @@ def get_authorization_url(
     users to the provider's sign-in page.
 
     Uses the same credential resolution as login (DB then SSO_PROVIDERS).
-    Resolves placeholders in URLs (e.g. {domain} for Okta) from extra_config.
+    Resolves placeholders in URLs (e.g. {domain} for Okta) from extra_config; an
+    unfilled placeholder raises ProviderNotConfiguredError.
 
     :param provider_slug: e.g. "google", "microsoft", "linkedin"
     :param redirect_uri: Must match the callback URL registered with the provider
-    :param state: Optional CSRF state (recommended)
+    :param state: Optional CSRF state (recommended). With SSO_STATE_SIGNED, a signed
+        state bound to provider, workspace and redirect_uri is generated when omitted.
     :param scope: Optional scope string; default "openid email profile"
     :param workspace: Optional workspace_id for workspace-scoped credentials
     :returns: Full URL to redirect the user to
@@ -31,28 +35,39 @@ def get_authorization_url(
     """
     from company_sso_core.services.credential_loader import get_provider_credentials
     from company_sso_core.providers import get_provider
+    from company_sso_core.services import state as signed_state
 
     creds = get_provider_credentials(provider_slug, workspace)
     provider = get_provider(provider_slug, creds)
     base_url = (provider.authorization_url or "").strip()
     if not base_url:
         raise ValueError(f"Provider {provider_slug} has no authorization_url")
-    extra = creds.get("extra_config") or {}
-    for key, value in extra.items():
-        if value and "{" + key + "}" in base_url:
-            base_url = base_url.replace("{" + key + "}", str(value).strip("/"))
+    base_url = _render_authorization_url(provider_slug, base_url, creds.get("extra_config"))
     params = {
         "client_id": creds["client_id"],
         "redirect_uri": redirect_uri,
         "response_type": "code",
         "scope": scope or "openid email profile",
     }
+    if state is None and signed_state.is_enabled():
+        state = signed_state.issue_state(provider_slug, redirect_uri, workspace)
     if state:
         params["state"] = state
     sep = "&" if "?" in base_url else "?"
     return base_url + sep + urlencode(params)
 
 
+def _render_authorization_url(provider_slug: str, url: str, extra_config: dict | None) -> str:
+    """Fill tenant placeholders (already done for generic providers; needed for custom classes)."""
+    from company_sso_core.exceptions import ProviderNotConfiguredError
+    from company_sso_core.providers.templates import compile_template, endpoint_errors, tenant_values
+
+    errors = endpoint_errors({"authorization_url": url}, extra_config)
+    if errors:
+        raise ProviderNotConfiguredError(detail=f"{provider_slug}: {'; '.join(errors)}")
+    return compile_template(url).render(tenant_values(extra_config))
+
+
 def get_setting(name: str, default=None):
     """
     Read optional SSO setting from Django settings.
@@ -60,6 +75,20 @@ def get_setting(name: str, default=None):
     return getattr(settings, name, default)
 
 
+@lru_cache(maxsize=64)
+def accepts_keyword(fn, name: str) -> bool:
+    """Whether host callable fn takes keyword argument name (by name or through **kwargs)."""
+    try:
+        parameters = inspect.signature(fn).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    return any(
+        p.kind is inspect.Parameter.VAR_KEYWORD
+        or (p.name == name and p.kind is not inspect.Parameter.POSITIONAL_ONLY)
+        for p in parameters
+    )
+
+
 def get_client_ip(request) -> str | None:
     """Get client IP from request; safe for logging (no secrets)."""
     if request is None:
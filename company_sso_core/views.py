@@ -3,88 +3,219 @@ Thin API views: validate serializer, call service, return response, map exceptio
 """
 import logging
 
+from django.http import HttpResponse, StreamingHttpResponse
 from rest_framework import status
+from rest_framework.negotiation import BaseContentNegotiation
+from rest_framework.permissions import IsAdminUser
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.request import Request
 from drf_spectacular.utils import extend_schema, OpenApiResponse
+from drf_spectacular.types import OpenApiTypes
 
-from company_sso_core.serializers import SSOLoginSerializer
+from company_sso_core import codec
+from company_sso_core.renderers import SSOJSONRenderer
+from company_sso_core.serializers import SSOLogExportSerializer, SSOLoginSerializer, fast_validate_login
+from company_sso_core.services import log_export
 from company_sso_core.services.oauth_service import OAuthService
 from company_sso_core.exceptions import (
     ProviderNotConfiguredError,
     ProviderDisabledError,
     InvalidStateError,
     OAuthProviderError,
+    AuthorizationCodeReusedError,
+    ProviderBusyError,
 )
 
 logger = logging.getLogger(__name__)
 
 
-@extend_schema(
-    request=SSOLoginSerializer,
-    responses={
+_LOGIN_SCHEMA = {
+    "request": SSOLoginSerializer,
+    "responses": {
         200: OpenApiResponse(description="Login success; returns tokens and optional user info"),
-        400: OpenApiResponse(description="Bad Request – validation, invalid state, or provider not configured"),
+        400: OpenApiResponse(
+            description="Bad Request – validation, invalid state, reused code, or provider not configured"
+        ),
         403: OpenApiResponse(description="Forbidden – provider disabled"),
         502: OpenApiResponse(description="Bad Gateway – OAuth provider error"),
+        503: OpenApiResponse(description="Service Unavailable – provider busy (concurrency limit reached)"),
     },
-)
+}
+
+
+def _login(request, provider: str, data: dict) -> tuple:
+    """
+    Run the login for validated body data. Returns (payload, status, headers) so
+    both login views share the same responses and error codes.
+    """
+    workspace_id = data.get("workspace_id")
+    if workspace_id is None:
+        # Set by SSOWorkspaceMiddleware from SSO_WORKSPACE_HEADER.
+        workspace_id = getattr(request, "workspace_id", None)
+    state = data.get("state") or None
+    redirect_uri = data.get("redirect_uri") or ""
+
+    try:
+        service = OAuthService()
+        user, tokens = service.login(
+            provider_slug=provider,
+            code=data["code"],
+            redirect_uri=redirect_uri,
+            workspace=workspace_id,
+            state=state,
+            request=request,
+        )
+    except ProviderDisabledError as e:
+        return {"detail": e.detail, "code": e.default_code}, status.HTTP_403_FORBIDDEN, None
+    except (ProviderNotConfiguredError, InvalidStateError, AuthorizationCodeReusedError) as e:
+        return {"detail": e.detail, "code": e.default_code}, status.HTTP_400_BAD_REQUEST, None
+    except ProviderBusyError as e:
+        return (
+            {"detail": e.detail, "code": e.default_code},
+            status.HTTP_503_SERVICE_UNAVAILABLE,
+            {"Retry-After": "1"},
+        )
+    except OAuthProviderError as e:
+        logger.warning("OAuth provider error: %s", e.detail)
+        return (
+            {"detail": e.detail or "OAuth provider error.", "code": e.default_code},
+            status.HTTP_502_BAD_GATEWAY,
+            None,
+        )
+    except Exception as e:
+        logger.exception("SSO login error: %s", e)
+        return (
+            {"detail": "An error occurred. Please try again later.", "code": "error"},
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
+            None,
+        )
+
+    response_data = dict(tokens)
+    if user:
+        response_data["user"] = {
+            "id": user.pk,
+            "email": getattr(user, "email", None) or "",
+            "username": getattr(user, "username", None) or "",
+        }
+    return response_data, status.HTTP_200_OK, None
+
+
+@extend_schema(**_LOGIN_SCHEMA)
 class SSOLoginView(APIView):
     """POST login/<provider>/ – exchange OAuth code for tokens."""
 
     permission_classes = []
     authentication_classes = []
+    renderer_classes = [SSOJSONRenderer]
 
     def post(self, request: Request, provider: str):
         serializer = SSOLoginSerializer(data=request.data)
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        payload, status_code, headers = _login(request, provider, serializer.validated_data)
+        return Response(payload, status=status_code, headers=headers)
+
+
+_drf_login_view = SSOLoginView.as_view()
+
+
+def _json_response(payload, status_code: int, headers=None) -> HttpResponse:
+    return HttpResponse(
+        codec.dumps(payload), status=status_code, content_type="application/json", headers=headers
+    )
+
+
+@extend_schema(**_LOGIN_SCHEMA)
+class SSOFastLoginView(APIView):
+    """
+    POST login/<provider>/ with the same contract as SSOLoginView, minus DRF body
+    parsing and rendering: JSON bodies are parsed once with the codec, validated by
+    fast_validate_login (SSOLoginSerializer only for errors and coerced inputs) and
+    answered with an HttpResponse encoded in one codec.dumps call. The request is
+    still wrapped in a DRF Request and run through initial(), so throttles,
+    permissions and versioning apply and host callables get the same request type.
+    Other methods and content types go to SSOLoginView; malformed JSON gets DRF's
+    parse error.
+    Enabled with SSO_FAST_LOGIN_VIEW = True.
+    """
+
+    permission_classes = []
+    authentication_classes = []
+    renderer_classes = [SSOJSONRenderer]
 
-        data = serializer.validated_data
-        code = data["code"]
-        workspace_id = data.get("workspace_id")
-        state = data.get("state") or None
-        redirect_uri = data.get("redirect_uri") or ""
+    def dispatch(self, request, *args, **kwargs):
+        if request.method != "POST" or request.content_type != "application/json":
+            return _drf_login_view(request, *args, **kwargs)
+        self.args, self.kwargs = args, kwargs
+        request = self.request = self.initialize_request(request, *args, **kwargs)
+        self.headers = self.default_response_headers
+        try:
+            self.initial(request, *args, **kwargs)
+            return self.post(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+            return self.finalize_response(request, response, *args, **kwargs)
 
+    def post(self, request: Request, provider: str):
+        body = request.body
         try:
-            service = OAuthService()
-            user, tokens = service.login(
-                provider_slug=provider,
-                code=code,
-                redirect_uri=redirect_uri,
-                workspace=workspace_id,
-                state=state,
-                request=request,
-            )
-        except ProviderDisabledError as e:
-            return Response(
-                {"detail": e.detail, "code": e.default_code},
-                status=status.HTTP_403_FORBIDDEN,
-            )
-        except (ProviderNotConfiguredError, InvalidStateError) as e:
-            return Response(
-                {"detail": e.detail, "code": e.default_code},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-        except OAuthProviderError as e:
-            logger.warning("OAuth provider error: %s", e.detail)
-            return Response(
-                {"detail": e.detail or "OAuth provider error.", "code": e.default_code},
-                status=status.HTTP_502_BAD_GATEWAY,
-            )
-        except Exception as e:
-            logger.exception("SSO login error: %s", e)
-            return Response(
-                {"detail": "An error occurred. Please try again later.", "code": "error"},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            )
-
-        response_data = dict(tokens)
-        if user:
-            response_data["user"] = {
-                "id": user.pk,
-                "email": getattr(user, "email", None) or "",
-                "username": getattr(user, "username", None) or "",
-            }
-        return Response(response_data, status=status.HTTP_200_OK)
+            data = codec.loads(body) if body else {}
+        except ValueError:
+            # DRF's parser re-reads the cached body and raises the ParseError SSOLoginView
+            # would; dispatch renders it without running initial() (throttles) twice.
+            data = request.data
+        validated = fast_validate_login(data)
+        if validated is None:
+            serializer = SSOLoginSerializer(data=data)
+            if not serializer.is_valid():
+                return _json_response(serializer.errors, status.HTTP_400_BAD_REQUEST)
+            validated = serializer.validated_data
+        return _json_response(*_login(request, provider, validated))
+
+
+_EXPORT_CONTENT_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+class _IgnoreAcceptNegotiation(BaseContentNegotiation):
+    """
+    The export picks its format from ?output=, and streams bypass renderers; the
+    Accept header (e.g. text/csv, which no renderer offers) must not cause a 406.
+    Errors are rendered with the first renderer (JSON).
+    """
+
+    def select_parser(self, request, parsers):
+        return parsers[0] if parsers else None
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
+
+
+@extend_schema(
+    parameters=[SSOLogExportSerializer],
+    responses={
+        (200, "application/x-ndjson"): OpenApiTypes.STR,
+        (200, "text/csv"): OpenApiTypes.STR,
+        400: OpenApiResponse(description="Bad Request – invalid filter or cursor"),
+        403: OpenApiResponse(description="Forbidden – staff only"),
+    },
+)
+class SSOLoginLogExportView(APIView):
+    """GET logs/export/ – stream login logs as NDJSON or CSV (staff only)."""
+
+    permission_classes = [IsAdminUser]
+    renderer_classes = [SSOJSONRenderer]
+    content_negotiation_class = _IgnoreAcceptNegotiation
+
+    def get(self, request: Request):
+        serializer = SSOLogExportSerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        filters = dict(serializer.validated_data)
+        fmt = filters.pop("output")
+        response = StreamingHttpResponse(
+            log_export.stream_export(fmt, **filters),
+            content_type=_EXPORT_CONTENT_TYPES[fmt],
+        )
+        response["Content-Disposition"] = f'attachment; filename="sso-login-logs.{fmt}"'
+        return response
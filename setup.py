@@ -11,5 +11,9 @@ setup(
         "drf-spectacular>=0.27.0,<0.28.0",
         "requests>=2.31.0,<3.0.0",
     ],
+    extras_require={
+        "orjson": ["orjson>=3.9"],
+        "cryptography": ["cryptography>=41"],
+    },
     python_requires=">=3.10",
 )
@@ -0,0 +1,18 @@
+"""Shared fixtures: isolate SSO cache markers between tests; query budgets."""
+import pytest
+from django.core.cache import cache
+
+from company_sso_core.testing import query_budget as _query_budget
+
+
+@pytest.fixture(autouse=True)
+def _clear_sso_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def query_budget():
+    """company_sso_core.testing.query_budget: `with query_budget(2): ...` asserts exactly 2 queries."""
+    return _query_budget
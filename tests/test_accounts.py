@@ -0,0 +1,130 @@
+"""Tests for SocialAccount-based user resolution."""
+import pytest
+from unittest.mock import MagicMock, patch
+
+from django.contrib.auth import get_user_model
+
+from company_sso_core.models import SocialAccount, SocialProvider
+from company_sso_core.services import accounts
+from company_sso_core.services.accounts import get_or_create_sso_user
+from company_sso_core.services.oauth_service import OAuthService
+from company_sso_core.services.provider_cache import get_cache
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestGetOrCreateSSOUser:
+    """Identity -> user resolution through the indexed link table."""
+
+    def test_first_login_creates_user_and_link(self):
+        user, created = get_or_create_sso_user("github", {"id": 42, "email": "o@x.com"}, None)
+        assert created is True
+        assert user.email == "o@x.com"
+        assert not user.has_usable_password()
+        link = SocialAccount.objects.get()
+        assert (link.provider_slug, link.external_id, link.user) == ("github", "42", user)
+
+    def test_repeat_login_is_one_query(self, django_assert_num_queries):
+        user, _ = get_or_create_sso_user("github", {"id": 42}, None)
+        accounts.forget_account("github", "42")
+        with django_assert_num_queries(1):
+            again, created = get_or_create_sso_user("github", {"id": 42}, None)
+        assert again == user
+        assert created is False
+
+    def test_cached_mapping_is_primary_key_lookup(self, django_assert_num_queries):
+        user, _ = get_or_create_sso_user("github", {"id": 42}, None)
+        with django_assert_num_queries(1) as ctx:
+            assert get_or_create_sso_user("github", {"id": 42}, None)[0] == user
+        assert "company_sso_core_socialaccount" not in ctx.captured_queries[0]["sql"]
+
+    def test_same_id_different_provider_is_different_user(self):
+        a, _ = get_or_create_sso_user("github", {"id": 1}, None)
+        b, _ = get_or_create_sso_user("gitlab", {"id": 1}, None)
+        assert a != b
+
+    def test_missing_id_returns_none(self):
+        assert get_or_create_sso_user("github", {"email": "x@x.com"}, None) == (None, False)
+
+    def test_concurrent_first_login_resolves_to_winner(self):
+        """Losing the race raises IntegrityError inside; the winner's link is returned."""
+        winner = User.objects.create(username="github_42")
+        SocialAccount.objects.create(user=winner, provider_slug="github", external_id="42")
+        real_lookup = accounts._lookup_account
+        with patch.object(accounts, "_lookup_account", side_effect=[None, real_lookup("github", "42")]):
+            user, created = get_or_create_sso_user("github", {"id": 42}, None)
+        assert user == winner
+        assert created is False
+        assert SocialAccount.objects.count() == 1
+
+    def test_deleting_link_drops_cached_mapping(self):
+        get_or_create_sso_user("github", {"id": 42}, None)
+        cache = get_cache()
+        key = accounts._cache_key("github", "42")
+        assert cache.get(key) is not None
+        SocialAccount.objects.all().delete()
+        assert cache.get(key) is None
+
+    def test_same_id_in_two_workspaces_is_different_user(self):
+        a, _ = get_or_create_sso_user("okta", {"id": "00u1"}, None, workspace=1)
+        b, _ = get_or_create_sso_user("okta", {"id": "00u1"}, None, workspace=2)
+        glob, _ = get_or_create_sso_user("okta", {"id": "00u1"}, None)
+        assert len({a, b, glob}) == 3
+        assert [u.username for u in (a, b, glob)] == ["okta.1_00u1", "okta.2_00u1", "okta_00u1"]
+        # Cached mappings are scoped too.
+        assert get_or_create_sso_user("okta", {"id": "00u1"}, None, workspace=2)[0] == b
+
+    def test_deleting_workspace_link_drops_its_cached_mapping(self):
+        get_or_create_sso_user("okta", {"id": "00u1"}, None, workspace=1)
+        key = accounts._cache_key("okta", "00u1", 1)
+        assert get_cache().get(key) is not None
+        SocialAccount.objects.all().delete()
+        assert get_cache().get(key) is None
+
+
+@pytest.mark.django_db
+class TestWorkspaceScopedLogin:
+    """Login passes the authenticating provider row's workspace to the resolver."""
+
+    @pytest.fixture(autouse=True)
+    def builtin_resolver(self, settings):
+        settings.SSO_GET_OR_CREATE_USER = get_or_create_sso_user
+        for workspace in (1, 2):
+            SocialProvider.objects.create(
+                slug="okta",
+                name="Okta",
+                client_id="i",
+                client_secret="s",
+                workspace_id=workspace,
+                extra_config={"domain": f"https://tenant{workspace}.okta.com"},
+            )
+
+    def _login(self, workspace, code="code"):
+        provider = MagicMock()
+        provider.exchange_code.return_value = {"access_token": "at"}
+        # Both tenants' IdPs return the same subject.
+        provider.get_user_info.return_value = {"id": "00u1", "email": "victim@x.com"}
+        with patch("company_sso_core.services.oauth_service.get_provider", return_value=provider):
+            return OAuthService().login("okta", code, "https://app.com/cb", workspace=workspace)[0]
+
+    def test_same_subject_from_two_workspaces_resolves_to_two_users(self):
+        first = self._login(1)
+        second = self._login(2)
+        assert first != second
+        assert set(SocialAccount.objects.values_list("workspace_id", "user_id")) == {
+            (1, first.pk),
+            (2, second.pk),
+        }
+        assert self._login(1, code="code-2") == first
+
+    def test_host_resolver_without_workspace_keyword_still_works(self, settings):
+        calls = []
+
+        def resolver(provider_slug, user_info, request):
+            calls.append(provider_slug)
+            return User.objects.get_or_create(username=user_info["id"])
+
+        settings.SSO_GET_OR_CREATE_USER = resolver
+        self._login(1)
+        assert calls == ["okta"]
@@ -0,0 +1,115 @@
+"""Tests for SocialProviderAdmin at scale: search, bulk actions, filters, paginator."""
+from unittest.mock import patch
+
+import pytest
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory
+
+from company_sso_core.admin import ProviderSlugFilter
+from company_sso_core.models import SocialProvider, SSOLoginLog
+from company_sso_core.pagination import EstimatedCountPaginator
+from company_sso_core.services import provider_cache
+from company_sso_core.services.credential_loader import get_provider_credentials
+
+
+@pytest.fixture
+def provider_admin():
+    return admin.site._registry[SocialProvider]
+
+
+@pytest.fixture
+def superuser_request():
+    request = RequestFactory().get("/")
+    request.user = get_user_model().objects.create_superuser("admin", "admin@test.com", "x")
+    return request
+
+
+@pytest.fixture
+def providers():
+    return [
+        SocialProvider.objects.create(
+            slug="okta",
+            name="Okta",
+            client_id="i",
+            client_secret="s",
+            workspace_id=ws,
+            extra_config={"domain": "https://acme.okta.com"},
+        )
+        for ws in (1, 2, 3)
+    ]
+
+
+@pytest.mark.django_db
+class TestSocialProviderAdmin:
+    def test_numeric_search_is_workspace_lookup(self, provider_admin, superuser_request, providers, query_budget):
+        qs, distinct = provider_admin.get_search_results(superuser_request, SocialProvider.objects.all(), " 2 ")
+        assert distinct is False
+        with query_budget(1) as captured:
+            assert list(qs) == [providers[1]]
+        sql = captured.queries[0][1]
+        assert '"workspace_id" = 2' in sql and "LIKE" not in sql
+
+    def test_text_search_uses_exact_slug_and_name_prefix(self, provider_admin, superuser_request, providers):
+        qs, _ = provider_admin.get_search_results(superuser_request, SocialProvider.objects.all(), "okt")
+        assert qs.count() == 3  # name prefix
+        qs, _ = provider_admin.get_search_results(superuser_request, SocialProvider.objects.all(), "kta")
+        assert qs.count() == 0
+
+    def test_bulk_deactivate_is_one_update_and_one_bump(self, provider_admin, superuser_request, providers, query_budget):
+        before = provider_cache.global_generation()
+        with patch.object(provider_admin, "message_user") as message_user:
+            with query_budget(1):
+                provider_admin.deactivate_selected(superuser_request, SocialProvider.objects.all())
+        assert not SocialProvider.objects.filter(is_active=True).exists()
+        assert provider_cache.global_generation() == before + 1
+        assert provider_cache.is_pinned_to_primary("okta", 1)
+        assert "3 provider(s) deactivated" in message_user.call_args.args[1]
+
+    def test_bulk_activate_clears_not_configured_markers(self, provider_admin, superuser_request):
+        SocialProvider.objects.create(slug="github", name="GH", client_id="i", client_secret="s", is_active=False)
+        provider_cache.mark_not_configured("github")
+        assert provider_cache.is_marked_not_configured("github")
+        with patch.object(provider_admin, "message_user"):
+            provider_admin.activate_selected(superuser_request, SocialProvider.objects.all())
+        assert not provider_cache.is_marked_not_configured("github")
+        assert get_provider_credentials("github")["client_id"] == "i"
+
+    def test_unchanged_rows_skip_invalidation(self, provider_admin, superuser_request, providers):
+        with patch.object(provider_admin, "message_user"):
+            provider_admin.activate_selected(superuser_request, SocialProvider.objects.all())
+        assert provider_cache.global_generation() == 0
+
+
+@pytest.mark.django_db
+class TestProviderSlugFilter:
+    def test_choices_from_registry_without_queries(self, provider_admin, superuser_request, query_budget):
+        with query_budget(0):
+            f = ProviderSlugFilter(superuser_request, {}, SocialProvider, provider_admin)
+        slugs = [slug for slug, _ in f.lookup_choices]
+        assert {"google", "okta", "github"} <= set(slugs)
+
+    def test_filters_log_rows_by_provider_slug(self, superuser_request):
+        SSOLoginLog.objects.create(provider_slug="google", status="success")
+        SSOLoginLog.objects.create(provider_slug="github", status="success")
+        log_admin = admin.site._registry[SSOLoginLog]
+        f = ProviderSlugFilter(superuser_request, {"provider": ["github"]}, SSOLoginLog, log_admin)
+        assert list(f.queryset(superuser_request, SSOLoginLog.objects.all()).values_list("provider_slug", flat=True)) == [
+            "github"
+        ]
+
+
+@pytest.mark.django_db
+class TestEstimatedCountPaginator:
+    def test_large_unfiltered_uses_estimate(self):
+        with patch("company_sso_core.pagination.estimated_row_count", return_value=250_000):
+            assert EstimatedCountPaginator(SocialProvider.objects.all(), 100).count == 250_000
+
+    def test_small_or_filtered_counts_exactly(self, providers):
+        with patch("company_sso_core.pagination.estimated_row_count", return_value=250_000):
+            assert EstimatedCountPaginator(SocialProvider.objects.filter(workspace_id=1), 100).count == 1
+        with patch("company_sso_core.pagination.estimated_row_count", return_value=50):
+            assert EstimatedCountPaginator(SocialProvider.objects.all(), 100).count == 3
+
+    def test_no_estimate_on_sqlite(self, providers):
+        assert EstimatedCountPaginator(SocialProvider.objects.all(), 100).count == 3
@@ -0,0 +1,137 @@
+"""Tests for per-provider bulkheads."""
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from company_sso_core.exceptions import ProviderBusyError
+from company_sso_core.services import bulkhead as bulkhead_module
+from company_sso_core.services.bulkhead import Bulkhead, bulkhead_gauges, get_bulkhead
+from company_sso_core.services.oauth_service import OAuthService
+
+
+@pytest.fixture(autouse=True)
+def _fresh_bulkheads():
+    bulkhead_module._bulkheads.clear()
+    yield
+    bulkhead_module._bulkheads.clear()
+
+
+class TestBulkhead:
+    def test_rejects_when_queue_full(self):
+        bh = Bulkhead(limit=1, queue_size=0, queue_wait=1)
+        bh.acquire()
+        with pytest.raises(ProviderBusyError):
+            bh.acquire()
+        assert bh.gauges() == {"in_flight": 1, "queued": 0, "limit": 1, "rejected": 1}
+
+    def test_queued_caller_gets_released_slot(self):
+        bh = Bulkhead(limit=1, queue_size=1, queue_wait=5)
+        bh.acquire()
+        entered = threading.Event()
+
+        def waiter():
+            with bh.slot():
+                entered.set()
+
+        thread = threading.Thread(target=waiter)
+        thread.start()
+        while bh.queued == 0:
+            time.sleep(0.001)
+        assert not entered.is_set()
+        bh.release()
+        thread.join(2)
+        assert entered.is_set()
+        assert bh.gauges()["in_flight"] == 0
+
+    def test_queue_wait_times_out(self):
+        bh = Bulkhead(limit=1, queue_size=1, queue_wait=0.05)
+        bh.acquire()
+        with pytest.raises(ProviderBusyError):
+            bh.acquire()
+        assert bh.queued == 0
+
+    def test_async_slot_waits_without_blocking_loop(self):
+        bh = Bulkhead(limit=1, queue_size=1, queue_wait=5)
+
+        async def main():
+            order = []
+
+            async def holder():
+                async with bh.async_slot():
+                    await asyncio.sleep(0.05)
+                    order.append("holder")
+
+            async def waiter():
+                await asyncio.sleep(0.01)
+                async with bh.async_slot():
+                    order.append("waiter")
+
+            await asyncio.gather(holder(), waiter())
+            return order
+
+        assert asyncio.run(main()) == ["holder", "waiter"]
+        assert bh.in_flight == 0
+
+    def test_async_rejects_when_queue_full(self):
+        bh = Bulkhead(limit=1, queue_size=0, queue_wait=1)
+        bh.acquire()
+        with pytest.raises(ProviderBusyError):
+            asyncio.run(bh.acquire_async())
+
+
+class TestLimits:
+    def test_unlimited_by_default(self):
+        assert get_bulkhead("google") is None
+
+    def test_per_slug_workspace_and_default(self, settings):
+        settings.SSO_PROVIDER_CONCURRENCY = {"okta": 5, "okta:12": 2, "*": 20}
+        assert get_bulkhead("okta").limit == 5
+        assert get_bulkhead("okta", 12).limit == 2
+        assert get_bulkhead("okta", 13) is get_bulkhead("okta")
+        assert get_bulkhead("github").limit == 20
+        assert set(bulkhead_gauges()) == {"okta", "okta:12", "github"}
+
+    def test_int_applies_to_every_provider(self, settings):
+        settings.SSO_PROVIDER_CONCURRENCY = 3
+        assert get_bulkhead("google").limit == 3
+
+
+@pytest.mark.django_db
+class TestLoginBulkhead:
+    def _provider(self):
+        provider = MagicMock()
+        provider.exchange_code.return_value = {"access_token": "at"}
+        provider.get_user_info.return_value = {"id": "1", "email": "u@test.com"}
+        return provider
+
+    def test_slot_held_during_upstream_calls_only(self, settings):
+        settings.SSO_PROVIDER_CONCURRENCY = {"google": 1}
+        provider = self._provider()
+        seen = []
+        provider.get_user_info.side_effect = lambda token: seen.append(get_bulkhead("google").in_flight) or {
+            "id": "1",
+            "email": "u@test.com",
+        }
+        with patch("company_sso_core.services.oauth_service.get_provider", return_value=provider):
+            OAuthService().login("google", "code", "https://app.com/cb")
+        assert seen == [1]
+        assert get_bulkhead("google").in_flight == 0
+
+    def test_busy_provider_returns_503(self, settings):
+        settings.SSO_PROVIDER_CONCURRENCY = {"google": 1}
+        settings.SSO_PROVIDER_QUEUE_SIZE = 0
+        get_bulkhead("google").acquire()
+        provider = self._provider()
+        with patch("company_sso_core.services.oauth_service.get_provider", return_value=provider):
+            resp = APIClient().post(
+                reverse("sso_api:login", kwargs={"provider": "google"}), {"code": "c"}, format="json"
+            )
+        assert resp.status_code == 503
+        assert resp.json()["code"] == "provider_busy"
+        assert resp["Retry-After"] == "1"
+        provider.exchange_code.assert_not_called()
@@ -0,0 +1,71 @@
+"""Tests for the JSON codec used by providers and the SSO login view."""
+from decimal import Decimal
+
+import pytest
+from unittest.mock import patch, MagicMock
+from django.utils.translation import gettext_lazy
+
+from company_sso_core import codec
+from company_sso_core.codec import OrjsonCodec, StdlibCodec
+from company_sso_core.providers.generic import GenericOAuth2Provider
+
+CODECS = [StdlibCodec] + ([OrjsonCodec] if codec.orjson is not None else [])
+
+
+@pytest.fixture
+def reset_codec():
+    codec._codec = None
+    yield
+    codec._codec = None
+
+
+@pytest.mark.parametrize("impl", CODECS, ids=lambda c: c.name)
+class TestCodecs:
+    """Both codecs parse bytes directly and emit compact UTF-8 bytes."""
+
+    def test_loads_bytes(self, impl):
+        assert impl.loads('{"name": "Zoë"}'.encode()) == {"name": "Zoë"}
+
+    def test_dumps_bytes(self, impl):
+        out = impl.dumps({"name": "Zoë", "n": 1})
+        assert isinstance(out, bytes)
+        assert impl.loads(out) == {"name": "Zoë", "n": 1}
+
+    def test_dumps_falls_back_for_drf_types(self, impl):
+        out = impl.loads(impl.dumps({"detail": gettext_lazy("Denied"), "amount": Decimal("1.5")}))
+        assert out["detail"] == "Denied"
+
+    def test_invalid_json_is_value_error(self, impl):
+        with pytest.raises(ValueError):
+            impl.loads(b"not json")
+
+
+class TestCodecSelection:
+    """SSO_JSON_CODEC picks the implementation."""
+
+    def test_stdlib_forced(self, settings, reset_codec):
+        settings.SSO_JSON_CODEC = "stdlib"
+        assert codec.get_codec() is StdlibCodec
+
+    def test_dotted_path(self, settings, reset_codec):
+        settings.SSO_JSON_CODEC = "company_sso_core.codec.StdlibCodec"
+        assert codec.get_codec() is StdlibCodec
+
+    def test_auto_prefers_orjson(self, reset_codec):
+        expected = OrjsonCodec if codec.orjson is not None else StdlibCodec
+        assert codec.get_codec() is expected
+
+
+class TestProviderParsing:
+    """Providers parse the raw response body through the codec."""
+
+    @patch("company_sso_core.providers.http.get")
+    def test_generic_user_info_from_bytes(self, mock_get):
+        mock_get.return_value = MagicMock(
+            content=b'{"id": "abc", "mail": "m@corp.com", "displayName": "M"}'
+        )
+        provider = GenericOAuth2Provider({"client_id": "x", "client_secret": "y"}, slug="microsoft")
+        out = provider.get_user_info("at")
+        assert out["id"] == "abc"
+        assert out["email"] == "m@corp.com"
+        assert out["name"] == "M"
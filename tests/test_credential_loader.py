@@ -80,3 +80,48 @@ class TestCredentialLoader:
         with patch.object(settings, "SSO_PROVIDERS", {}):
             with pytest.raises(ProviderNotConfiguredError):
                 get_provider_credentials("google", workspace=None)
+
+
+@pytest.mark.django_db
+class TestNegativeCaching:
+    """Unknown slugs are rejected without DB access; misses are cached per (slug, workspace)."""
+
+    def test_unknown_slug_rejected_without_queries(self, django_assert_num_queries):
+        """Slugs outside the registry and built-in configs never reach the DB."""
+        with django_assert_num_queries(0):
+            with pytest.raises(ProviderNotConfiguredError):
+                get_provider_credentials("not-a-provider", workspace=None)
+
+    def test_miss_is_cached(self, django_assert_num_queries):
+        """Second lookup of an unconfigured (slug, workspace) skips the DB."""
+        with pytest.raises(ProviderNotConfiguredError):
+            get_provider_credentials("linkedin", workspace=7)
+        with django_assert_num_queries(0):
+            with pytest.raises(ProviderNotConfiguredError):
+                get_provider_credentials("linkedin", workspace=7)
+
+    def test_miss_is_per_workspace(self):
+        """A miss for one workspace does not hide another workspace's provider."""
+        with pytest.raises(ProviderNotConfiguredError):
+            get_provider_credentials("linkedin", workspace=7)
+        SocialProvider.objects.create(
+            slug="linkedin", name="LinkedIn", client_id="ws8", client_secret="s", workspace_id=8
+        )
+        assert get_provider_credentials("linkedin", workspace=8)["client_id"] == "ws8"
+
+    def test_creation_invalidates_miss(self):
+        """Creating the SocialProvider makes it resolvable immediately."""
+        with pytest.raises(ProviderNotConfiguredError):
+            get_provider_credentials("linkedin", workspace=7)
+        SocialProvider.objects.create(
+            slug="linkedin", name="LinkedIn", client_id="ws7", client_secret="s", workspace_id=7
+        )
+        assert get_provider_credentials("linkedin", workspace=7)["client_id"] == "ws7"
+
+    def test_ttl_zero_disables_cache(self, settings):
+        """SSO_NEGATIVE_CACHE_TTL = 0 turns negative caching off."""
+        settings.SSO_NEGATIVE_CACHE_TTL = 0
+        with pytest.raises(ProviderNotConfiguredError):
+            get_provider_credentials("linkedin", workspace=7)
+        settings.SSO_PROVIDERS = {"linkedin": {"client_id": "late", "client_secret": "s"}}
+        assert get_provider_credentials("linkedin", workspace=7)["client_id"] == "late"
@@ -0,0 +1,185 @@
+"""Tests for SSOFastLoginView: same responses as SSOLoginView without DRF parsing and rendering."""
+import json
+from unittest.mock import patch
+
+import pytest
+from django.test import RequestFactory
+from drf_spectacular.generators import SchemaGenerator
+from django.urls import path
+from rest_framework.request import Request
+from rest_framework.throttling import AnonRateThrottle
+
+from company_sso_core.exceptions import (
+    InvalidStateError,
+    OAuthProviderError,
+    ProviderBusyError,
+    ProviderDisabledError,
+)
+from company_sso_core.serializers import SSOLoginSerializer, fast_validate_login
+from company_sso_core.views import SSOFastLoginView, SSOLoginView
+
+fast_view = SSOFastLoginView.as_view()
+drf_view = SSOLoginView.as_view()
+
+BODIES = [
+    {"code": "auth_code", "redirect_uri": "https://app.com/cb"},
+    {"code": " auth_code ", "workspace_id": 7, "state": "st", "redirect_uri": " https://app.com/cb?x=1 "},
+    {"code": "auth_code", "workspace_id": "12"},
+    {"code": 5},
+    {"code": "auth_code", "workspace_id": None, "state": "", "redirect_uri": ""},
+    {},
+    {"code": ""},
+    {"code": None},
+    {"code": True},
+    {"code": "auth_code", "workspace_id": "abc"},
+    {"code": "auth_code", "workspace_id": True},
+    {"code": "auth_code", "state": None},
+    {"code": "auth_code", "redirect_uri": "not a url"},
+    {"code": "", "workspace_id": "x", "redirect_uri": "nope"},
+    ["code"],
+    "code",
+]
+
+
+def _post(view, body, content_type="application/json", **extra):
+    data = json.dumps(body) if content_type == "application/json" and not isinstance(body, bytes) else body
+    request = RequestFactory().post("/login/google/", data=data, content_type=content_type, **extra)
+    return view(request, provider="google")
+
+
+def _login_result(*args, **kwargs):
+    return None, {"access": "tok_access", "refresh": "tok_refresh", "args": sorted(kwargs.items(), key=str)}
+
+
+@pytest.mark.django_db
+class TestFastLoginEquivalence:
+    """Every body gets the same status and JSON from both views."""
+
+    @pytest.mark.parametrize("body", BODIES, ids=repr)
+    def test_same_response(self, body):
+        with patch("company_sso_core.views.OAuthService") as MockService:
+            MockService.return_value.login.side_effect = lambda **kw: _login_result(
+                **{k: v for k, v in kw.items() if k != "request"}
+            )
+            drf = _post(drf_view, body)
+            drf.render()
+            fast = _post(fast_view, body)
+        assert fast.status_code == drf.status_code
+        assert fast["Content-Type"] == drf["Content-Type"]
+        assert json.loads(fast.content) == json.loads(drf.content)
+
+    @pytest.mark.parametrize(
+        "error, status_code",
+        [
+            (ProviderDisabledError(), 403),
+            (InvalidStateError(), 400),
+            (OAuthProviderError(), 502),
+            (ProviderBusyError(), 503),
+            (RuntimeError("boom"), 500),
+        ],
+    )
+    def test_same_error_mapping(self, error, status_code):
+        body = {"code": "auth_code"}
+        with patch("company_sso_core.views.OAuthService") as MockService:
+            MockService.return_value.login.side_effect = error
+            drf = _post(drf_view, body)
+            drf.render()
+            fast = _post(fast_view, body)
+        assert fast.status_code == drf.status_code == status_code
+        assert json.loads(fast.content) == json.loads(drf.content)
+        assert fast.get("Retry-After") == drf.get("Retry-After")
+
+    def test_workspace_from_middleware(self):
+        request = RequestFactory().post("/", data=b'{"code": "c"}', content_type="application/json")
+        request.workspace_id = 42
+        with patch("company_sso_core.views.OAuthService") as MockService:
+            MockService.return_value.login.return_value = (None, {})
+            fast_view(request, provider="google")
+        assert MockService.return_value.login.call_args.kwargs["workspace"] == 42
+
+
+class _OnePerMinute(AnonRateThrottle):
+    rate = "1/min"
+
+
+class _TwoPerMinute(AnonRateThrottle):
+    rate = "2/min"
+
+
+@pytest.mark.django_db
+class TestFastLoginDRFHooks:
+    """Throttles and other initial() hooks apply as on SSOLoginView."""
+
+    @pytest.mark.parametrize("view_class", [SSOFastLoginView, SSOLoginView])
+    def test_throttle_trips(self, view_class):
+        view = view_class.as_view()
+        with patch.object(view_class, "throttle_classes", [_OnePerMinute]), patch(
+            "company_sso_core.views.OAuthService"
+        ) as MockService:
+            MockService.return_value.login.return_value = (None, {"access": "a"})
+            assert _post(view, {"code": "c"}).status_code == 200
+            resp = _post(view, {"code": "c"})
+            resp.render()
+        assert resp.status_code == 429
+        assert "throttled" in json.loads(resp.content)["detail"]
+        assert resp["Retry-After"]
+        assert MockService.return_value.login.call_count == 1
+
+    def test_malformed_body_counted_once(self):
+        throttles = [_TwoPerMinute]
+        with patch.object(SSOFastLoginView, "throttle_classes", throttles), patch.object(
+            SSOLoginView, "throttle_classes", throttles
+        ):
+            responses = [_post(fast_view, b"{not json").render() for _ in range(3)]
+        assert [resp.status_code for resp in responses] == [400, 400, 429]
+        assert "JSON parse error" in json.loads(responses[0].content)["detail"]
+
+    def test_service_gets_drf_request(self):
+        with patch("company_sso_core.views.OAuthService") as MockService:
+            MockService.return_value.login.return_value = (None, {})
+            _post(fast_view, {"code": "c"})
+        assert isinstance(MockService.return_value.login.call_args.kwargs["request"], Request)
+
+
+@pytest.mark.django_db
+class TestFastLoginDelegation:
+    """Requests outside the JSON POST fast path are handled by SSOLoginView (or DRF's errors)."""
+
+    def test_malformed_json(self):
+        resp = _post(fast_view, b"{not json").render()
+        assert resp.status_code == 400
+        assert "JSON parse error" in json.loads(resp.content)["detail"]
+
+    def test_form_body(self):
+        with patch("company_sso_core.views.OAuthService") as MockService:
+            MockService.return_value.login.return_value = (None, {"access": "a"})
+            resp = _post(fast_view, "code=auth_code", content_type="application/x-www-form-urlencoded")
+        assert resp.status_code == 200
+
+    def test_get_not_allowed(self):
+        resp = fast_view(RequestFactory().get("/login/google/"), provider="google")
+        assert resp.status_code == 405
+
+
+class TestFastValidateLogin:
+    """fast_validate_login never accepts a body the serializer rejects, nor changes its result."""
+
+    @pytest.mark.parametrize("body", BODIES + [{"code": "x\x00"}, {"code": "x", "extra": 1}], ids=repr)
+    def test_agrees_with_serializer(self, body):
+        validated = fast_validate_login(body)
+        if validated is not None:
+            serializer = SSOLoginSerializer(data=body)
+            assert serializer.is_valid()
+            assert validated == dict(serializer.validated_data)
+
+    def test_common_shape_takes_fast_path(self):
+        body = {"code": "c", "workspace_id": 3, "state": "s", "redirect_uri": "https://app.com/cb"}
+        assert fast_validate_login(body) == body
+
+
+def test_schema_documents_fast_view():
+    generator = SchemaGenerator(patterns=[path("login/<str:provider>/", SSOFastLoginView.as_view())])
+    schema = generator.get_schema(request=None, public=True)
+    operation = schema["paths"]["/login/{provider}/"]["post"]
+    assert set(operation["responses"]) >= {"200", "400", "403", "502", "503"}
+    assert "requestBody" in operation
@@ -1,4 +1,6 @@
 """Tests for Google OAuth provider: exchange_code and get_user_info (mocked)."""
+import json
+
 import pytest
 from unittest.mock import patch, MagicMock
 
@@ -8,12 +10,12 @@ from company_sso_core.providers.google import GoogleOAuthProvider
 class TestGoogleOAuthProvider:
     """Google provider uses token_url and user_info_url; no credentials in class."""
 
-    @patch("company_sso_core.providers.google.requests.post")
+    @patch("company_sso_core.providers.http.post")
     def test_exchange_code_returns_tokens(self, mock_post):
         """exchange_code POSTs to token_url and returns JSON with access_token."""
         mock_post.return_value = MagicMock(
             status_code=200,
-            json=lambda: {"access_token": "ya29.xxx", "expires_in": 3599, "token_type": "Bearer"},
+            content=b'{"access_token": "ya29.xxx", "expires_in": 3599, "token_type": "Bearer"}',
         )
         mock_post.return_value.raise_for_status = MagicMock()
         provider = GoogleOAuthProvider({"client_id": "cid", "client_secret": "csec"})
@@ -23,17 +25,17 @@ class TestGoogleOAuthProvider:
         call_kw = mock_post.call_args[1]
         assert call_kw.get("data", {}).get("code") == "auth_code"
 
-    @patch("company_sso_core.providers.google.requests.get")
+    @patch("company_sso_core.providers.http.get")
     def test_get_user_info_returns_normalized(self, mock_get):
         """get_user_info GETs userinfo and returns id, email, name, picture."""
         mock_get.return_value = MagicMock(
             status_code=200,
-            json=lambda: {
+            content=json.dumps({
                 "id": "123",
                 "email": "u@example.com",
                 "name": "Test User",
                 "picture": "https://photo",
-            },
+            }).encode(),
         )
         mock_get.return_value.raise_for_status = MagicMock()
         provider = GoogleOAuthProvider({})
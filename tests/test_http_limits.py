@@ -0,0 +1,103 @@
+"""Tests for bounded upstream reads: SSO_HTTP_MAX_RESPONSE_BYTES and upstream_response_too_large."""
+import io
+from unittest.mock import patch
+
+import pytest
+import requests
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from company_sso_core.exceptions import UpstreamResponseTooLargeError
+from company_sso_core.models import SSOLoginLog
+from company_sso_core.providers import http
+
+
+class _Raw(io.BytesIO):
+    """Raw body that records how much was read."""
+
+    def __init__(self, body: bytes):
+        super().__init__(body)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+def _response(body: bytes, content_length: bool = True):
+    resp = requests.Response()
+    resp.status_code = 200
+    resp.raw = _Raw(body)
+    if content_length:
+        resp.headers["Content-Length"] = str(len(body))
+    return resp
+
+
+class TestBoundedReads:
+    """Bodies above the cap are abandoned early; smaller ones read normally."""
+
+    def test_under_limit(self, settings):
+        settings.SSO_HTTP_MAX_RESPONSE_BYTES = 100
+        with patch.object(http.get_session(), "get", return_value=_response(b'{"id": 1}')) as get:
+            resp = http.get("https://idp.example.com/userinfo", timeout=5)
+        assert resp.content == b'{"id": 1}'
+        assert get.call_args.kwargs["stream"] is True
+
+    def test_content_length_over_limit(self, settings):
+        settings.SSO_HTTP_MAX_RESPONSE_BYTES = 100
+        resp = _response(b"x" * 1000)
+        with patch.object(http.get_session(), "post", return_value=resp):
+            with pytest.raises(UpstreamResponseTooLargeError):
+                http.post("https://idp.example.com/token", data={})
+        assert resp.raw.bytes_read == 0
+
+    def test_stream_over_limit(self, settings):
+        settings.SSO_HTTP_MAX_RESPONSE_BYTES = 100
+        resp = _response(b"x" * 10 * http._READ_CHUNK_SIZE, content_length=False)
+        with patch.object(http.get_session(), "get", return_value=resp):
+            with pytest.raises(UpstreamResponseTooLargeError):
+                http.get("https://idp.example.com/userinfo")
+        assert resp.raw.bytes_read == http._READ_CHUNK_SIZE
+
+    def test_traced_path_limited(self, settings):
+        settings.SSO_HTTP_MAX_RESPONSE_BYTES = 100
+        settings.SSO_TRACE_EXPORTER = "company_sso_core.tracing.InMemoryExporter"
+        with patch.object(http.get_session(), "request", return_value=_response(b"x" * 1000)):
+            with pytest.raises(UpstreamResponseTooLargeError):
+                http.get("https://idp.example.com/userinfo")
+
+    def test_disabled(self, settings):
+        settings.SSO_HTTP_MAX_RESPONSE_BYTES = None
+        with patch.object(http.get_session(), "get", return_value=_response(b"x" * 5000)):
+            assert len(http.get("https://idp.example.com/userinfo").content) == 5000
+
+    def test_per_provider(self, settings):
+        settings.SSO_HTTP_MAX_RESPONSE_BYTES = {"okta": 10, "*": 10_000}
+        with patch.object(http.get_session(), "get", side_effect=lambda *a, **kw: _response(b"x" * 100)):
+            assert len(http.get("https://idp.example.com/userinfo").content) == 100
+            with http.response_limit("okta"), pytest.raises(UpstreamResponseTooLargeError):
+                http.get("https://tenant.okta.com/userinfo")
+            with http.response_limit("google"):
+                assert len(http.get("https://idp.example.com/userinfo").content) == 100
+
+    def test_default(self):
+        assert http.max_response_bytes() == http.DEFAULT_MAX_RESPONSE_BYTES
+        assert http.max_response_bytes("okta") == http.DEFAULT_MAX_RESPONSE_BYTES
+
+
+@pytest.mark.django_db
+class TestLoginTooLarge:
+    """An oversized token response fails the login with its own error code."""
+
+    def test_view_returns_distinct_code(self, settings):
+        settings.SSO_HTTP_MAX_RESPONSE_BYTES = {"google": 64}
+        with patch.object(http.get_session(), "post", return_value=_response(b"x" * 1000)):
+            resp = APIClient().post(
+                reverse("sso_api:login", kwargs={"provider": "google"}),
+                {"code": "auth_code", "redirect_uri": "https://app.com/cb"},
+                format="json",
+            )
+        assert resp.status_code == 502
+        assert resp.json()["code"] == "upstream_response_too_large"
+        assert SSOLoginLog.objects.filter(provider_slug="google", status="failed").exists()
@@ -0,0 +1,54 @@
+"""Import-time budget for the provider registry, measured with `python -X importtime`."""
+import subprocess
+import sys
+from pathlib import Path
+
+from company_sso_core.providers.builtin_configs import BUILTIN_OAUTH2_CONFIGS
+from company_sso_core.providers.manifest import BUILTIN_PROVIDER_SLUGS
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Cumulative microseconds for `import company_sso_core.providers` once Django/DRF are loaded.
+IMPORT_BUDGET_US = 25_000
+
+LAZY_MODULES = {
+    "requests",
+    "company_sso_core.providers.builtin_configs",
+    "company_sso_core.providers.google",
+    "company_sso_core.providers.github",
+    "company_sso_core.providers.facebook",
+    "company_sso_core.providers.generic",
+}
+
+
+def _importtime(statement: str) -> dict[str, int]:
+    """Run statement in a fresh interpreter; return {module: cumulative_us}."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if cumulative.isdigit():
+            modules[name] = int(cumulative)
+    return modules
+
+
+class TestProviderImportTime:
+    """Importing the registry must not pull in provider modules, requests or the config table."""
+
+    def test_registry_import_is_lazy_and_within_budget(self):
+        # Preload the host-side dependencies so only this package's own cost is measured.
+        modules = _importtime("import rest_framework.exceptions; import company_sso_core.providers")
+        assert "company_sso_core.providers" in modules
+        assert not LAZY_MODULES & set(modules), sorted(LAZY_MODULES & set(modules))
+        assert modules["company_sso_core.providers"] < IMPORT_BUDGET_US
+
+    def test_manifest_matches_builtin_configs(self):
+        assert BUILTIN_PROVIDER_SLUGS == frozenset(BUILTIN_OAUTH2_CONFIGS)
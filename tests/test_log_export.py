@@ -0,0 +1,130 @@
+"""Tests for streaming SSOLoginLog export (service, command, endpoint)."""
+import csv
+import io
+import json
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from company_sso_core.models import SSOLoginLog
+from company_sso_core.services import log_export
+
+
+@pytest.fixture
+def logs():
+    base = timezone.now() - timedelta(hours=1)
+    rows = []
+    for i, (slug, status) in enumerate([("google", "success"), ("github", "failed"), ("google", "failed")]):
+        log = SSOLoginLog.objects.create(provider_slug=slug, status=status)
+        SSOLoginLog.objects.filter(pk=log.pk).update(created_at=base + timedelta(minutes=i))
+        log.refresh_from_db()
+        rows.append(log)
+    return rows
+
+
+def _ndjson(body: bytes) -> list:
+    return [json.loads(line) for line in body.splitlines()]
+
+
+@pytest.mark.django_db
+class TestLogExportService:
+    def test_ndjson_in_created_order(self, logs):
+        records = _ndjson(b"".join(log_export.stream_export("ndjson", chunk_size=1)))
+        assert [r["id"] for r in records] == [log.pk for log in logs]
+        assert set(records[0]) == set(log_export.EXPORT_FIELDS)
+        assert records[0]["created_at"] == logs[0].created_at.isoformat()
+
+    def test_filters(self, logs):
+        records = _ndjson(b"".join(log_export.stream_export(provider="google", status="failed")))
+        assert [r["id"] for r in records] == [logs[2].pk]
+        records = _ndjson(b"".join(log_export.stream_export(since=logs[1].created_at, until=logs[2].created_at)))
+        assert [r["id"] for r in records] == [logs[1].pk]
+
+    def test_cursor_resumes_after_last_row(self, logs):
+        cursor = log_export.make_cursor(logs[0].created_at, logs[0].pk)
+        records = _ndjson(b"".join(log_export.stream_export(after=cursor, limit=1)))
+        assert [r["id"] for r in records] == [logs[1].pk]
+
+    def test_cursor_breaks_created_at_ties_by_id(self, logs):
+        SSOLoginLog.objects.update(created_at=logs[0].created_at)
+        cursor = log_export.make_cursor(logs[0].created_at, logs[1].pk)
+        records = _ndjson(b"".join(log_export.stream_export(after=cursor)))
+        assert [r["id"] for r in records] == [logs[2].pk]
+
+    def test_csv(self, logs):
+        text = b"".join(log_export.stream_export("csv")).decode()
+        rows = list(csv.reader(io.StringIO(text)))
+        assert rows[0] == list(log_export.EXPORT_FIELDS)
+        assert len(rows) == 4
+        assert rows[1][4] == ""  # user_id None
+
+
+@pytest.mark.django_db
+class TestExportCommand:
+    def test_stdout_and_resume_cursor(self, logs):
+        out, err = io.StringIO(), io.StringIO()
+        call_command("sso_export_logs", "--limit", "2", stdout=out, stderr=err)
+        assert [r["id"] for r in _ndjson(out.getvalue().encode())] == [logs[0].pk, logs[1].pk]
+        cursor = err.getvalue().split("--after ")[1].strip()
+        out = io.StringIO()
+        call_command("sso_export_logs", "--after", cursor, stdout=out, stderr=io.StringIO())
+        assert [r["id"] for r in _ndjson(out.getvalue().encode())] == [logs[2].pk]
+
+    def test_csv_to_file(self, logs, tmp_path):
+        path = tmp_path / "logs.csv"
+        call_command("sso_export_logs", "--format", "csv", "--output", str(path), stderr=io.StringIO())
+        assert len(path.read_text().splitlines()) == 4
+
+
+@pytest.mark.django_db
+class TestExportView:
+    url = "sso_api:log-export"
+
+    def _client(self, staff=True):
+        user = get_user_model().objects.create_user(username="admin", password="x", is_staff=staff)
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    def test_staff_only(self, logs):
+        assert APIClient().get(reverse(self.url)).status_code in (401, 403)
+        assert self._client(staff=False).get(reverse(self.url)).status_code == 403
+
+    def test_streams_ndjson(self, logs):
+        resp = self._client().get(reverse(self.url), {"provider": "google"})
+        assert resp.status_code == 200
+        assert resp.streaming
+        assert resp["Content-Type"] == "application/x-ndjson"
+        records = _ndjson(b"".join(resp.streaming_content))
+        assert [r["provider_slug"] for r in records] == ["google", "google"]
+
+    def test_streams_csv(self, logs):
+        resp = self._client().get(reverse(self.url), {"output": "csv", "status": "failed"})
+        assert resp["Content-Type"] == "text/csv"
+        assert len(b"".join(resp.streaming_content).splitlines()) == 3
+
+    @pytest.mark.parametrize(
+        "output,accept",
+        [("ndjson", "application/x-ndjson"), ("csv", "text/csv"), ("csv", "text/csv, */*;q=0.1")],
+    )
+    def test_export_media_type_in_accept(self, logs, output, accept):
+        resp = self._client().get(reverse(self.url), {"output": output}, HTTP_ACCEPT=accept)
+        assert resp.status_code == 200
+        assert resp["Content-Type"] == accept.split(",")[0]
+        assert b"".join(resp.streaming_content)
+
+    def test_errors_are_json_whatever_the_accept(self):
+        resp = self._client().get(reverse(self.url), {"after": "nope"}, HTTP_ACCEPT="text/csv")
+        assert resp.status_code == 400
+        assert resp["Content-Type"] == "application/json"
+        assert "after" in resp.json()
+
+    def test_bad_cursor_400(self):
+        resp = self._client().get(reverse(self.url), {"after": "nope"})
+        assert resp.status_code == 400
+        assert "after" in resp.json()
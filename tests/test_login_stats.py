@@ -0,0 +1,131 @@
+"""Tests for success-log sampling and exact success counters."""
+from io import StringIO
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import DatabaseError
+from django.utils import timezone
+
+from company_sso_core.models import SSOLoginLog, SSOLoginStat
+from company_sso_core.services import login_stats
+from company_sso_core.services.oauth_service import OAuthService
+from company_sso_core.services.provider_cache import get_cache
+
+
+def _login(code="code"):
+    provider = MagicMock()
+    provider.exchange_code.return_value = {"access_token": "at"}
+    provider.get_user_info.return_value = {"id": "1", "email": "u@test.com"}
+    with patch("company_sso_core.services.oauth_service.get_provider", return_value=provider):
+        return OAuthService().login("google", code, "https://app.com/cb")
+
+
+class TestSampleRate:
+    def test_default_logs_everything(self):
+        assert login_stats.should_log_success("google") is True
+
+    def test_zero_never_logs(self, settings):
+        settings.SSO_LOGIN_LOG_SUCCESS_SAMPLE_RATE = 0
+        assert login_stats.should_log_success("google") is False
+
+    def test_per_provider_rates_with_default(self, settings):
+        settings.SSO_LOGIN_LOG_SUCCESS_SAMPLE_RATE = {"google": 0, "*": 1}
+        assert login_stats.should_log_success("google") is False
+        assert login_stats.should_log_success("github") is True
+
+    def test_fractional_rate_samples(self, settings):
+        settings.SSO_LOGIN_LOG_SUCCESS_SAMPLE_RATE = 0.1
+        with patch("company_sso_core.services.login_stats.random.random", side_effect=[0.05, 0.5]):
+            assert login_stats.should_log_success("google") is True
+            assert login_stats.should_log_success("google") is False
+
+
+@pytest.mark.django_db
+class TestLoginLogSampling:
+    """OAuthService always logs failures and samples successes."""
+
+    def test_unsampled_success_still_counted(self, settings):
+        settings.SSO_LOGIN_LOG_SUCCESS_SAMPLE_RATE = 0
+        _login("a")
+        _login("b")
+        assert not SSOLoginLog.objects.exists()
+        assert login_stats.flush_login_stats() == 2
+        stat = SSOLoginStat.objects.get()
+        assert (stat.provider_slug, stat.day, stat.success_count) == ("google", timezone.now().date(), 2)
+
+    def test_failures_always_logged(self, settings):
+        settings.SSO_LOGIN_LOG_SUCCESS_SAMPLE_RATE = 0
+        provider = MagicMock()
+        provider.exchange_code.side_effect = Exception("boom")
+        with patch("company_sso_core.services.oauth_service.get_provider", return_value=provider):
+            with pytest.raises(Exception):
+                OAuthService().login("google", "code", "https://app.com/cb")
+        assert SSOLoginLog.objects.filter(status="failed").count() == 1
+        assert login_stats.flush_login_stats() == 0
+
+    def test_counters_can_be_disabled(self, settings):
+        settings.SSO_LOGIN_SUCCESS_COUNTERS = False
+        _login()
+        assert login_stats.flush_login_stats() == 0
+
+
+@pytest.mark.django_db
+class TestFlush:
+    """flush_login_stats() moves counters into SSOLoginStat exactly once."""
+
+    def test_flush_accumulates_and_resets(self):
+        for _ in range(3):
+            login_stats.record_success("github")
+        assert login_stats.flush_login_stats() == 3
+        assert login_stats.flush_login_stats() == 0
+        login_stats.record_success("github")
+        login_stats.flush_login_stats()
+        assert SSOLoginStat.objects.get(provider_slug="github").success_count == 4
+
+    def test_increments_during_flush_are_kept(self):
+        login_stats.record_success("github")
+        real_add = login_stats._add_to_stat
+
+        def add_and_race(*args):
+            real_add(*args)
+            login_stats.record_success("github")  # lands between the read and the decrement
+
+        with patch.object(login_stats, "_add_to_stat", side_effect=add_and_race):
+            assert login_stats.flush_login_stats() == 1
+        assert login_stats.flush_login_stats() == 1
+        assert SSOLoginStat.objects.get().success_count == 2
+
+    def test_concurrent_flush_skipped(self):
+        login_stats.record_success("github")
+        get_cache().add(login_stats._FLUSH_LOCK_KEY, 1)  # another flush holds the lock
+        assert login_stats.flush_login_stats() == 0
+        get_cache().delete(login_stats._FLUSH_LOCK_KEY)
+        assert login_stats.flush_login_stats() == 1
+        assert SSOLoginStat.objects.get().success_count == 1
+
+    def test_failed_write_gives_counts_back(self):
+        login_stats.record_success("github")
+        with patch.object(login_stats, "_add_to_stat", side_effect=DatabaseError("down")):
+            with pytest.raises(DatabaseError):
+                login_stats.flush_login_stats()
+        assert login_stats.flush_login_stats() == 1
+        assert SSOLoginStat.objects.get().success_count == 1
+
+    def test_command(self):
+        login_stats.record_success("github")
+        out = StringIO()
+        with patch(
+            "company_sso_core.management.commands.sso_flush_login_stats.is_process_local",
+            return_value=False,
+        ):
+            call_command("sso_flush_login_stats", stdout=out)
+        assert "Flushed 1" in out.getvalue()
+        key = login_stats._counter_key("github", timezone.now().date())
+        assert get_cache().get(key) == 0
+
+    def test_command_refuses_process_local_cache(self):
+        login_stats.record_success("github")
+        with pytest.raises(CommandError, match="process-local"):
+            call_command("sso_flush_login_stats")
+        assert not SSOLoginStat.objects.exists()
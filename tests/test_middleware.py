@@ -0,0 +1,70 @@
+"""Tests for SSOWorkspaceMiddleware (sync and async)."""
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from asgiref.sync import iscoroutinefunction
+from django.test import RequestFactory
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from company_sso_core.middleware import SSOWorkspaceMiddleware
+
+SSO_PATH = "/api/v1/sso/login/google/"
+
+
+def _sync_view(request):
+    return getattr(request, "workspace_id", "unset")
+
+
+async def _async_view(request):
+    return getattr(request, "workspace_id", "unset")
+
+
+class TestSSOWorkspaceMiddleware:
+    def test_header_parsed_on_sso_routes(self, settings):
+        settings.SSO_WORKSPACE_HEADER = "X-Workspace-Id"
+        mw = SSOWorkspaceMiddleware(_sync_view)
+        assert mw(RequestFactory().post(SSO_PATH, HTTP_X_WORKSPACE_ID="7")) == 7
+        assert mw(RequestFactory().post(SSO_PATH, HTTP_X_WORKSPACE_ID="x")) is None
+
+    def test_other_routes_untouched(self, settings):
+        settings.SSO_WORKSPACE_HEADER = "X-Workspace-Id"
+        mw = SSOWorkspaceMiddleware(_sync_view)
+        assert mw(RequestFactory().get("/admin/", HTTP_X_WORKSPACE_ID="7")) == "unset"
+
+    def test_without_header_setting_defaults_to_none(self):
+        mw = SSOWorkspaceMiddleware(_sync_view)
+        assert mw(RequestFactory().post(SSO_PATH)) is None
+
+    def test_setting_read_once(self, settings):
+        settings.SSO_WORKSPACE_HEADER = "X-Workspace-Id"
+        mw = SSOWorkspaceMiddleware(_sync_view)
+        with patch("company_sso_core.middleware.get_setting") as get_setting:
+            mw(RequestFactory().post(SSO_PATH, HTTP_X_WORKSPACE_ID="1"))
+        get_setting.assert_not_called()
+        assert mw.meta_key == "HTTP_X_WORKSPACE_ID"
+
+    def test_async_chain_stays_async(self, settings):
+        settings.SSO_WORKSPACE_HEADER = "X-Workspace-Id"
+        mw = SSOWorkspaceMiddleware(_async_view)
+        assert iscoroutinefunction(mw)
+        request = RequestFactory().post(SSO_PATH, HTTP_X_WORKSPACE_ID="3")
+        assert asyncio.run(mw(request)) == 3
+
+    def test_sync_chain_is_not_coroutine(self):
+        assert not iscoroutinefunction(SSOWorkspaceMiddleware(_sync_view))
+
+
+@pytest.mark.django_db
+class TestLoginUsesMiddlewareWorkspace:
+    def test_header_workspace_used_when_body_has_none(self, settings):
+        settings.SSO_WORKSPACE_HEADER = "X-Workspace-Id"
+        settings.MIDDLEWARE = ["company_sso_core.middleware.SSOWorkspaceMiddleware"]
+        with patch("company_sso_core.views.OAuthService") as MockService:
+            MockService.return_value.login.return_value = (None, {"access": "a"})
+            url = reverse("sso_api:login", kwargs={"provider": "google"})
+            APIClient().post(url, {"code": "c"}, format="json", HTTP_X_WORKSPACE_ID="5")
+            assert MockService.return_value.login.call_args.kwargs["workspace"] == 5
+            APIClient().post(url, {"code": "c", "workspace_id": 9}, format="json", HTTP_X_WORKSPACE_ID="5")
+            assert MockService.return_value.login.call_args.kwargs["workspace"] == 9
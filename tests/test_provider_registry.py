@@ -54,3 +54,20 @@ class TestProviderRegistry:
         assert "facebook" in slugs
         assert "microsoft" in slugs
         assert "linkedin" in slugs
+
+    def test_registry_loads_manifest_modules(self):
+        """get_provider_registry() imports every dedicated provider listed in the manifest."""
+        import sys
+        from company_sso_core.providers import manifest
+
+        assert set(manifest.DEDICATED_PROVIDER_MODULES) <= set(get_provider_registry())
+        for module in manifest.DEDICATED_PROVIDER_MODULES.values():
+            assert module in sys.modules
+
+    def test_is_supported_provider(self):
+        """Manifest and registry slugs are supported; anything else is not."""
+        from company_sso_core.providers import is_supported_provider
+
+        assert is_supported_provider("google")
+        assert is_supported_provider("okta")
+        assert not is_supported_provider("unknown_slug")
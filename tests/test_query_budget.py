@@ -0,0 +1,137 @@
+"""Query budgets for every SSO entry point; an extra query fails with the SQL listed."""
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory
+
+from company_sso_core.exceptions import ProviderDisabledError, ProviderNotConfiguredError
+from company_sso_core.models import SocialAccount, SocialProvider, SSOLoginLog, SSOLoginStat
+from company_sso_core.services.credential_loader import get_provider_credentials
+from company_sso_core.services.oauth_service import OAuthService
+from company_sso_core.testing import QueryBudgetExceeded
+from company_sso_core.utils import get_authorization_url
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestQueryBudgetHelper:
+    def test_mismatch_lists_sql(self, query_budget):
+        with pytest.raises(QueryBudgetExceeded) as exc:
+            with query_budget(0):
+                list(SocialProvider.objects.all())
+        message = str(exc.value)
+        assert "Expected 0 queries, got 1" in message
+        assert "1. [default] SELECT" in message
+
+    def test_duplicates_flagged(self, query_budget):
+        with pytest.raises(QueryBudgetExceeded) as exc:
+            with query_budget(2):
+                SocialProvider.objects.count()
+                SocialProvider.objects.count()
+        assert "Repeated:" in str(exc.value)
+        with query_budget(2, allow_duplicates=True):
+            SocialProvider.objects.count()
+            SocialProvider.objects.count()
+
+
+@pytest.mark.django_db
+class TestCredentialQueries:
+    def test_db_row(self, query_budget):
+        SocialProvider.objects.create(slug="github", name="GH", client_id="i", client_secret="s")
+        with query_budget(1):
+            get_provider_credentials("github")
+
+    def test_settings_fallback(self, query_budget):
+        with query_budget(1):
+            get_provider_credentials("google")
+
+    def test_unsupported_and_negative_cached_hit_no_db(self, query_budget):
+        with pytest.raises(ProviderNotConfiguredError):
+            get_provider_credentials("github")
+        with query_budget(0):
+            with pytest.raises(ProviderNotConfiguredError):
+                get_provider_credentials("github")
+            with pytest.raises(ProviderNotConfiguredError):
+                get_provider_credentials("not-a-provider")
+
+    def test_authorization_url(self, query_budget):
+        with query_budget(1):
+            get_authorization_url("google", "https://app.com/cb")
+
+
+@pytest.mark.django_db
+class TestLoginQueries:
+    """Provider row (disabled check + credentials + log id), user resolution, log insert."""
+
+    def _login(self):
+        provider = MagicMock()
+        provider.exchange_code.return_value = {"access_token": "at"}
+        provider.get_user_info.return_value = {"id": "1", "email": "u@test.com"}
+        with patch("company_sso_core.services.oauth_service.get_provider", return_value=provider):
+            return OAuthService().login("google", "code", "https://app.com/cb")
+
+    def test_returning_user_with_db_provider(self, query_budget):
+        SocialProvider.objects.create(slug="google", name="G", client_id="i", client_secret="s")
+        User.objects.create_user("u@test.com", email="u@test.com")
+        with query_budget(3):
+            self._login()
+        assert SSOLoginLog.objects.get().provider.slug == "google"
+
+    def test_returning_user_with_settings_provider(self, query_budget):
+        User.objects.create_user("u@test.com", email="u@test.com")
+        with query_budget(3):
+            self._login()
+
+    def test_unsampled_success_skips_log_insert(self, query_budget, settings):
+        settings.SSO_LOGIN_LOG_SUCCESS_SAMPLE_RATE = 0
+        User.objects.create_user("u@test.com", email="u@test.com")
+        with query_budget(2):
+            self._login()
+
+    def test_disabled_provider_stops_after_lookup_and_log(self, query_budget):
+        SocialProvider.objects.create(slug="google", name="G", client_id="i", client_secret="s", is_active=False)
+        with query_budget(2):
+            with pytest.raises(ProviderDisabledError):
+                self._login()
+
+
+@pytest.mark.django_db
+class TestAdminChangelistQueries:
+    """Changelists stay flat as rows grow (no per-row queries)."""
+
+    @pytest.fixture
+    def superuser_request(self):
+        request = RequestFactory().get("/")
+        request.user = User.objects.create_superuser("admin", "admin@test.com", "x")
+        return request
+
+    @pytest.fixture(autouse=True)
+    def rows(self):
+        for i in range(3):
+            user = User.objects.create_user(f"user{i}")
+            SSOLoginLog.objects.create(provider_slug="google", status="success", user=user)
+            SocialAccount.objects.create(user=user, provider_slug="google", external_id=str(i))
+            SocialProvider.objects.create(
+                slug="okta",
+                name="O",
+                client_id="i",
+                client_secret="s",
+                workspace_id=i,
+                extra_config={"domain": "https://acme.okta.com"},
+            )
+        SSOLoginStat.objects.create(provider_slug="google", day="2024-01-01", success_count=3)
+
+    def _render(self, model, request):
+        admin.site._registry[model].changelist_view(request).render()
+
+    @pytest.mark.parametrize(
+        "model, queries",
+        # Provider-slug filter choices come from the registry, so no DISTINCT query.
+        [(SSOLoginLog, 4), (SocialAccount, 2), (SSOLoginStat, 4), (SocialProvider, 2)],
+    )
+    def test_changelist(self, model, queries, superuser_request, query_budget):
+        with query_budget(queries):
+            self._render(model, superuser_request)
@@ -0,0 +1,73 @@
+"""Tests for replica reads of SocialProvider with read-your-writes pinning."""
+import pytest
+
+from django.core.cache import cache
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+from company_sso_core.exceptions import ProviderDisabledError
+from company_sso_core.models import SocialProvider
+from company_sso_core.services import provider_cache
+from company_sso_core.services.credential_loader import get_provider_credentials
+from company_sso_core.services.oauth_service import OAuthService
+
+
+def _touched(ctx) -> bool:
+    return any("company_sso_core_socialprovider" in q["sql"] for q in ctx.captured_queries)
+
+
+@pytest.fixture(autouse=True)
+def _read_alias(settings):
+    settings.SSO_READ_DATABASE = "sso_read"
+
+
+@pytest.mark.django_db(databases=["default", "sso_read"], transaction=True)
+class TestReadYourWrites:
+    """After a SocialProvider write, reads for that (slug, workspace) go to the primary."""
+
+    def test_write_pins_reads_to_primary(self):
+        SocialProvider.objects.create(slug="google", name="Google", client_id="db_id", client_secret="s")
+        assert provider_cache.is_pinned_to_primary("google", None)
+        with CaptureQueriesContext(connections["default"]) as primary, CaptureQueriesContext(
+            connections["sso_read"]
+        ) as replica:
+            get_provider_credentials("google")
+        assert _touched(primary)
+        assert not _touched(replica)
+
+    def test_unpinned_reads_use_replica(self):
+        SocialProvider.objects.create(slug="google", name="Google", client_id="db_id", client_secret="s")
+        cache.clear()
+        with CaptureQueriesContext(connections["sso_read"]) as replica:
+            get_provider_credentials("google")
+        assert _touched(replica)
+
+    def test_pin_is_per_slug_and_workspace(self):
+        SocialProvider.objects.create(
+            slug="google", name="Google", client_id="ws", client_secret="s", workspace_id=5
+        )
+        assert provider_cache.is_pinned_to_primary("google", 5)
+        assert not provider_cache.is_pinned_to_primary("google", None)
+
+    def test_disable_takes_effect_immediately(self):
+        provider = SocialProvider.objects.create(
+            slug="google", name="Google", client_id="db_id", client_secret="s"
+        )
+        cache.clear()
+        provider.is_active = False
+        provider.save()
+        with pytest.raises(ProviderDisabledError):
+            OAuthService().login("google", "code", "https://app.com/cb")
+
+    def test_generation_bumps_on_each_write(self):
+        provider = SocialProvider.objects.create(
+            slug="google", name="Google", client_id="db_id", client_secret="s"
+        )
+        first = provider_cache.provider_generation("google", None)
+        provider.delete()
+        assert provider_cache.provider_generation("google", None) == first + 1
+
+    def test_pinning_can_be_disabled(self, settings):
+        settings.SSO_READ_PIN_SECONDS = 0
+        SocialProvider.objects.create(slug="google", name="Google", client_id="db_id", client_secret="s")
+        assert not provider_cache.is_pinned_to_primary("google", None)
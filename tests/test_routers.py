@@ -0,0 +1,110 @@
+"""Tests for SSODatabaseRouter: logs on their own database, provider reads on a read alias."""
+import pytest
+from unittest.mock import patch, MagicMock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connections, router
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from company_sso_core.models import SocialProvider, SSOLoginLog, SSOLoginStat
+from company_sso_core.routers import SSODatabaseRouter
+from company_sso_core.services.credential_loader import get_provider_credentials
+from company_sso_core.services.oauth_service import OAuthService
+
+ROUTED = override_settings(
+    DATABASE_ROUTERS=["company_sso_core.routers.SSODatabaseRouter"],
+    SSO_LOG_DATABASE="sso_logs",
+    SSO_READ_DATABASE="sso_read",
+)
+
+
+class TestRouterDecisions:
+    """Routing decisions without touching a database."""
+
+    @ROUTED
+    def test_routes(self):
+        assert router.db_for_write(SSOLoginLog) == "sso_logs"
+        assert router.db_for_read(SSOLoginLog) == "sso_logs"
+        assert router.db_for_write(SSOLoginStat) == "sso_logs"
+        assert router.db_for_read(SocialProvider) == "sso_read"
+        assert router.db_for_write(SocialProvider) == "default"
+        assert router.db_for_read(get_user_model()) == "default"
+
+    @ROUTED
+    def test_allow_migrate(self):
+        r = SSODatabaseRouter()
+        assert r.allow_migrate("sso_logs", "company_sso_core", "ssologinlog") is True
+        assert r.allow_migrate("default", "company_sso_core", "ssologinlog") is False
+        assert r.allow_migrate("sso_logs", "company_sso_core", "ssologinstat") is True
+        assert r.allow_migrate("sso_logs", "company_sso_core", "socialprovider") is False
+        assert r.allow_migrate("default", "company_sso_core", "socialprovider") is None
+        assert r.allow_migrate("sso_logs", "auth", "user") is None
+
+    def test_noop_without_settings(self):
+        r = SSODatabaseRouter()
+        assert r.db_for_write(SSOLoginLog) == "default"
+        assert r.allow_migrate("sso_logs", "company_sso_core", "ssologinlog") is None
+
+
+# transaction=True: the sso_read mirror is a second connection to the same SQLite
+# database and cannot read rows held in default's open test transaction.
+@pytest.mark.django_db(databases=["default", "sso_logs", "sso_read"], transaction=True)
+class TestRoutedLogin:
+    """A login writes its log to the log database with denormalized ids."""
+
+    @ROUTED
+    @patch("company_sso_core.services.oauth_service.get_provider")
+    def test_log_written_to_log_database(self, mock_get_provider):
+        provider = SocialProvider.objects.create(
+            slug="google", name="Google", client_id="db_id", client_secret="s"
+        )
+        mock_provider = MagicMock()
+        mock_provider.exchange_code.return_value = {"access_token": "at"}
+        mock_provider.get_user_info.return_value = {"id": "1", "email": "routed@test.com"}
+        mock_get_provider.return_value = mock_provider
+
+        user, _ = OAuthService().login("google", "code", "https://app.com/cb")
+
+        assert not SSOLoginLog.objects.using("default").exists()
+        log = SSOLoginLog.objects.get()
+        assert log._state.db == "sso_logs"
+        assert log.provider_id == provider.pk
+        assert log.user_id == user.pk
+        # Related rows resolve from their own database.
+        assert log.user == user
+        assert log.provider == provider
+
+    @ROUTED
+    def test_credentials_read_from_read_alias(self):
+        SocialProvider.objects.create(slug="google", name="Google", client_id="db_id", client_secret="s")
+        cache.clear()  # the write pins reads to the primary; simulate the pin expiring
+        with CaptureQueriesContext(connections["sso_read"]) as read_queries:
+            assert get_provider_credentials("google")["client_id"] == "db_id"
+        assert any("company_sso_core_socialprovider" in q["sql"] for q in read_queries.captured_queries)
+
+
+@pytest.mark.django_db(databases=["default", "sso_logs"])
+class TestDeletesWithSeparateLogDatabase:
+    """Deleting a user or provider never queries the log table on the default database."""
+
+    @pytest.fixture(autouse=True)
+    def log_table_only_on_log_database(self):
+        # As after `migrate` with the router: the test transaction restores the table.
+        with connections["default"].cursor() as cursor:
+            cursor.execute(f"DROP TABLE {SSOLoginLog._meta.db_table}")
+
+    @ROUTED
+    def test_delete_user_and_provider(self):
+        user = get_user_model().objects.create_user("gone@test.com")
+        provider = SocialProvider.objects.create(slug="google", name="G", client_id="i", client_secret="s")
+        SSOLoginLog.objects.create(provider=provider, provider_slug="google", user=user, status="success")
+        ids = (user.pk, provider.pk)
+
+        user.delete()
+        provider.delete()
+
+        log = SSOLoginLog.objects.get()
+        assert log._state.db == "sso_logs"
+        assert (log.user_id, log.provider_id) == ids
@@ -0,0 +1,157 @@
+"""Tests for concurrent secondary profile fetches (GitHub emails, Facebook picture)."""
+import json
+import threading
+import time
+
+import pytest
+from unittest.mock import patch, MagicMock
+
+from company_sso_core.providers import http
+from company_sso_core.providers.facebook import FacebookOAuthProvider
+from company_sso_core.providers.github import GitHubOAuthProvider
+
+
+def _response(payload, delay=0.0):
+    def fetch(*args, **kwargs):
+        time.sleep(delay)
+        return MagicMock(content=json.dumps(payload).encode())
+
+    return fetch
+
+
+def _router(routes):
+    """Fake http.get dispatching on URL."""
+
+    def get(url, **kwargs):
+        return routes[url](url, **kwargs)
+
+    return get
+
+
+class TestRunConcurrently:
+    """http.run_concurrently overlaps primary and secondary calls."""
+
+    def test_overlaps(self):
+        started = time.perf_counter()
+        result, extras = http.run_concurrently(
+            lambda: time.sleep(0.2) or "primary", {"a": lambda: time.sleep(0.2) or "a"}
+        )
+        assert result == "primary"
+        assert extras == {"a": "a"}
+        assert time.perf_counter() - started < 0.35
+
+    def test_failed_secondary_is_dropped(self):
+        def boom():
+            raise RuntimeError("down")
+
+        result, extras = http.run_concurrently(lambda: 1, {"bad": boom, "ok": lambda: 2})
+        assert result == 1
+        assert extras == {"ok": 2}
+
+    def test_primary_error_propagates(self):
+        def boom():
+            raise RuntimeError("primary down")
+
+        with pytest.raises(RuntimeError):
+            http.run_concurrently(boom, {"a": lambda: 1})
+
+
+@pytest.fixture
+def one_worker(settings):
+    """A fresh one-worker fetch pool, shut down after the test."""
+    settings.SSO_PROVIDER_FETCH_WORKERS = 1
+    http._pool = None
+    yield
+    pool, http._pool = http._pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+class TestSaturatedPool:
+    """A busy pool neither delays other logins nor is waited on past the timeout."""
+
+    def test_slow_fetch_dropped_and_next_runs_inline(self, one_worker, settings):
+        settings.SSO_PROVIDER_FETCH_TIMEOUT = 0.1
+        release = threading.Event()
+        try:
+            started = time.perf_counter()
+            result, extras = http.run_concurrently(lambda: "slow idp", {"slow": release.wait})
+            assert time.perf_counter() - started < 0.5
+            assert (result, extras) == ("slow idp", {})
+
+            # The only worker is still held by the slow fetch: this one runs in the caller.
+            started = time.perf_counter()
+            result, extras = http.run_concurrently(
+                lambda: "github", {"emails": lambda: threading.current_thread().name}
+            )
+            assert time.perf_counter() - started < 0.5
+            assert (result, extras) == ("github", {"emails": threading.current_thread().name})
+        finally:
+            release.set()
+
+    def test_worker_freed_after_fetch(self, one_worker):
+        for _ in range(3):
+            _, extras = http.run_concurrently(
+                lambda: None, {"name": lambda: threading.current_thread().name}
+            )
+            assert extras["name"].startswith("sso-fetch")
+
+
+class TestGitHubEmails:
+    """GitHub fetches /user/emails alongside /user by default."""
+
+    def test_private_email_resolved_from_concurrent_fetch(self):
+        provider = GitHubOAuthProvider({})
+        routes = {
+            provider.user_info_url: _response({"id": 1, "login": "octo", "email": None}, delay=0.15),
+            provider.emails_url: _response(
+                [{"email": "other@x.com", "primary": False}, {"email": "octo@x.com", "primary": True}],
+                delay=0.15,
+            ),
+        }
+        with patch("company_sso_core.providers.http.get", side_effect=_router(routes)):
+            started = time.perf_counter()
+            out = provider.get_user_info("at")
+            elapsed = time.perf_counter() - started
+        assert out["email"] == "octo@x.com"
+        assert out["name"] == "octo"
+        assert elapsed < 0.28
+
+    def test_public_email_wins(self):
+        provider = GitHubOAuthProvider({})
+        routes = {
+            provider.user_info_url: _response({"id": 1, "login": "octo", "email": "public@x.com"}),
+            provider.emails_url: _response([{"email": "octo@x.com", "primary": True}]),
+        }
+        with patch("company_sso_core.providers.http.get", side_effect=_router(routes)):
+            assert provider.get_user_info("at")["email"] == "public@x.com"
+
+    def test_disabled_via_extra_config(self):
+        provider = GitHubOAuthProvider({"extra_config": {"fetch_emails": False}})
+        calls = []
+        lock = threading.Lock()
+
+        def get(url, **kwargs):
+            with lock:
+                calls.append(url)
+            return MagicMock(content=b'{"id": 1, "login": "octo", "email": null}')
+
+        with patch("company_sso_core.providers.http.get", side_effect=get):
+            out = provider.get_user_info("at")
+        assert calls == [provider.user_info_url]
+        assert out["email"] == ""
+
+
+class TestFacebookPicture:
+    """Facebook large picture is an opt-in concurrent fetch."""
+
+    def test_large_picture(self):
+        provider = FacebookOAuthProvider({"extra_config": {"large_picture": True}})
+        routes = {
+            provider.user_info_url: _response(
+                {"id": "7", "name": "F", "email": "f@x.com", "picture": {"data": {"url": "small"}}}
+            ),
+            provider.picture_url: _response({"data": {"url": "large"}}),
+        }
+        with patch("company_sso_core.providers.http.get", side_effect=_router(routes)):
+            assert provider.get_user_info("at")["picture"] == "large"
@@ -0,0 +1,144 @@
+"""Tests for client_secret encryption at rest and the decrypted-secret cache."""
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from unittest.mock import patch
+
+from company_sso_core import crypto
+from company_sso_core.exceptions import ProviderNotConfiguredError
+from company_sso_core.models import SocialProvider
+from company_sso_core.services.credential_loader import get_provider_credentials
+
+Fernet = pytest.importorskip("cryptography.fernet").Fernet
+
+
+def _stored_secret(pk):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT client_secret FROM company_sso_core_socialprovider WHERE id = %s", [pk])
+        return cursor.fetchone()[0]
+
+
+@pytest.fixture
+def secret_keys(settings):
+    settings.SSO_SECRET_KEYS = [Fernet.generate_key().decode()]
+    crypto.clear_secret_cache()
+    yield settings
+    crypto.clear_secret_cache()
+
+
+def _provider(secret="db_client_secret"):
+    return SocialProvider.objects.create(slug="google", name="Google", client_id="cid", client_secret=secret)
+
+
+@pytest.mark.django_db
+class TestEncryptedSecret:
+    """Secrets are encrypted on save and decrypted on the credential path."""
+
+    def test_stored_encrypted(self, secret_keys):
+        provider = _provider()
+        stored = _stored_secret(provider.pk)
+        assert stored.startswith(crypto.PREFIX)
+        assert "db_client_secret" not in stored
+
+    def test_loaded_instance_keeps_token(self, secret_keys):
+        provider = _provider()
+        assert SocialProvider.objects.get(pk=provider.pk).client_secret == _stored_secret(provider.pk)
+
+    def test_credentials_decrypted(self, secret_keys):
+        _provider()
+        assert get_provider_credentials("google")["client_secret"] == "db_client_secret"
+
+    def test_plaintext_without_keys(self, settings):
+        settings.SSO_SECRET_KEYS = None
+        provider = _provider()
+        assert _stored_secret(provider.pk) == "db_client_secret"
+        assert get_provider_credentials("google")["client_secret"] == "db_client_secret"
+
+    def test_legacy_plaintext_row_still_readable(self, secret_keys):
+        provider = _provider()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "UPDATE company_sso_core_socialprovider SET client_secret = %s WHERE id = %s",
+                ["legacy", provider.pk],
+            )
+        assert get_provider_credentials("google")["client_secret"] == "legacy"
+
+    def test_unknown_key_is_not_configured(self, secret_keys):
+        _provider()
+        secret_keys.SSO_SECRET_KEYS = [Fernet.generate_key().decode()]
+        crypto.clear_secret_cache()
+        with pytest.raises(ProviderNotConfiguredError):
+            get_provider_credentials("google")
+
+    def test_old_key_still_decrypts(self, secret_keys):
+        _provider()
+        old = secret_keys.SSO_SECRET_KEYS[0]
+        secret_keys.SSO_SECRET_KEYS = [Fernet.generate_key().decode(), old]
+        crypto.clear_secret_cache()
+        assert get_provider_credentials("google")["client_secret"] == "db_client_secret"
+
+    def test_rotate_command(self, secret_keys):
+        provider = _provider()
+        old = secret_keys.SSO_SECRET_KEYS[0]
+        new = Fernet.generate_key().decode()
+        secret_keys.SSO_SECRET_KEYS = [new, old]
+        call_command("sso_rotate_secrets", stdout=StringIO())
+        secret_keys.SSO_SECRET_KEYS = [new]
+        crypto.clear_secret_cache()
+        assert get_provider_credentials("google")["client_secret"] == "db_client_secret"
+        assert _stored_secret(provider.pk).startswith(crypto.PREFIX)
+
+
+@pytest.mark.django_db
+class TestDecryptedSecretCache:
+    """Logins decrypt a given stored secret once per process."""
+
+    def test_decrypts_once(self, secret_keys):
+        _provider()
+        with patch.object(crypto, "_decrypt", wraps=crypto._decrypt) as decrypt:
+            for _ in range(3):
+                get_provider_credentials("google")
+        assert decrypt.call_count == 1
+
+    def test_new_secret_is_decrypted(self, secret_keys):
+        provider = _provider()
+        get_provider_credentials("google")
+        provider.client_secret = "rotated_secret"
+        provider.save()
+        assert get_provider_credentials("google")["client_secret"] == "rotated_secret"
+
+    def test_cache_disabled(self, secret_keys):
+        secret_keys.SSO_SECRET_CACHE_TTL = 0
+        _provider()
+        with patch.object(crypto, "_decrypt", wraps=crypto._decrypt) as decrypt:
+            get_provider_credentials("google")
+            get_provider_credentials("google")
+        assert decrypt.call_count == 2
+
+    def test_bounded(self):
+        cache = crypto.DecryptedSecretCache(ttl=60, max_entries=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")
+        cache.set("c", "3")
+        assert len(cache) == 2
+        assert cache.get("b") is None
+        assert cache.get("a") == "1"
+
+    def test_expires(self):
+        cache = crypto.DecryptedSecretCache(ttl=10, max_entries=2)
+        with patch("company_sso_core.crypto.time.monotonic", return_value=100.0):
+            cache.set("a", "1")
+        with patch("company_sso_core.crypto.time.monotonic", return_value=111.0):
+            assert cache.get("a") is None
+
+    def test_not_in_shared_cache(self, secret_keys):
+        from django.core.cache import cache
+
+        _provider()
+        with patch.object(cache, "set") as cache_set, patch.object(cache, "set_many") as set_many:
+            get_provider_credentials("google")
+        written = repr(cache_set.call_args_list) + repr(set_many.call_args_list)
+        assert "db_client_secret" not in written
@@ -0,0 +1,200 @@
+"""Tests for sso_login_success / sso_login_failed emission and async delivery."""
+import threading
+import time
+
+import pytest
+from unittest.mock import patch, MagicMock
+
+from company_sso_core import signals
+from company_sso_core.exceptions import (
+    AuthorizationCodeReusedError,
+    InvalidStateError,
+    OAuthProviderError,
+    ProviderBusyError,
+    ProviderDisabledError,
+    ProviderNotConfiguredError,
+)
+from company_sso_core.models import SocialProvider, SSOLoginLog
+from company_sso_core.services import singleflight
+from company_sso_core.services.oauth_service import OAuthService
+from company_sso_core.signals import send_sso_signal, sso_login_failed, sso_login_success
+
+
+@pytest.fixture
+def captured():
+    events = []
+
+    def on_success(sender, **kwargs):
+        events.append(("success", kwargs))
+
+    def on_failed(sender, **kwargs):
+        events.append(("failed", kwargs))
+
+    sso_login_success.connect(on_success, weak=False)
+    sso_login_failed.connect(on_failed, weak=False)
+    yield events
+    sso_login_success.disconnect(on_success)
+    sso_login_failed.disconnect(on_failed)
+
+
+@pytest.fixture
+def fresh_dispatcher():
+    signals._dispatcher = None
+    yield
+    signals._dispatcher = None
+
+
+@pytest.mark.django_db
+class TestLoginSignals:
+    """OAuthService.login sends signals with provider, workspace, stage and latency."""
+
+    @patch("company_sso_core.services.oauth_service.get_provider")
+    def test_success_signal(self, mock_get_provider, captured):
+        mock_provider = MagicMock()
+        mock_provider.exchange_code.return_value = {"access_token": "at"}
+        mock_provider.get_user_info.return_value = {"id": "1", "email": "sig@test.com"}
+        mock_get_provider.return_value = mock_provider
+        user, _ = OAuthService().login("google", "code-ok", "https://app.com/cb")
+        assert len(captured) == 1
+        kind, kwargs = captured[0]
+        assert kind == "success"
+        assert kwargs["user"] == user
+        assert kwargs["provider_slug"] == "google"
+        assert kwargs["workspace"] is None
+        assert kwargs["created"] is True
+        assert kwargs["latency_ms"] >= 0
+
+    @patch("company_sso_core.services.oauth_service.get_provider")
+    def test_failed_signal_carries_stage(self, mock_get_provider, captured):
+        mock_provider = MagicMock()
+        mock_provider.exchange_code.side_effect = Exception("invalid_grant")
+        mock_get_provider.return_value = mock_provider
+        with pytest.raises(OAuthProviderError):
+            OAuthService().login("google", "code-bad", "https://app.com/cb")
+        kind, kwargs = captured[0]
+        assert kind == "failed"
+        assert kwargs["stage"] == "exchange_code"
+        assert kwargs["error"] == "invalid_grant"
+
+    def _failure(self, captured):
+        assert [kind for kind, _ in captured] == ["failed"]
+        return captured[0][1]
+
+    def test_disabled_provider_sends_failed(self, captured):
+        provider = SocialProvider.objects.create(
+            slug="google", name="G", client_id="i", client_secret="s", is_active=False
+        )
+        with pytest.raises(ProviderDisabledError):
+            OAuthService().login("google", "code", "https://app.com/cb")
+        assert self._failure(captured)["stage"] == "provider"
+        assert SSOLoginLog.objects.get().provider_id == provider.pk
+
+    def test_not_configured_sends_failed(self, captured):
+        with pytest.raises(ProviderNotConfiguredError):
+            OAuthService().login("github", "code", "https://app.com/cb")
+        assert self._failure(captured)["stage"] == "provider"
+        assert SSOLoginLog.objects.get().status == "failed"
+
+    def test_settings_provider_with_unfilled_endpoint_sends_failed(self, captured, settings):
+        settings.SSO_PROVIDERS = {"okta": {"client_id": "i", "client_secret": "s"}}  # no domain
+        with pytest.raises(ProviderNotConfiguredError):
+            OAuthService().login("okta", "code", "https://app.com/cb")
+        failure = self._failure(captured)
+        assert failure["stage"] == "provider"
+        assert "domain" in failure["error"]
+        assert SSOLoginLog.objects.get().status == "failed"
+
+    def test_unknown_slug_sends_failed_without_log_row(self, captured):
+        with pytest.raises(ProviderNotConfiguredError):
+            OAuthService().login("not-a-provider", "code", "https://app.com/cb")
+        assert self._failure(captured)["stage"] == "provider"
+        assert not SSOLoginLog.objects.exists()
+
+    def test_invalid_signed_state_sends_failed(self, captured, settings):
+        settings.SSO_STATE_SIGNED = True
+        with pytest.raises(InvalidStateError):
+            OAuthService().login("google", "code", "https://app.com/cb", state="forged")
+        assert self._failure(captured)["stage"] == "state"
+        assert SSOLoginLog.objects.get().status == "failed"
+
+    def test_rejected_host_state_sends_failed(self, captured, settings):
+        settings.SSO_VALIDATE_STATE = lambda state, request: False
+        with pytest.raises(InvalidStateError):
+            OAuthService().login("google", "code", "https://app.com/cb", state="s")
+        assert self._failure(captured)["stage"] == "state"
+
+    def test_reused_code_sends_failed(self, captured):
+        singleflight.mark_consumed(singleflight.code_key("google", None, "used"))
+        with pytest.raises(AuthorizationCodeReusedError):
+            OAuthService().login("google", "used", "https://app.com/cb")
+        assert self._failure(captured)["stage"] == "code"
+
+    @patch("company_sso_core.services.oauth_service.get_provider")
+    def test_busy_provider_sends_failed(self, mock_get_provider, captured):
+        with patch(
+            "company_sso_core.services.oauth_service.provider_slot",
+            side_effect=ProviderBusyError(),
+        ):
+            with pytest.raises(ProviderBusyError):
+                OAuthService().login("google", "code", "https://app.com/cb")
+        assert self._failure(captured)["stage"] == "bulkhead"
+        mock_get_provider.return_value.exchange_code.assert_not_called()
+
+    @patch("company_sso_core.services.oauth_service.get_provider")
+    def test_failing_receiver_does_not_break_login(self, mock_get_provider):
+        mock_provider = MagicMock()
+        mock_provider.exchange_code.return_value = {"access_token": "at"}
+        mock_provider.get_user_info.return_value = {"id": "1", "email": "r@test.com"}
+        mock_get_provider.return_value = mock_provider
+
+        def broken(sender, **kwargs):
+            raise RuntimeError("receiver down")
+
+        sso_login_success.connect(broken, weak=False)
+        try:
+            user, _ = OAuthService().login("google", "code-r", "https://app.com/cb")
+        finally:
+            sso_login_success.disconnect(broken)
+        assert user.email == "r@test.com"
+
+
+class TestAsyncDelivery:
+    """SSO_SIGNALS_ASYNC runs receivers on a bounded pool."""
+
+    def test_slow_receiver_does_not_block_sender(self, settings, fresh_dispatcher):
+        settings.SSO_SIGNALS_ASYNC = True
+        delivered = threading.Event()
+
+        def slow(sender, **kwargs):
+            time.sleep(0.2)
+            delivered.set()
+
+        sso_login_success.connect(slow, weak=False)
+        try:
+            start = time.perf_counter()
+            send_sso_signal(sso_login_success, sender=OAuthService, provider_slug="google")
+            assert time.perf_counter() - start < 0.1
+            assert delivered.wait(2)
+        finally:
+            sso_login_success.disconnect(slow)
+
+    def test_full_queue_drops_events(self, settings, fresh_dispatcher):
+        settings.SSO_SIGNALS_ASYNC = True
+        settings.SSO_SIGNALS_ASYNC_WORKERS = 1
+        settings.SSO_SIGNALS_ASYNC_QUEUE = 1
+        release = threading.Event()
+        calls = []
+
+        def blocking(sender, **kwargs):
+            calls.append(1)
+            release.wait(2)
+
+        sso_login_failed.connect(blocking, weak=False)
+        try:
+            dispatcher = signals._get_dispatcher()
+            assert dispatcher.submit(sso_login_failed, OAuthService, {})
+            assert dispatcher.submit(sso_login_failed, OAuthService, {})
+            assert not dispatcher.submit(sso_login_failed, OAuthService, {})
+            release.set()
+        finally:
+            sso_login_failed.disconnect(blocking)
@@ -0,0 +1,200 @@
+"""Tests for single-flight de-duplication of logins sharing an authorization code."""
+import threading
+import time
+
+import pytest
+from unittest.mock import patch, MagicMock
+
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from company_sso_core.exceptions import AuthorizationCodeReusedError, OAuthProviderError
+from company_sso_core.services import singleflight
+from company_sso_core.services.oauth_service import OAuthService
+from company_sso_core.services.singleflight import SingleFlight
+from company_sso_core.services.state import issue_state
+
+
+def _run_concurrently(fn, n):
+    results, errors = [], []
+    barrier = threading.Barrier(n)
+
+    def worker():
+        barrier.wait()
+        try:
+            results.append(fn())
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results, errors
+
+
+class TestSingleFlight:
+    """Concurrent callers with the same key share one execution."""
+
+    def test_duplicates_share_result(self):
+        flight = SingleFlight()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            time.sleep(0.1)
+            return "result"
+
+        results, errors = _run_concurrently(lambda: flight.do("k", slow), 3)
+        assert calls == [1]
+        assert results == ["result"] * 3
+        assert not errors
+
+    def test_duplicates_share_exception(self):
+        flight = SingleFlight()
+
+        def failing():
+            time.sleep(0.1)
+            raise OAuthProviderError(detail="boom")
+
+        results, errors = _run_concurrently(lambda: flight.do("k", failing), 3)
+        assert not results
+        assert len(errors) == 3
+        assert len({id(e) for e in errors}) == 1
+
+    def test_key_released_after_completion(self):
+        flight = SingleFlight()
+        assert flight.do("k", lambda: 1) == 1
+        assert flight.do("k", lambda: 2) == 2
+
+
+class TestLoginSingleFlight:
+    """OAuthService.login coalesces duplicates and rejects consumed codes."""
+
+    def test_concurrent_logins_exchange_once(self):
+        calls = []
+
+        def fake_login(*args, **kwargs):
+            calls.append(kwargs.get("code_key"))
+            time.sleep(0.1)
+            return "user", {"access": "a"}
+
+        service = OAuthService()
+        with patch.object(OAuthService, "_login", side_effect=fake_login):
+            results, errors = _run_concurrently(
+                lambda: service.login("google", "dup-code", "https://app.com/cb"), 3
+            )
+        assert len(calls) == 1
+        assert results == [("user", {"access": "a"})] * 3
+        assert not errors
+
+    def test_host_state_validator_runs_for_every_caller(self, settings):
+        checked = []
+        settings.SSO_VALIDATE_STATE = lambda state, request: checked.append(state) or True
+
+        def fake_login(*args, **kwargs):
+            time.sleep(0.1)
+            return "user", {"access": "a"}
+
+        service = OAuthService()
+        with patch.object(OAuthService, "_login", side_effect=fake_login) as mock_login:
+            results, errors = _run_concurrently(
+                lambda: service.login("google", "dup-code", "https://app.com/cb", state="s"), 3
+            )
+        assert mock_login.call_count == 1
+        assert checked == ["s"] * 3
+        assert not errors
+
+    @pytest.mark.django_db
+    def test_consumed_code_rejected_without_upstream_call(self):
+        key = singleflight.code_key("google", None, "used-code")
+        singleflight.mark_consumed(key)
+        with patch.object(OAuthService, "_login") as mock_login:
+            with pytest.raises(AuthorizationCodeReusedError):
+                OAuthService().login("google", "used-code", "https://app.com/cb")
+        mock_login.assert_not_called()
+
+    @pytest.mark.django_db
+    def test_shared_lock_rejects_code_consumed_elsewhere(self, settings):
+        settings.SSO_LOGIN_SINGLE_FLIGHT_SHARED = True
+        settings.SSO_LOGIN_SINGLE_FLIGHT_TIMEOUT = 2
+        key = singleflight.code_key("google", None, "other-process")
+        cache = singleflight.get_cache()
+        cache.set(singleflight._cache_key(key), singleflight._INFLIGHT, timeout=5)
+
+        def other_process_finishes():
+            time.sleep(0.1)
+            singleflight.mark_consumed(key)
+
+        threading.Thread(target=other_process_finishes).start()
+        with patch.object(OAuthService, "_login") as mock_login:
+            with pytest.raises(AuthorizationCodeReusedError):
+                OAuthService().login("google", "other-process", "https://app.com/cb")
+        mock_login.assert_not_called()
+
+    @pytest.mark.django_db
+    @patch("company_sso_core.services.oauth_service.get_provider")
+    def test_successful_exchange_marks_code_consumed(self, mock_get_provider):
+        mock_provider = MagicMock()
+        mock_provider.exchange_code.return_value = {"access_token": "at"}
+        mock_provider.get_user_info.return_value = {"id": "1", "email": "sf@test.com"}
+        mock_get_provider.return_value = mock_provider
+        service = OAuthService()
+        service.login("google", "once", "https://app.com/cb")
+        with pytest.raises(AuthorizationCodeReusedError):
+            service.login("google", "once", "https://app.com/cb")
+        assert mock_provider.exchange_code.call_count == 1
+
+    @pytest.mark.parametrize(
+        "state_kind,redirect_uri",
+        [
+            ("missing", "https://app.com/cb"),
+            ("forged", "https://app.com/cb"),
+            ("leader", "https://evil.com/cb"),
+        ],
+    )
+    def test_duplicate_with_bad_state_does_not_join_flight(
+        self, state_kind, redirect_uri, settings
+    ):
+        settings.SSO_STATE_SIGNED = True
+        settings.SSO_GET_OR_CREATE_USER = lambda slug, info, request: ("leader-user", False)
+        settings.SSO_ISSUE_TOKENS = lambda user, request: {"access": "leader-token"}
+        leader_state = issue_state("google", "https://app.com/cb")
+        entered, release = threading.Event(), threading.Event()
+
+        def exchange_code(code, redirect_uri):
+            entered.set()
+            release.wait(5)
+            return {"access_token": "at"}
+
+        provider = MagicMock()
+        provider.exchange_code.side_effect = exchange_code
+        provider.get_user_info.return_value = {"id": "1"}
+        results = []
+        with (
+            patch("company_sso_core.services.oauth_service.load_provider", return_value=None),
+            patch("company_sso_core.services.oauth_service.get_provider", return_value=provider),
+            patch.object(OAuthService, "_log_attempt"),
+        ):
+            leader = threading.Thread(
+                target=lambda: results.append(
+                    OAuthService().login(
+                        "google", "shared-code", "https://app.com/cb", state=leader_state
+                    )
+                )
+            )
+            leader.start()
+            assert entered.wait(5)
+            state = {"missing": "", "forged": "forged-state", "leader": leader_state}[state_kind]
+            resp = APIClient().post(
+                reverse("sso_api:login", kwargs={"provider": "google"}),
+                {"code": "shared-code", "redirect_uri": redirect_uri, "state": state},
+                format="json",
+            )
+            release.set()
+            leader.join()
+        assert resp.status_code == 400
+        assert resp.json()["code"] == "invalid_state"
+        assert results == [("leader-user", {"access": "leader-token"})]
+        assert provider.exchange_code.call_count == 1
@@ -0,0 +1,156 @@
+"""Tests for the credential snapshot: file integrity, DB-outage fallback, preferred mode."""
+import os
+from io import StringIO
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.core.management import call_command
+from django.db import DatabaseError
+
+from company_sso_core.models import SocialProvider
+from company_sso_core.services import snapshot
+from company_sso_core.services.credential_loader import get_provider_credentials
+from company_sso_core.services.provider_cache import invalidate_all_providers
+
+
+@pytest.fixture
+def snapshot_path(settings, tmp_path, monkeypatch):
+    path = str(tmp_path / "sso-snapshot.bin")
+    settings.SSO_SNAPSHOT_PATH = path
+    settings.SSO_SNAPSHOT_RELOAD_INTERVAL = 0
+    monkeypatch.setattr(snapshot, "_snapshot", None)
+    monkeypatch.setattr(snapshot, "_snapshot_path", None)
+    return path
+
+
+def _provider(**kwargs):
+    fields = {"slug": "google", "name": "Google", "client_id": "db_id", "client_secret": "db_secret"}
+    fields.update(kwargs)
+    return SocialProvider.objects.create(**fields)
+
+
+def _db_down():
+    qs = MagicMock()
+    qs.first.side_effect = DatabaseError("connection refused")
+    qs.filter.return_value = qs
+    return patch("company_sso_core.services.credential_loader.provider_queryset", return_value=qs)
+
+
+@pytest.mark.django_db
+class TestSnapshotFile:
+    """sso_snapshot writes a checked file of active providers."""
+
+    def test_round_trip(self, snapshot_path):
+        _provider(extra_config={"hd": "example.com"})
+        _provider(slug="github", name="GitHub", is_active=False)
+        _provider(workspace_id=7, client_id="ws_id")
+        assert snapshot.write_snapshot() == 2
+        loaded = snapshot.read_snapshot(snapshot_path)
+        assert loaded.get("google")["extra_config"] == {"hd": "example.com"}
+        assert loaded.get("google", 7)["client_id"] == "ws_id"
+        assert loaded.get("github") is None
+
+    def test_owner_only(self, snapshot_path):
+        snapshot.write_snapshot()
+        assert os.stat(snapshot_path).st_mode & 0o777 == 0o600
+
+    def test_tampered_file_rejected(self, snapshot_path):
+        _provider()
+        snapshot.write_snapshot()
+        with open(snapshot_path, "rb") as f:
+            data = f.read()
+        with open(snapshot_path, "wb") as f:
+            f.write(data.replace(b"db_id", b"xx_id"))
+        with pytest.raises(snapshot.SnapshotError, match="integrity"):
+            snapshot.read_snapshot(snapshot_path)
+        assert snapshot.get_snapshot() is None
+
+    def test_not_a_snapshot(self, snapshot_path):
+        with open(snapshot_path, "wb") as f:
+            f.write(b"{}")
+        with pytest.raises(snapshot.SnapshotError):
+            snapshot.read_snapshot(snapshot_path)
+
+    def test_reloads_when_file_changes(self, snapshot_path):
+        _provider()
+        snapshot.write_snapshot()
+        assert snapshot.get_snapshot().get("github") is None
+        _provider(slug="github", name="GitHub")
+        snapshot.write_snapshot()
+        assert snapshot.get_snapshot().get("github") is not None
+
+    def test_secrets_encrypted_with_keys(self, snapshot_path, settings):
+        Fernet = pytest.importorskip("cryptography.fernet").Fernet
+        _provider()
+        settings.SSO_SECRET_KEYS = [Fernet.generate_key().decode()]
+        snapshot.write_snapshot()
+        with open(snapshot_path, "rb") as f:
+            assert b"db_secret" not in f.read()
+        with _db_down():
+            assert get_provider_credentials("google")["client_secret"] == "db_secret"
+
+    def test_command(self, snapshot_path):
+        _provider()
+        out, err = StringIO(), StringIO()
+        call_command("sso_snapshot", stdout=out, stderr=err)
+        assert "Wrote 1 providers" in out.getvalue()
+        assert "plaintext" in err.getvalue()
+
+
+@pytest.mark.django_db
+class TestSnapshotFallback:
+    """Credentials come from the snapshot when the provider query fails."""
+
+    def test_db_outage_served_from_snapshot(self, snapshot_path):
+        _provider()
+        snapshot.write_snapshot()
+        with _db_down():
+            creds = get_provider_credentials("google")
+        assert creds["client_id"] == "db_id"
+        assert creds["client_secret"] == "db_secret"
+
+    def test_db_outage_without_entry_raises(self, snapshot_path):
+        snapshot.write_snapshot()
+        with _db_down(), pytest.raises(DatabaseError):
+            get_provider_credentials("google")
+
+    def test_db_outage_without_snapshot_raises(self, settings):
+        settings.SSO_SNAPSHOT_PATH = None
+        with _db_down(), pytest.raises(DatabaseError):
+            get_provider_credentials("google")
+
+
+@pytest.mark.django_db
+class TestSnapshotPreferred:
+    """SSO_SNAPSHOT_PREFERRED serves current entries without a provider query."""
+
+    @pytest.fixture(autouse=True)
+    def preferred(self, settings, snapshot_path):
+        settings.SSO_SNAPSHOT_PREFERRED = True
+
+    def test_no_query(self, query_budget):
+        _provider()
+        snapshot.write_snapshot()
+        with query_budget(0):
+            assert get_provider_credentials("google")["client_id"] == "db_id"
+
+    def test_written_pair_read_from_db(self, query_budget):
+        provider = _provider()
+        snapshot.write_snapshot()
+        provider.client_id = "new_id"
+        provider.save()
+        with query_budget(1):
+            assert get_provider_credentials("google")["client_id"] == "new_id"
+
+    def test_bulk_write_read_from_db(self, query_budget):
+        _provider()
+        snapshot.write_snapshot()
+        invalidate_all_providers()
+        with query_budget(1):
+            get_provider_credentials("google")
+
+    def test_missing_entry_read_from_db(self, query_budget):
+        snapshot.write_snapshot()
+        _provider(slug="github", name="GitHub")
+        with query_budget(1):
+            assert get_provider_credentials("github")["client_id"] == "db_id"
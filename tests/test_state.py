@@ -0,0 +1,136 @@
+"""Tests for built-in signed OAuth state and the nonce replay cache."""
+import pytest
+from unittest.mock import patch, MagicMock
+
+from company_sso_core.exceptions import InvalidStateError
+from company_sso_core.services import state as signed_state
+from company_sso_core.services.oauth_service import OAuthService
+from company_sso_core.services.state import NonceReplayCache, issue_state, verify_state
+
+
+@pytest.fixture(autouse=True)
+def _fresh_replay_cache():
+    signed_state._replay_cache = None
+    yield
+    signed_state._replay_cache = None
+
+
+class TestSignedState:
+    """Signed state binds provider, workspace and redirect_uri and is single-use."""
+
+    def test_round_trip(self):
+        token = issue_state("google", "https://app.com/cb", workspace=3)
+        verify_state(token, "google", "https://app.com/cb", workspace=3)
+
+    def test_replay_rejected(self):
+        token = issue_state("google", "https://app.com/cb")
+        verify_state(token, "google", "https://app.com/cb")
+        with pytest.raises(InvalidStateError):
+            verify_state(token, "google", "https://app.com/cb")
+
+    @pytest.mark.parametrize(
+        "slug,redirect_uri,workspace",
+        [
+            ("github", "https://app.com/cb", None),
+            ("google", "https://evil.com/cb", None),
+            ("google", "https://app.com/cb", 9),
+        ],
+    )
+    def test_binding_mismatch_rejected(self, slug, redirect_uri, workspace):
+        token = issue_state("google", "https://app.com/cb")
+        with pytest.raises(InvalidStateError):
+            verify_state(token, slug, redirect_uri, workspace)
+
+    def test_tampered_or_missing_rejected(self):
+        token = issue_state("google", "https://app.com/cb")
+        with pytest.raises(InvalidStateError):
+            verify_state(token[:-2] + "xx", "google", "https://app.com/cb")
+        with pytest.raises(InvalidStateError):
+            verify_state(None, "google", "https://app.com/cb")
+
+    def test_expired_rejected(self, settings):
+        settings.SSO_STATE_TTL = 60
+        with patch("django.core.signing.time.time", return_value=1_000_000):
+            token = issue_state("google", "https://app.com/cb")
+        with patch("django.core.signing.time.time", return_value=1_000_061):
+            with pytest.raises(InvalidStateError):
+                verify_state(token, "google", "https://app.com/cb")
+
+    def test_cache_backend_is_default_and_shares_nonces(self):
+        token = issue_state("google", "https://app.com/cb")
+        verify_state(token, "google", "https://app.com/cb")
+        assert signed_state._replay_cache is None
+        with pytest.raises(InvalidStateError):
+            verify_state(token, "google", "https://app.com/cb")
+
+    def test_memory_backend_replay_rejected(self, settings):
+        settings.SSO_STATE_REPLAY_BACKEND = "memory"
+        token = issue_state("google", "https://app.com/cb")
+        verify_state(token, "google", "https://app.com/cb")
+        with pytest.raises(InvalidStateError):
+            verify_state(token, "google", "https://app.com/cb")
+
+
+class TestNonceReplayCache:
+    """Bounded, TTL-windowed nonce set."""
+
+    def test_full_cache_rejects_instead_of_evicting(self):
+        cache = NonceReplayCache(ttl=60, max_entries=3)
+        for n in "abc":
+            assert cache.add(n)
+        assert not cache.add("d")
+        assert len(cache) == 3
+        assert not cache.add("a")  # still remembered, so still a replay
+
+    def test_full_cache_accepts_again_after_expiry(self):
+        cache = NonceReplayCache(ttl=10, max_entries=1)
+        with patch("company_sso_core.services.state.time.monotonic", return_value=100.0):
+            assert cache.add("a")
+            assert not cache.add("b")
+        with patch("company_sso_core.services.state.time.monotonic", return_value=111.0):
+            assert cache.add("b")
+
+    def test_default_size_follows_ttl(self, settings):
+        settings.SSO_STATE_REPLAY_BACKEND = "memory"
+        per_second = signed_state.DEFAULT_PEAK_LOGINS_PER_SECOND
+        assert signed_state._get_replay_cache(600).max_entries == 600 * per_second
+        settings.SSO_STATE_REPLAY_CACHE_SIZE = 5
+        assert signed_state._get_replay_cache(600).max_entries == 5
+
+    def test_expired_nonces_dropped(self):
+        cache = NonceReplayCache(ttl=10, max_entries=100)
+        with patch("company_sso_core.services.state.time.monotonic", return_value=100.0):
+            cache.add("a")
+        with patch("company_sso_core.services.state.time.monotonic", return_value=111.0):
+            assert cache.add("b")
+            assert len(cache) == 1
+
+
+@pytest.mark.django_db
+class TestOAuthServiceSignedState:
+    """OAuthService.login enforces signed state when SSO_STATE_SIGNED is on."""
+
+    @patch("company_sso_core.services.oauth_service.get_provider")
+    def test_login_requires_valid_state(self, mock_get_provider, settings):
+        settings.SSO_STATE_SIGNED = True
+        mock_provider = MagicMock()
+        mock_provider.exchange_code.return_value = {"access_token": "at"}
+        mock_provider.get_user_info.return_value = {"id": "1", "email": "s@test.com"}
+        mock_get_provider.return_value = mock_provider
+        service = OAuthService()
+        with pytest.raises(InvalidStateError):
+            service.login("google", "code", "https://app.com/cb", state=None)
+        mock_provider.exchange_code.assert_not_called()
+
+        token = issue_state("google", "https://app.com/cb")
+        user, _ = service.login("google", "code", "https://app.com/cb", state=token)
+        assert user.email == "s@test.com"
+
+    def test_authorization_url_embeds_signed_state(self, settings):
+        from urllib.parse import parse_qs, urlsplit
+        from company_sso_core.utils import get_authorization_url
+
+        settings.SSO_STATE_SIGNED = True
+        url = get_authorization_url("google", "https://app.com/cb")
+        token = parse_qs(urlsplit(url).query)["state"][0]
+        verify_state(token, "google", "https://app.com/cb")
@@ -0,0 +1,114 @@
+"""Tests for optional login/HTTP tracing."""
+import io
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+from django.test import RequestFactory
+
+from company_sso_core import tracing
+from company_sso_core.providers import http
+from company_sso_core.providers.github import GitHubOAuthProvider
+from company_sso_core.services.oauth_service import OAuthService
+
+REMOTE = "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
+
+
+@pytest.fixture
+def exporter(settings):
+    settings.SSO_TRACE_EXPORTER = tracing.InMemoryExporter()
+    return settings.SSO_TRACE_EXPORTER
+
+
+def _response(body=b"{}", status=200):
+    resp = requests.Response()
+    resp.status_code = status
+    resp.raw = io.BytesIO(body)
+    return resp
+
+
+class TestSpans:
+    def test_noop_by_default(self):
+        assert tracing.get_exporter() is None
+        with tracing.span("x") as span:
+            span.set_attribute("a", 1)
+        assert tracing.current_traceparent() is None
+
+    def test_noop_exporter_disables(self, settings):
+        settings.SSO_TRACE_EXPORTER = "company_sso_core.tracing.NoopExporter"
+        assert tracing.span("x") is tracing.span("y")
+
+    def test_nesting_and_errors(self, exporter):
+        with pytest.raises(ValueError):
+            with tracing.span("outer") as outer:
+                with tracing.span("inner", key="v"):
+                    raise ValueError
+        inner, outer_span = exporter.spans
+        assert inner.parent_id == outer.span_id and inner.trace_id == outer.trace_id
+        assert inner.attributes == {"key": "v", "error.type": "ValueError"}
+        assert outer_span.status == "error"
+        assert inner.duration_ms >= 0
+
+    def test_remote_parent(self, exporter):
+        with tracing.span("root", traceparent=REMOTE):
+            pass
+        (span,) = exporter.spans
+        assert span.trace_id == "0af7651916cd43dd8448eb211c80319c"
+        assert span.parent_id == "b7ad6b7169203331"
+
+    @pytest.mark.parametrize("value", [None, "", "garbage", "00-" + "0" * 32 + "-b7ad6b7169203331-01"])
+    def test_invalid_traceparent_ignored(self, value):
+        assert tracing.parse_traceparent(value) is None
+
+
+class TestHTTPSpans:
+    def test_span_and_propagation(self, exporter):
+        with patch.object(http.get_session(), "request", return_value=_response(b"12345")) as request:
+            with tracing.span("parent") as parent:
+                http.get("https://api.github.com/user", headers={"Accept": "application/json"})
+        headers = request.call_args.kwargs["headers"]
+        assert headers["Accept"] == "application/json"
+        assert headers["traceparent"].split("-")[1] == parent.trace_id
+        span = exporter.by_name("sso.http")[0]
+        assert span.attributes == {
+            "http.method": "GET",
+            "server.address": "api.github.com",
+            "http.status_code": 200,
+            "http.response.body.size": 5,
+        }
+        assert headers["traceparent"].split("-")[2] == span.span_id
+
+    def test_no_header_when_off(self):
+        with patch.object(http.get_session(), "get", return_value=_response()) as get:
+            http.get("https://api.github.com/user", headers={"Accept": "application/json"})
+        assert "traceparent" not in get.call_args.kwargs["headers"]
+
+    def test_secondary_fetches_join_trace(self, exporter):
+        provider = GitHubOAuthProvider({})
+        responses = {
+            "https://api.github.com/user": _response(b'{"id": 1, "login": "o"}'),
+            "https://api.github.com/user/emails": _response(b'[{"email": "o@x.com", "primary": true}]'),
+        }
+        with patch.object(http.get_session(), "request", side_effect=lambda m, url, **kw: responses[url]):
+            with tracing.span("root") as root:
+                provider.get_user_info("tok")
+        spans = exporter.by_name("sso.http")
+        assert len(spans) == 2
+        assert {span.trace_id for span in spans} == {root.trace_id}
+
+
+@pytest.mark.django_db
+class TestLoginSpans:
+    def test_stages_traced_under_incoming_context(self, exporter):
+        provider = MagicMock()
+        provider.exchange_code.return_value = {"access_token": "at"}
+        provider.get_user_info.return_value = {"id": "1", "email": "u@test.com"}
+        request = RequestFactory().post("/", HTTP_TRACEPARENT=REMOTE)
+        with patch("company_sso_core.services.oauth_service.get_provider", return_value=provider):
+            OAuthService().login("google", "code", "https://app.com/cb", request=request)
+        names = [span.name for span in exporter.spans]
+        assert names == ["sso.exchange_code", "sso.user_info", "sso.user_resolution", "sso.issue_tokens", "sso.login"]
+        root = exporter.by_name("sso.login")[0]
+        assert root.parent_id == "b7ad6b7169203331"
+        assert root.attributes["sso.provider"] == "google"
+        assert all(span.parent_id == root.span_id for span in exporter.spans[:-1])
@@ -0,0 +1,117 @@
+"""Tests for endpoint URL templates and their validation."""
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.core.exceptions import ValidationError
+
+from company_sso_core.exceptions import ProviderNotConfiguredError
+from company_sso_core.models import SocialProvider
+from company_sso_core.providers.generic import GenericOAuth2Provider
+from company_sso_core.providers.templates import compile_template, validate_endpoints
+from company_sso_core.utils import get_authorization_url
+
+
+class TestURLTemplate:
+    def test_fields_and_render(self):
+        template = compile_template("https://{shop}.myshopify.com/{shop}/x")
+        assert template.fields == ("shop",)
+        assert template.render({"shop": "acme"}) == "https://acme.myshopify.com/acme/x"
+
+    def test_compiled_once(self):
+        assert compile_template("https://{domain}/a") is compile_template("https://{domain}/a")
+
+    def test_runtime_placeholder_kept_until_call_time(self):
+        template = compile_template("https://api.hubapi.com/oauth/v1/access-tokens/{token}")
+        assert template.missing({}) == []
+        assert template.render({}) == template.template
+
+    def test_malformed_rejected(self):
+        with pytest.raises(ValueError):
+            compile_template("https://{domain/x")
+        with pytest.raises(ValueError):
+            compile_template("https://{domain!r}/x")
+
+
+class TestValidateEndpoints:
+    def test_missing_tenant_value(self):
+        errors = validate_endpoints("okta", {})
+        assert errors and all("domain" in e for e in errors)
+
+    def test_filled(self):
+        assert validate_endpoints("okta", {"domain": "acme.okta.com"}) == []
+        assert validate_endpoints("hubspot", {}) == []
+        assert validate_endpoints("google", {}) == []
+
+    def test_override_checked(self):
+        assert validate_endpoints("google", {"token_url": "https://{tenant}/token"})
+
+
+class TestGenericProviderTemplates:
+    def test_urls_rendered_at_construction(self):
+        provider = GenericOAuth2Provider({"extra_config": {"domain": "acme.okta.com/"}}, slug="okta")
+        assert provider.token_url == "https://acme.okta.com/oauth2/v1/token"
+        provider = GenericOAuth2Provider({"extra_config": {"shop": "acme"}}, slug="shopify")
+        assert provider.token_url == "https://acme.myshopify.com/admin/oauth/access_token"
+        assert provider.authorization_url == "https://acme.myshopify.com/admin/oauth/authorize"
+
+    def test_unfilled_is_configuration_error(self):
+        with pytest.raises(ProviderNotConfiguredError) as exc:
+            GenericOAuth2Provider({"extra_config": {}}, slug="shopify")
+        assert "shop" in str(exc.value.detail)
+
+    def test_hubspot_token_filled_at_call_time(self):
+        provider = GenericOAuth2Provider({"client_id": "i", "client_secret": "s"}, slug="hubspot")
+        resp = MagicMock(content=b'{"user_id": 1, "user": "a@b.c"}')
+        with patch("company_sso_core.providers.http.get", return_value=resp) as get:
+            info = provider.get_user_info("tok/en")
+        assert info["id"] == 1
+        assert get.call_args.args[0] == "https://api.hubapi.com/oauth/v1/access-tokens/tok%2Fen"
+
+
+@pytest.mark.django_db
+class TestSaveTimeValidation:
+    def test_clean_reports_unfilled_placeholders(self):
+        provider = SocialProvider(slug="okta", name="Okta", client_id="i", client_secret="s", extra_config={})
+        with pytest.raises(ValidationError) as exc:
+            provider.full_clean()
+        assert "extra_config" in exc.value.message_dict
+
+    def test_clean_accepts_filled(self):
+        SocialProvider(
+            slug="okta", name="Okta", client_id="i", client_secret="s", extra_config={"domain": "acme.okta.com"}
+        ).full_clean()
+
+    def test_create_rejects_unfilled_placeholders(self):
+        with pytest.raises(ValidationError) as exc:
+            SocialProvider.objects.create(slug="okta", name="Okta", client_id="i", client_secret="s")
+        assert "extra_config" in exc.value.message_dict
+        assert not SocialProvider.objects.exists()
+
+    def test_save_rejects_clearing_placeholders(self):
+        provider = SocialProvider.objects.create(
+            slug="okta", name="Okta", client_id="i", client_secret="s", extra_config={"domain": "a.okta.com"}
+        )
+        provider.extra_config = {}
+        with pytest.raises(ValidationError):
+            provider.save()
+        provider.refresh_from_db()
+        assert provider.extra_config == {"domain": "a.okta.com"}
+
+    def test_loaddata_rejects_unfilled_placeholders(self, tmp_path):
+        from django.core.management import call_command
+
+        fixture = tmp_path / "providers.json"
+        fixture.write_text(
+            '[{"model": "company_sso_core.socialprovider", "pk": 1, "fields": '
+            '{"slug": "okta", "name": "Okta", "client_id": "i", "client_secret": "s", "extra_config": {}}}]'
+        )
+        with pytest.raises(ValidationError):
+            call_command("loaddata", str(fixture), verbosity=0)
+        assert not SocialProvider.objects.exists()
+
+    def test_authorization_url_reports_configuration_error(self, settings):
+        settings.SSO_PROVIDERS = {"okta": {"client_id": "i", "client_secret": "s"}}
+        with pytest.raises(ProviderNotConfiguredError):
+            get_authorization_url("okta", "https://app/cb")
+        settings.SSO_PROVIDERS = {"okta": {"client_id": "i", "client_secret": "s", "extra_config": {"domain": "a.okta.com"}}}
+        assert get_authorization_url("okta", "https://app/cb").startswith("https://a.okta.com/oauth2/v1/authorize?")
@@ -0,0 +1,149 @@
+"""Tests for startup warm-up, the sso_warm command and the shared HTTP session."""
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+from django.apps import apps
+from django.core.management import call_command
+
+from company_sso_core.models import SocialProvider, SSOLoginLog
+from company_sso_core.providers import http
+from company_sso_core.services import warmup
+
+
+@pytest.fixture
+def no_network():
+    with patch("company_sso_core.services.warmup.socket.getaddrinfo") as resolve, patch(
+        "company_sso_core.providers.http.open_connection"
+    ) as connect:
+        yield resolve, connect
+
+
+@pytest.mark.django_db
+class TestWarmUp:
+    """warm_up() preloads providers and opens connections within the budget."""
+
+    def test_warms_active_providers_and_endpoints(self, no_network):
+        resolve, connect = no_network
+        SocialProvider.objects.create(slug="github", client_id="i", client_secret="s")
+        SocialProvider.objects.create(slug="gitlab", client_id="i", client_secret="s", is_active=False)
+        report = warmup.warm_up(budget=5)
+        assert set(report["providers"]) == {"github", "google"}  # google from SSO_PROVIDERS
+        assert "gitlab" not in report["providers"]
+        urls = {call.args[0] for call in connect.call_args_list}
+        assert "https://oauth2.googleapis.com/token" in urls
+        assert "https://github.com/login/oauth/access_token" in urls
+        resolved = {call.args[0] for call in resolve.call_args_list}
+        assert {"oauth2.googleapis.com", "github.com", "api.github.com"} <= resolved
+        assert report["timed_out"] is False
+        assert report["errors"] == []
+
+    def test_most_used_providers_first(self, no_network):
+        SocialProvider.objects.create(slug="github", client_id="i", client_secret="s")
+        for _ in range(3):
+            SSOLoginLog.objects.create(provider_slug="github", status="success")
+        report = warmup.warm_up(budget=5)
+        assert report["providers"][0] == "github"
+
+    def test_connection_limit(self, no_network, settings):
+        _, connect = no_network
+        settings.SSO_WARMUP_CONNECTIONS = 1
+        warmup.warm_up(budget=5)
+        assert connect.call_count == 1
+
+    def test_budget_bounds_slow_connections(self, no_network):
+        _, connect = no_network
+        connect.side_effect = lambda url, timeout: time.sleep(2)
+        started = time.monotonic()
+        report = warmup.warm_up(budget=0.2)
+        assert time.monotonic() - started < 1.5
+        assert report["timed_out"] is True
+
+    def test_failures_are_reported_not_raised(self, no_network):
+        _, connect = no_network
+        connect.side_effect = OSError("refused")
+        report = warmup.warm_up(budget=5)
+        assert report["connections"] == 0
+        assert any("OSError" in error for error in report["errors"])
+
+
+@pytest.mark.django_db
+class TestWarmUpEntryPoints:
+    """manage.py sso_warm and the SSO_WARMUP_ON_STARTUP hook."""
+
+    def test_command_reports(self, no_network):
+        out = StringIO()
+        call_command("sso_warm", "--budget", "2", stdout=out)
+        assert "Warmed 1 providers" in out.getvalue()
+
+    def test_ready_starts_background_thread_when_enabled(self, settings):
+        settings.SSO_WARMUP_ON_STARTUP = True
+        with patch("threading.Thread") as thread:
+            apps.get_app_config("company_sso_core").ready()
+        thread.assert_called_once()
+        assert thread.call_args.kwargs["target"] is warmup.warm_up_in_background
+
+    def test_ready_does_nothing_by_default(self):
+        with patch("threading.Thread") as thread:
+            apps.get_app_config("company_sso_core").ready()
+        thread.assert_not_called()
+
+
+@pytest.fixture
+def cookie_server():
+    """Local server that sets a cookie and records the Cookie header of each request."""
+    seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            seen.append(self.headers.get("Cookie"))
+            body = b'{"access_token": "at"}'
+            self.send_response(200)
+            self.send_header("Set-Cookie", f"sess=user{len(seen)}; Path=/")
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/token", seen
+    server.shutdown()
+    server.server_close()
+
+
+class TestSharedSession:
+    def test_calls_reuse_one_session(self):
+        assert http.get_session() is http.get_session()
+
+    def test_forked_child_gets_its_own_session(self):
+        parent = http.get_session()
+        pool, slots = http._pool, http._pool_slots
+        try:
+            http._reset_after_fork()
+            assert http._pool is None
+            assert http.get_session() is not parent
+        finally:
+            http._session, http._pool, http._pool_slots = parent, pool, slots
+
+    def test_cookie_policy_import_is_lazy(self):
+        code = "import sys, company_sso_core.providers.http; print('urllib.request' in sys.modules)"
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        assert out.stdout.strip() == "False"
+
+    def test_cookies_not_replayed_across_logins(self, cookie_server):
+        url, seen = cookie_server
+        http.post(url, data={"code": "a"}, timeout=5)
+        http.post(url, data={"code": "b"}, timeout=5)
+        assert seen == [None, None]
+        assert len(http.get_session().cookies) == 0
@@ -1,6 +1,8 @@
-"""Test URL config: mount SSO URLs under api/v1/sso/."""
+"""Test URL config: mount SSO URLs under api/v1/sso/ and the admin under admin/."""
+from django.contrib import admin
 from django.urls import path, include
 
 urlpatterns = [
+    path("admin/", admin.site.urls),
     path("api/v1/sso/", include("company_sso_core.urls")),
 ]